@@ -20,6 +20,7 @@
 
 #include "count_crossing.h"
 #include "geometricbasicsCpp.h"
+#include <algorithm>
 
 struct candidato
 {
@@ -381,3 +382,215 @@ vector<int> count_crossings_candidate_list(int point_index, vector<Punto> &candi
 
     return cr_list;
 }
+
+//-------------------------------------------------------------
+
+static bool lower_half(const Punto& c, const Punto& p, bool flip)
+{
+    //Whether the direction from c to p (or the opposite one if flip) is in [pi, 2pi)
+    if(flip)
+        return p.y > c.y || (p.y == c.y && p.x > c.x);
+    return p.y < c.y || (p.y == c.y && p.x < c.x);
+}
+
+static bool angle_less(const Punto& c, const Punto& a, bool flip_a, const Punto& b, bool flip_b)
+{
+    /*
+     * Compares the directions from c to a and from c to b by their
+     * angle with the positive x axis. A flipped direction points the
+     * other way, so antipodes need no new coordinates.
+     */
+    bool ha = lower_half(c, a, flip_a), hb = lower_half(c, b, flip_b);
+    if(ha != hb)
+        return hb;
+    int t = turn(c, a, b);
+    if(flip_a != flip_b)
+        t = -t;
+    return t == LEFT;
+}
+
+static void arc(const Punto& c, const vector<int>& A, const vector<Punto>& pts,
+                const Punto& x, bool flip_x, const Punto& y, bool flip_y, int& i, int& j)
+{
+    /*
+     * A holds indices into pts sorted as angle_less does around c.
+     * The ones strictly inside the ccw arc of directions from x to y
+     * are A[i], ..., A[j-1], going around past the end of A if j < i
+     * or if the arc crosses the positive x axis.
+     */
+    i = std::upper_bound(A.begin(), A.end(), 0, [&](int, int e){
+        return angle_less(c, x, flip_x, pts[e], false);
+    }) - A.begin();
+    j = std::lower_bound(A.begin(), A.end(), 0, [&](int e, int){
+        return angle_less(c, pts[e], false, y, flip_y);
+    }) - A.begin();
+    if(angle_less(c, y, flip_y, x, flip_x) && j <= i)
+        j += A.size();
+}
+
+static long long left_pairs(const Punto& c, const vector<int>& A, const vector<Punto>& pts)
+{
+    /*
+     * Sum over the rays from c to the points of A (sorted around c)
+     * of C(l, 2), l being the number of points of A to the left of
+     * the ray. This is C(|A|, 3) minus the triangles of A around c.
+     */
+    long long res = 0;
+    for(int e : A)
+    {
+        int i, j;
+        arc(c, A, pts, pts[e], false, pts[e], true, i, j);
+        long long l = j - i;
+        res += l*(l-1)/2;
+    }
+    return res;
+}
+
+void CrossingCounter::sort_around(int q)
+{
+    const Punto &c = pts[q];
+    vector<int> &A = around[q];
+    std::sort(A.begin(), A.end(), [&](int a, int b){
+        return angle_less(c, pts[a], false, pts[b], false);
+    });
+    vector<long long> &S = left_sums[q];
+    S.assign(A.size()+1, 0);
+    for(unsigned int k=0; k<A.size(); k++)
+    {
+        int i, j;
+        arc(c, A, pts, pts[A[k]], false, pts[A[k]], true, i, j);
+        S[k+1] = S[k] + j - i;
+    }
+}
+
+CrossingCounter::CrossingCounter(const vector<Punto>& points) :
+        pts(points), around(points.size()), left_sums(points.size()), total(0)
+{
+    /*
+     * A set of four points in convex position has one crossing and
+     * any other set none, so the crossings are C(n, 4) minus the
+     * triangles around each point.
+     */
+    long long n = pts.size();
+    for(int q=0; q<n; q++)
+    {
+        for(int p=0; p<n; p++)
+            if(p != q)
+                around[q].push_back(p);
+        sort_around(q);
+        total += left_pairs(pts[q], around[q], pts);
+    }
+    total -= n*(n-1)*(n-2)*(n-3)/24 * 3;
+}
+
+const vector<Punto>& CrossingCounter::points() const
+{
+    return pts;
+}
+
+long long CrossingCounter::count() const
+{
+    return total;
+}
+
+long long CrossingCounter::crossings_at(int i, const Punto& p, bool old) const
+{
+    /*
+     * Returns the crossings with an edge at p of the set of the points
+     * other than pts[i] and p, with p = pts[i] if old. These are the
+     * convex quadrilaterals with vertex p: the sum of C(l, 2) over
+     * the rays from p, which leaves out the triangles around p, minus
+     * the triangles with vertex p around each other point q. Those
+     * are the pairs u, v with u to the left of qp and v to the left
+     * of qu but not of qp, taken from the sums of around[q]. If p is
+     * new, the pairs with pts[i] are removed: its partners lie
+     * between the opposites of p and pts[i] as seen from q.
+     */
+    const Punto &a = pts[i];
+    long long res;
+    if(old)
+        res = left_pairs(p, around[i], pts);
+    else
+    {
+        vector<int> A;
+        for(int q=0; q<int(pts.size()); q++)
+            if(q != i)
+                A.push_back(q);
+        std::sort(A.begin(), A.end(), [&](int u, int v){
+            return angle_less(p, pts[u], false, pts[v], false);
+        });
+        res = left_pairs(p, A, pts);
+    }
+
+    for(int q=0; q<int(pts.size()); q++)
+    {
+        if(q == i)
+            continue;
+        const Punto &c = pts[q];
+        const vector<int> &A = around[q];
+        const vector<long long> &S = left_sums[q];
+        long long m = A.size();
+        int s, e;
+        arc(c, A, pts, p, false, p, true, s, e);
+        long long k = e - s;
+        long long pairs = e <= m ? S[e] - S[s] : S[m] - S[s] + S[e-m];
+        //Those to the left of qu that are still in the arc
+        pairs -= k*(k-1)/2;
+        if(!old)
+        {
+            if(turn(c, a, p) == LEFT)
+                arc(c, A, pts, a, true, p, true, s, e);
+            else
+                arc(c, A, pts, p, true, a, true, s, e);
+            pairs -= e - s;
+        }
+        res -= pairs;
+    }
+    return res;
+}
+
+long long CrossingCounter::change(int i, Punto q) const
+{
+    return crossings_at(i, q, false) - crossings_at(i, pts[i], true);
+}
+
+void CrossingCounter::move(int i, Punto q)
+{
+    /*
+     * If the move keeps the order type, the cyclic orders around the
+     * points and the counts to the left of each ray stay the same, so
+     * each order only has to be rotated to start at the positive x
+     * axis again, in O(n^2) time in all. Otherwise everything is
+     * sorted again.
+     */
+    total += change(i, q);
+    q.color = pts[i].color;
+    q._has_color = pts[i]._has_color;
+    vector<Punto> others(pts);
+    others.erase(others.begin() + i);
+    bool same = preserves_order_type(others, pts[i], q);
+    pts[i] = q;
+
+    for(int c=0; c<int(pts.size()); c++)
+    {
+        vector<int> &A = around[c];
+        vector<long long> &S = left_sums[c];
+        if(!same)
+        {
+            sort_around(c);
+            continue;
+        }
+        int m = A.size(), k = 1;
+        while(k < m && !angle_less(pts[c], pts[A[k]], false, pts[A[k-1]], false))
+            k++;
+        if(k == m)
+            continue;
+        vector<long long> left(m);
+        for(int j=0; j<m; j++)
+            left[j] = S[j+1] - S[j];
+        std::rotate(A.begin(), A.begin() + k, A.end());
+        std::rotate(left.begin(), left.begin() + k, left.end());
+        for(int j=0; j<m; j++)
+            S[j+1] = S[j] + left[j];
+    }
+}
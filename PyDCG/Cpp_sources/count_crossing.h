@@ -28,3 +28,32 @@ void imprime_piv_pts(long pi[], long pts[][2], int n);
 void imprimepts(long pts[][2], int n);
 
 vector<int> count_crossings_candidate_list(int, vector<Punto>&, vector<Punto>&);
+
+/*
+ * Keeps the number of crossings of the complete geometric graph on a
+ * point set in general position up to date while its points are
+ * moved one at a time. Only the crossings at the moved point change:
+ * change(i, q) counts them at the old and new positions of point i in
+ * O(n log n) time, from the other points sorted around each point,
+ * and move(i, q) applies the move, updating those orders in
+ * O(n^2 log n) time. change does not modify the counter, so it can
+ * be called from several threads at once.
+ */
+class CrossingCounter
+{
+public:
+    CrossingCounter(const std::vector<Punto>&);
+    const std::vector<Punto>& points() const;
+    long long count() const;
+    long long change(int, Punto) const;
+    void move(int, Punto);
+private:
+    std::vector<Punto> pts;
+    //around[q] holds the other points sorted ccw around pts[q] from the positive x axis
+    std::vector<std::vector<int> > around;
+    //left_sums[q][k] is the number of points to the left of the first k rays of around[q]
+    std::vector<std::vector<long long> > left_sums;
+    long long total;
+    void sort_around(int);
+    long long crossings_at(int, const Punto&, bool) const;
+};
@@ -18,19 +18,9 @@
     51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 */
 
-#include <Python.h>
+#include "utilities.cpp"
 #include "count_crossing.h"
 
-using std::vector;
-
-#ifdef INT32
-static const long long max_val = (1L << 30);
-const char max_val_error[] = "The coordinates of each point must less than or equal to 2^30 in absolute value.";
-#else
-static const long long max_val = (1L << 62);
-const char max_val_error[] = "The coordinates of each point must less than or equal to 2^62 in absolute value.";
-#endif
-
 static const char* crossing_doc =
 "count_convex_rholes(points, r, mono = True)\n\
     \n\
@@ -119,7 +109,10 @@ extern "C" PyObject* crossing_wrapper(PyObject* self, PyObject* args)
         pts[i][0] = x;
         pts[i][1] = y;
     }
-    long long res = crossing(pts, points_size);
+    long long res;
+    Py_BEGIN_ALLOW_THREADS
+    res = crossing(pts, points_size);
+    Py_END_ALLOW_THREADS
 //    auto res = range_crossing(pts, points_size, 0, points_size);
     for(int i=0; i<points_size; i++)
     {
@@ -224,10 +217,121 @@ extern "C" PyObject* count_crossings_candidate_list_wrapper(PyObject* self, PyOb
     return py_res;
 }
 
+static void crossing_counter_destructor(PyObject* capsule)
+{
+    delete (CrossingCounter*)PyCapsule_GetPointer(capsule, "crossingCpp.crossing_counter");
+}
+
+static CrossingCounter* get_crossing_counter(PyObject* py_counter, int i, PyObject* py_q, Punto& q)
+{
+    CrossingCounter* counter = (CrossingCounter*)PyCapsule_GetPointer(py_counter, "crossingCpp.crossing_counter");
+    if(counter == NULL)
+        return NULL;
+
+    if(i < 0 || i >= (int)counter->points().size())
+    {
+        PyErr_SetString(PyExc_IndexError, "point index out of range");
+        return NULL;
+    }
+
+    if(pyPoint_CPoint(py_q, q) == FAIL)
+        return NULL;
+    return counter;
+}
+
+extern "C" PyObject* crossing_counter_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_pts;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!:crossing_counter", (char**)kwlist, &PyList_Type, &py_pts))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    CrossingCounter* counter;
+    Py_BEGIN_ALLOW_THREADS
+    counter = new CrossingCounter(pts);
+    Py_END_ALLOW_THREADS
+
+    return PyCapsule_New(counter, "crossingCpp.crossing_counter", crossing_counter_destructor);
+}
+
+extern "C" PyObject* crossing_counter_count_wrapper(PyObject* self, PyObject* args)
+{
+    PyObject* py_counter;
+    if (!PyArg_ParseTuple(args, "O:crossing_counter_count", &py_counter))
+        return (PyObject*)NULL;
+
+    CrossingCounter* counter = (CrossingCounter*)PyCapsule_GetPointer(py_counter, "crossingCpp.crossing_counter");
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("L", counter->count());
+}
+
+extern "C" PyObject* crossing_counter_change_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_counter;
+    PyObject* py_q;
+    int i;
+    Punto q;
+
+    static const char *kwlist[] = {"counter", "i", "q", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OiO!:crossing_counter_change", (char**)kwlist, &py_counter, &i, &PyList_Type, &py_q))
+        return (PyObject*)NULL;
+
+    CrossingCounter* counter = get_crossing_counter(py_counter, i, py_q, q);
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    long long delta;
+    Py_BEGIN_ALLOW_THREADS
+    delta = counter->change(i, q);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", delta);
+}
+
+extern "C" PyObject* crossing_counter_move_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_counter;
+    PyObject* py_q;
+    int i;
+    Punto q;
+
+    static const char *kwlist[] = {"counter", "i", "q", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OiO!:crossing_counter_move", (char**)kwlist, &py_counter, &i, &PyList_Type, &py_q))
+        return (PyObject*)NULL;
+
+    CrossingCounter* counter = get_crossing_counter(py_counter, i, py_q, q);
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    counter->move(i, q);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", counter->count());
+}
+
     PyMethodDef crossingCppMethods[] =
 {
     {"count_crossings", crossing_wrapper, METH_VARARGS, crossing_doc},
     {"count_crossings_candidate_list", count_crossings_candidate_list_wrapper, METH_VARARGS, ""},
+    {"crossing_counter", (PyCFunction)crossing_counter_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns an opaque CrossingCounter that keeps the number of crossings of points (in general position) while they are moved (see the crossing_counter_* functions)."},
+    {"crossing_counter_count", (PyCFunction)crossing_counter_count_wrapper, METH_VARARGS,
+        "Returns the current number of crossings of a CrossingCounter."},
+    {"crossing_counter_change", (PyCFunction)crossing_counter_change_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the change in the number of crossings if point i of the counter is moved to q, in O(n log n) time. The counter is not modified."},
+    {"crossing_counter_move", (PyCFunction)crossing_counter_move_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Moves point i of the counter to q and returns the new number of crossings."},
     {NULL, NULL, 0, NULL}
 };
 
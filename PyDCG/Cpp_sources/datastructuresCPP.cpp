@@ -0,0 +1,677 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#include "datastructuresCPP.h"
+
+using std::vector;
+
+typedef unsigned __int128 uint128;
+
+static uint64_t priority(int id)
+{
+	//splitmix64, so the shape of a treap only depends on its points
+	uint64_t z = uint64_t(id) + 0x9E3779B97F4A7C15ULL;
+	z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+	z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+	return z ^ (z >> 31);
+}
+
+static int sign_sum(__int128 a, __int128 b, __int128 c, __int128 d)
+{
+	/*
+	 * Sign of a*b + c*d, exactly, for |a|, |c| < 2^64 and |b|, |d| < 2^127
+	 * (the products need up to 191 bits).
+	 */
+	uint128 hi[2], lo[2];
+	int sg[2];
+	__int128 x[2] = {a, c}, y[2] = {b, d};
+	for(int i=0; i<2; i++)
+	{
+		sg[i] = (x[i] == 0 || y[i] == 0) ? 0 : ((x[i] < 0) != (y[i] < 0) ? -1 : 1);
+		uint128 ux = x[i] < 0 ? -uint128(x[i]) : uint128(x[i]);
+		uint128 uy = y[i] < 0 ? -uint128(y[i]) : uint128(y[i]);
+		uint128 p0 = uint128(uint64_t(uy)) * uint64_t(ux);
+		uint128 p1 = (uy >> 64) * uint64_t(ux);
+		lo[i] = p0 + (p1 << 64);
+		hi[i] = (p1 >> 64) + (lo[i] < p0 ? 1 : 0);
+	}
+	if(sg[0] == 0 || sg[0] == sg[1])
+		return sg[1] == 0 ? sg[0] : sg[1];
+	if(sg[1] == 0)
+		return sg[0];
+	if(hi[0] != hi[1])
+		return hi[0] > hi[1] ? sg[0] : sg[1];
+	if(lo[0] != lo[1])
+		return lo[0] > lo[1] ? sg[0] : sg[1];
+	return 0;
+}
+
+DynamicHull::DynamicHull(const vector<Punto>& points)
+	: pts(points), sk_left(points.size(), -1), sk_right(points.size(), -1), root(-1), count(0)
+{
+	for(int s=0; s<2; s++)
+		sk_hull[s].assign(points.size(), -1);
+	vector<int> ids(points.size());
+	for(unsigned int i=0; i<ids.size(); i++)
+		ids[i] = i;
+	bool sorted = true;
+	for(unsigned int i=1; i<ids.size() && sorted; i++)
+		sorted = less(i-1, i);
+	if(!sorted)
+	{
+		std::stable_sort(ids.begin(), ids.end(), [&](int i, int j)->bool{ return less(i, j); });
+		ids.erase(std::unique(ids.begin(), ids.end(), [&](int i, int j)->bool{
+			return pts[i].x == pts[j].x && pts[i].y == pts[j].y;
+		}), ids.end());
+	}
+	root = build(ids);
+}
+
+int DynamicHull::size() const
+{
+	return count;
+}
+
+int DynamicHull::ids() const
+{
+	//Number of ids given so far
+	return pts.size();
+}
+
+const Punto& DynamicHull::point(int id) const
+{
+	return pts[id];
+}
+
+bool DynamicHull::less(int i, int j) const
+{
+	return pts[i].x < pts[j].x || (pts[i].x == pts[j].x && pts[i].y < pts[j].y);
+}
+
+int DynamicHull::turn_side(int side, int i, int j, int k) const
+{
+	//The lower hull is the upper hull of the points reflected on the x axis
+	int t = turn(pts[i], pts[j], pts[k]);
+	return side ? -t : t;
+}
+
+int DynamicHull::make(int pt, int l, int r)
+{
+	int t;
+	if(!h_free.empty())
+	{
+		t = h_free.back();
+		h_free.pop_back();
+	}
+	else
+	{
+		t = h_pt.size();
+		h_left.push_back(-1);
+		h_right.push_back(-1);
+		h_pt.push_back(-1);
+		h_first.push_back(-1);
+		h_last.push_back(-1);
+		h_rc.push_back(0);
+	}
+	h_pt[t] = pt;
+	h_left[t] = l;
+	h_right[t] = r;
+	h_first[t] = l >= 0 ? h_first[l] : pt;
+	h_last[t] = r >= 0 ? h_last[r] : pt;
+	h_rc[t] = 0;
+	incref(l);
+	incref(r);
+	return t;
+}
+
+void DynamicHull::incref(int t)
+{
+	if(t >= 0)
+		h_rc[t]++;
+}
+
+void DynamicHull::release(int t)
+{
+	//Frees t if nothing refers to it any more
+	if(t < 0 || h_rc[t] > 0)
+		return;
+	h_free.push_back(t);
+	decref(h_left[t]);
+	decref(h_right[t]);
+}
+
+void DynamicHull::decref(int t)
+{
+	if(t >= 0 && --h_rc[t] == 0)
+		release(t);
+}
+
+void DynamicHull::split(int t, int id, bool inclusive, int& L, int& R)
+{
+	/*
+	 * Splits the hull t into the points before id (and id itself if
+	 * inclusive) and the rest, copying the search path only.
+	 */
+	if(t < 0)
+	{
+		L = R = -1;
+		return;
+	}
+	int a, b;
+	if(inclusive ? !less(id, h_pt[t]) : less(h_pt[t], id))
+	{
+		split(h_right[t], id, inclusive, a, b);
+		L = a == h_right[t] ? t : make(h_pt[t], h_left[t], a);
+		R = b;
+	}
+	else
+	{
+		split(h_left[t], id, inclusive, a, b);
+		L = a;
+		R = b == h_left[t] ? t : make(h_pt[t], b, h_right[t]);
+	}
+}
+
+int DynamicHull::join(int a, int b)
+{
+	//Every point of a is before every point of b
+	if(a < 0)
+		return b;
+	if(b < 0)
+		return a;
+	if(priority(h_pt[a]) > priority(h_pt[b]))
+		return make(h_pt[a], h_left[a], join(h_right[a], b));
+	return make(h_pt[b], join(a, h_left[b]), h_right[b]);
+}
+
+void DynamicHull::neighbors(int t, int id, int& pred, int& succ) const
+{
+	pred = succ = -1;
+	while(t >= 0 && h_pt[t] != id)
+	{
+		if(less(id, h_pt[t]))
+		{
+			succ = h_pt[t];
+			t = h_left[t];
+		}
+		else
+		{
+			pred = h_pt[t];
+			t = h_right[t];
+		}
+	}
+	if(t >= 0 && h_left[t] >= 0)
+		pred = h_last[h_left[t]];
+	if(t >= 0 && h_right[t] >= 0)
+		succ = h_first[h_right[t]];
+}
+
+int DynamicHull::tangent_right(int t, int q, int side) const
+{
+	//Rightmost vertex of the hull t touched by a tangent from q (left of t)
+	int lo = -1, hi = -1;
+	while(true)
+	{
+		int w = h_pt[t];
+		int wm = h_left[t] >= 0 ? h_last[h_left[t]] : lo;
+		int wM = h_right[t] >= 0 ? h_first[h_right[t]] : hi;
+		if(wM >= 0 && turn_side(side, q, w, wM) != RIGHT)
+		{
+			lo = w;
+			t = h_right[t];
+		}
+		else if(wm >= 0 && turn_side(side, q, w, wm) == LEFT)
+		{
+			hi = w;
+			t = h_left[t];
+		}
+		else
+			return w;
+	}
+}
+
+int DynamicHull::tangent_left(int t, int p, int side) const
+{
+	//Leftmost vertex of the hull t touched by a tangent from p (right of t)
+	int lo = -1, hi = -1;
+	while(true)
+	{
+		int v = h_pt[t];
+		int vm = h_left[t] >= 0 ? h_last[h_left[t]] : lo;
+		int vM = h_right[t] >= 0 ? h_first[h_right[t]] : hi;
+		if(vm >= 0 && turn_side(side, v, p, vm) != RIGHT)
+		{
+			hi = v;
+			t = h_left[t];
+		}
+		else if(vM >= 0 && turn_side(side, v, p, vM) == LEFT)
+		{
+			lo = v;
+			t = h_right[t];
+		}
+		else
+			return v;
+	}
+}
+
+bool DynamicHull::separator_left(int side, int v, int vM, int wm, int w, int m) const
+{
+	/*
+	 * Whether the lines through v, vM and wm, w (not parallel) meet to the
+	 * left of m, or on it. Points on a vertical line are ordered by y, as
+	 * if the plane had been sheared by an infinitesimal amount; this is
+	 * what the y tie break below stands for.
+	 */
+	int sy = side ? -1 : 1;
+	__int128 ax = __int128(pts[vM].x) - pts[v].x, ay = sy*(__int128(pts[vM].y) - pts[v].y);
+	__int128 bx = __int128(pts[w].x) - pts[wm].x, by = sy*(__int128(pts[w].y) - pts[wm].y);
+	__int128 D = ax*by - ay*bx;
+	__int128 cx = __int128(pts[wm].x) - pts[v].x, cy = sy*(__int128(pts[wm].y) - pts[v].y);
+	__int128 N = cx*by - cy*bx;
+	int sD = D > 0 ? 1 : -1;
+	//The meeting point is v + (N/D)(vM - v)
+	int s = sD*sign_sum(__int128(pts[v].x) - pts[m].x, D, ax, N);
+	if(s != 0)
+		return s < 0;
+	s = sD*sign_sum(sy*(__int128(pts[v].y) - pts[m].y), D, ay, N);
+	return side ? s >= 0 : s <= 0;
+}
+
+void DynamicHull::bridge(int A, int B, int side, int& q, int& p) const
+{
+	/*
+	 * Upper bridge between the upper hulls A and B, B to the right of A,
+	 * with q the leftmost vertex of A on it and p the rightmost of B. Both
+	 * hulls are searched at the same time: at each step the edge after the
+	 * current vertex of A and the one before the current vertex of B tell
+	 * in which direction at least one of the bridge points lies; when the
+	 * edges are only below each other's lines, the side of the separating
+	 * line on which they meet decides (Overmars and van Leeuwen). Once
+	 * either search runs out, at most two candidates are left on its side
+	 * and a tangent from each of them is checked. O(log n).
+	 */
+	int m = h_last[A];
+	int ta = A, alo = -1, ahi = -1, tb = B, blo = -1, bhi = -1;
+	bool alo_c = false, ahi_c = false, blo_c = false, bhi_c = false;
+	auto a_left = [&](bool keep) { ahi = h_pt[ta]; ahi_c = keep; ta = h_left[ta]; };
+	auto a_right = [&](bool keep) { alo = h_pt[ta]; alo_c = keep; ta = h_right[ta]; };
+	auto b_left = [&](bool keep) { bhi = h_pt[tb]; bhi_c = keep; tb = h_left[tb]; };
+	auto b_right = [&](bool keep) { blo = h_pt[tb]; blo_c = keep; tb = h_right[tb]; };
+	while(ta >= 0 && tb >= 0)
+	{
+		int v = h_pt[ta], vM = h_right[ta] >= 0 ? h_first[h_right[ta]] : ahi;
+		int w = h_pt[tb], wm = h_left[tb] >= 0 ? h_last[h_left[tb]] : blo;
+		if(vM < 0)
+		{
+			a_left(true);
+			continue;
+		}
+		if(wm < 0)
+		{
+			b_right(true);
+			continue;
+		}
+		bool t1 = turn_side(side, v, vM, wm) == LEFT || turn_side(side, v, vM, w) == LEFT;
+		bool t2 = turn_side(side, wm, w, v) == LEFT || turn_side(side, wm, w, vM) == LEFT;
+		//c > 0 iff the edge of A is steeper than the edge of B
+		int sy = side ? -1 : 1;
+		__int128 ax = __int128(pts[vM].x) - pts[v].x, ay = sy*(__int128(pts[vM].y) - pts[v].y);
+		__int128 bx = __int128(pts[w].x) - pts[wm].x, by = sy*(__int128(pts[w].y) - pts[wm].y);
+		__int128 D = bx*ay - by*ax;
+		int c = D > 0 ? 1 : (D < 0 ? -1 : 0);
+		if(t1 && t2)
+		{
+			a_left(true);
+			b_right(true);
+		}
+		else if(t1)
+		{
+			a_left(true);
+			if(c >= 0)
+				b_left(false);
+		}
+		else if(t2)
+		{
+			b_right(true);
+			if(c >= 0)
+				a_right(false);
+		}
+		else if(c == 0)
+		{
+			a_left(true);
+			b_right(true);
+		}
+		else if(separator_left(side, v, vM, wm, w, m))
+			a_right(false);
+		else
+			b_left(false);
+	}
+
+	q = p = -1;
+	if(ta < 0)
+	{
+		int cand[2] = {alo_c ? alo : -1, ahi_c ? ahi : -1};
+		for(int i=0; i<2 && p < 0; i++)
+		{
+			if(cand[i] < 0)
+				continue;
+			int u = cand[i], um, uM;
+			int r = tangent_right(B, u, side);
+			neighbors(A, u, um, uM);
+			if((um < 0 || turn_side(side, u, r, um) == RIGHT) && (uM < 0 || turn_side(side, u, r, uM) != LEFT))
+			{
+				q = u;
+				p = r;
+			}
+		}
+	}
+	else
+	{
+		int cand[2] = {blo_c ? blo : -1, bhi_c ? bhi : -1};
+		for(int i=0; i<2 && q < 0; i++)
+		{
+			if(cand[i] < 0)
+				continue;
+			int u = cand[i], um, uM;
+			int r = tangent_left(A, u, side);
+			neighbors(B, u, um, uM);
+			if((uM < 0 || turn_side(side, r, u, uM) == RIGHT) && (um < 0 || turn_side(side, r, u, um) != LEFT))
+			{
+				q = r;
+				p = u;
+			}
+		}
+	}
+}
+
+int DynamicHull::merge(int A, int B, int side)
+{
+	//Hull of A and B (B to the right of A); the caller owns the result
+	if(A < 0 || B < 0)
+	{
+		int H = A < 0 ? B : A;
+		incref(H);
+		return H;
+	}
+	int q, p, L, R, a, b;
+	bridge(A, B, side, q, p);
+	split(A, q, true, L, a);
+	split(B, p, false, b, R);
+	int H = join(L, R);
+	incref(H);
+	release(L);
+	release(R);
+	release(a);
+	release(b);
+	return H;
+}
+
+void DynamicHull::recompute(int v)
+{
+	for(int s=0; s<2; s++)
+	{
+		int single = make(v, -1, -1);
+		incref(single);
+		int H = merge(sk_left[v] >= 0 ? sk_hull[s][sk_left[v]] : -1, single, s);
+		decref(single);
+		int G = merge(H, sk_right[v] >= 0 ? sk_hull[s][sk_right[v]] : -1, s);
+		decref(H);
+		decref(sk_hull[s][v]);
+		sk_hull[s][v] = G;
+	}
+}
+
+bool DynamicHull::on_hull(int v, int id) const
+{
+	//Whether id is a vertex of the upper or lower hull of v's subtree
+	for(int s=0; s<2; s++)
+		for(int t=sk_hull[s][v]; t>=0; t = less(id, h_pt[t]) ? h_left[t] : h_right[t])
+			if(h_pt[t] == id)
+				return true;
+	return false;
+}
+
+int DynamicHull::rotate_right(int t)
+{
+	//The hulls of both nodes are left for the caller to recompute
+	int l = sk_left[t];
+	sk_left[t] = sk_right[l];
+	sk_right[l] = t;
+	return l;
+}
+
+int DynamicHull::rotate_left(int t)
+{
+	int r = sk_right[t];
+	sk_right[t] = sk_left[r];
+	sk_left[r] = t;
+	return r;
+}
+
+int DynamicHull::insert(int t, int id, bool& changed)
+{
+	/*
+	 * Once id is not a vertex of the hulls of a subtree, the hulls of its
+	 * ancestors do not change either and are not recomputed.
+	 */
+	if(t < 0)
+	{
+		sk_left[id] = sk_right[id] = -1;
+		recompute(id);
+		changed = true;
+		return id;
+	}
+	int top = t;
+	if(less(id, t))
+	{
+		sk_left[t] = insert(sk_left[t], id, changed);
+		if(priority(sk_left[t]) > priority(t))
+			top = rotate_right(t);
+	}
+	else
+	{
+		sk_right[t] = insert(sk_right[t], id, changed);
+		if(priority(sk_right[t]) > priority(t))
+			top = rotate_left(t);
+	}
+	if(top != t)
+		recompute(t);
+	if(top != t || changed)
+	{
+		recompute(top);
+		changed = on_hull(top, id);
+	}
+	return top;
+}
+
+int DynamicHull::remove(int t, int id)
+{
+	/*
+	 * The hulls of a subtree only change if id is one of their vertices.
+	 * The point is rotated down until it has at most one child.
+	 */
+	if(t == id)
+	{
+		if(sk_left[t] < 0 || sk_right[t] < 0)
+		{
+			for(int s=0; s<2; s++)
+			{
+				decref(sk_hull[s][t]);
+				sk_hull[s][t] = -1;
+			}
+			return sk_left[t] < 0 ? sk_right[t] : sk_left[t];
+		}
+		int top;
+		if(priority(sk_left[t]) > priority(sk_right[t]))
+		{
+			top = rotate_right(t);
+			sk_right[top] = remove(t, id);
+		}
+		else
+		{
+			top = rotate_left(t);
+			sk_left[top] = remove(t, id);
+		}
+		recompute(top);
+		return top;
+	}
+	bool vertex = on_hull(t, id);
+	if(less(id, t))
+		sk_left[t] = remove(sk_left[t], id);
+	else
+		sk_right[t] = remove(sk_right[t], id);
+	if(vertex)
+		recompute(t);
+	return t;
+}
+
+int DynamicHull::build(vector<int>& ids)
+{
+	/*
+	 * Skeleton treap of the given (sorted) points in O(n) time, as a
+	 * Cartesian tree on their priorities, and then their hulls bottom up.
+	 */
+	vector<int> stack;
+	for(unsigned int i=0; i<ids.size(); i++)
+	{
+		int last = -1;
+		while(!stack.empty() && priority(stack.back()) < priority(ids[i]))
+		{
+			last = stack.back();
+			stack.pop_back();
+		}
+		sk_left[ids[i]] = last;
+		if(!stack.empty())
+			sk_right[stack.back()] = ids[i];
+		stack.push_back(ids[i]);
+	}
+	count = ids.size();
+	if(stack.empty())
+		return -1;
+	//Post-order, without recursion
+	vector<std::pair<int, bool> > todo(1, std::make_pair(stack[0], false));
+	while(!todo.empty())
+	{
+		std::pair<int, bool> top = todo.back();
+		todo.pop_back();
+		if(top.second)
+			recompute(top.first);
+		else
+		{
+			todo.push_back(std::make_pair(top.first, true));
+			if(sk_left[top.first] >= 0)
+				todo.push_back(std::make_pair(sk_left[top.first], false));
+			if(sk_right[top.first] >= 0)
+				todo.push_back(std::make_pair(sk_right[top.first], false));
+		}
+	}
+	return stack[0];
+}
+
+int DynamicHull::find(const Punto& p) const
+{
+	int t = root;
+	while(t >= 0 && (pts[t].x != p.x || pts[t].y != p.y))
+	{
+		if(p.x < pts[t].x || (p.x == pts[t].x && p.y < pts[t].y))
+			t = sk_left[t];
+		else
+			t = sk_right[t];
+	}
+	return t;
+}
+
+int DynamicHull::insert(const Punto& p)
+{
+	//Returns the id of p; if p is already there nothing changes
+	int id = find(p);
+	if(id >= 0)
+		return id;
+	id = pts.size();
+	pts.push_back(p);
+	sk_left.push_back(-1);
+	sk_right.push_back(-1);
+	for(int s=0; s<2; s++)
+		sk_hull[s].push_back(-1);
+	bool changed;
+	root = insert(root, id, changed);
+	count++;
+	return id;
+}
+
+int DynamicHull::remove(const Punto& p)
+{
+	//Returns the id p had, or -1 if it is not there
+	int id = find(p);
+	if(id < 0)
+		return -1;
+	root = remove(root, id);
+	sk_left[id] = sk_right[id] = -1;
+	count--;
+	return id;
+}
+
+void DynamicHull::in_order(int t, vector<int32_t>& out) const
+{
+	vector<int> stack;
+	while(t >= 0 || !stack.empty())
+	{
+		while(t >= 0)
+		{
+			stack.push_back(t);
+			t = h_left[t];
+		}
+		t = stack.back();
+		stack.pop_back();
+		out.push_back(h_pt[t]);
+		t = h_right[t];
+	}
+}
+
+void DynamicHull::upper(vector<int32_t>& out) const
+{
+	//Ids of the upper hull from left to right
+	if(root >= 0)
+		in_order(sk_hull[0][root], out);
+}
+
+void DynamicHull::lower(vector<int32_t>& out) const
+{
+	//Ids of the lower hull from left to right
+	if(root >= 0)
+		in_order(sk_hull[1][root], out);
+}
+
+void DynamicHull::hull(vector<int32_t>& out) const
+{
+	//Ids of the convex hull in ccw order, starting at the leftmost point
+	if(count <= 1)
+	{
+		if(root >= 0)
+			out.push_back(root);
+		return;
+	}
+	vector<int32_t> up;
+	lower(out);
+	out.pop_back();
+	upper(up);
+	for(int i=up.size()-1; i>0; i--)
+		out.push_back(up[i]);
+}
@@ -0,0 +1,85 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#ifndef DATASTRUCTURESCPP_H_
+#define DATASTRUCTURESCPP_H_
+
+#include "geometricbasicsCpp.h"
+#include <vector>
+#include <cstdint>
+
+/*
+ * Fully dynamic convex hull in the style of Overmars and van Leeuwen.
+ * The points are kept in a treap ordered by x (then y), and every node of
+ * it stores the upper and lower hulls of its subtree as persistent treaps:
+ * a node's hulls are joined from its children's ones through their bridge
+ * in O(log n) time (one search, two splits and a join) without destroying
+ * them, so insertions and deletions take O(log^2 n) expected time. All the
+ * nodes live in parallel arrays; the nodes of the hull treaps are reference
+ * counted and reused. Every point has an id: its position in the initial
+ * point set, and the next unused one for each inserted point.
+ */
+class DynamicHull
+{
+public:
+	DynamicHull(const std::vector<Punto>& = std::vector<Punto>());
+	int size() const;
+	int ids() const;
+	int find(const Punto&) const;
+	int insert(const Punto&);
+	int remove(const Punto&);
+	const Punto& point(int) const;
+	void upper(std::vector<int32_t>&) const;
+	void lower(std::vector<int32_t>&) const;
+	void hull(std::vector<int32_t>&) const;
+private:
+	std::vector<Punto> pts;
+	//Skeleton treap, indexed by point id
+	std::vector<int> sk_left, sk_right;
+	std::vector<int> sk_hull[2];
+	int root, count;
+	//Persistent hull treaps
+	std::vector<int> h_left, h_right, h_pt, h_first, h_last, h_rc, h_free;
+
+	bool less(int, int) const;
+	int turn_side(int, int, int, int) const;
+	int make(int, int, int);
+	void release(int);
+	void incref(int);
+	void decref(int);
+	void split(int, int, bool, int&, int&);
+	int join(int, int);
+	void neighbors(int, int, int&, int&) const;
+	int tangent_right(int, int, int) const;
+	int tangent_left(int, int, int) const;
+	bool separator_left(int, int, int, int, int, int) const;
+	void bridge(int, int, int, int&, int&) const;
+	int merge(int, int, int);
+	void recompute(int);
+	bool on_hull(int, int) const;
+	int rotate_left(int);
+	int rotate_right(int);
+	int insert(int, int, bool&);
+	int remove(int, int);
+	int build(std::vector<int>&);
+	void in_order(int, std::vector<int32_t>&) const;
+};
+
+#endif /* DATASTRUCTURESCPP_H_ */
@@ -0,0 +1,192 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#include "utilities.cpp"
+#include "datastructuresCPP.h"
+
+static void dynamic_hull_destructor(PyObject* capsule)
+{
+    delete (DynamicHull*)PyCapsule_GetPointer(capsule, "datastructuresCpp.dynamic_hull");
+}
+
+static DynamicHull* get_dynamic_hull(PyObject* py_hull)
+{
+    return (DynamicHull*)PyCapsule_GetPointer(py_hull, "datastructuresCpp.dynamic_hull");
+}
+
+extern "C" PyObject* dynamic_hull_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_pts;
+    vector<Punto> pts;
+    DynamicHull* hull;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    //points may be a list of points or an (n, 2) int64 array
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:dynamic_hull", (char**)kwlist, &py_pts))
+        return (PyObject*)NULL;
+
+    if(pyPoints_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    hull = new DynamicHull(pts);
+    Py_END_ALLOW_THREADS
+
+    return PyCapsule_New(hull, "datastructuresCpp.dynamic_hull", dynamic_hull_destructor);
+}
+
+extern "C" PyObject* dynamic_hull_update_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_hull;
+    PyObject* py_p;
+    PyObject* py_delete = NULL;
+    Punto p;
+
+    static const char *kwlist[] = {"hull", "p", "delete", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO!|O!:dynamic_hull_update", (char**)kwlist, &py_hull, &PyList_Type, &py_p, &PyBool_Type, &py_delete))
+        return (PyObject*)NULL;
+
+    DynamicHull* hull = get_dynamic_hull(py_hull);
+    if(hull == NULL)
+        return (PyObject*)NULL;
+
+    if(pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    if(py_delete == Py_True)
+        return Py_BuildValue("i", hull->remove(p));
+    return Py_BuildValue("i", hull->insert(p));
+}
+
+extern "C" PyObject* dynamic_hull_find_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_hull;
+    PyObject* py_p;
+    Punto p;
+
+    static const char *kwlist[] = {"hull", "p", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO!:dynamic_hull_find", (char**)kwlist, &py_hull, &PyList_Type, &py_p))
+        return (PyObject*)NULL;
+
+    DynamicHull* hull = get_dynamic_hull(py_hull);
+    if(hull == NULL)
+        return (PyObject*)NULL;
+
+    if(pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("i", hull->find(p));
+}
+
+extern "C" PyObject* dynamic_hull_point_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_hull;
+    int id;
+
+    static const char *kwlist[] = {"hull", "id", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "Oi:dynamic_hull_point", (char**)kwlist, &py_hull, &id))
+        return (PyObject*)NULL;
+
+    DynamicHull* hull = get_dynamic_hull(py_hull);
+    if(hull == NULL)
+        return (PyObject*)NULL;
+
+    if(id < 0 || id >= hull->ids())
+    {
+        PyErr_SetString(PyExc_IndexError, "There is no point with that id.");
+        return (PyObject*)NULL;
+    }
+
+    return CPoint_PyPoint(hull->point(id));
+}
+
+extern "C" PyObject* dynamic_hull_size_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_hull;
+
+    static const char *kwlist[] = {"hull", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:dynamic_hull_size", (char**)kwlist, &py_hull))
+        return (PyObject*)NULL;
+
+    DynamicHull* hull = get_dynamic_hull(py_hull);
+    if(hull == NULL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("i", hull->size());
+}
+
+extern "C" PyObject* dynamic_hull_vertices_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_hull;
+    const char* chain = "hull";
+    vector<int32_t> ids;
+
+    static const char *kwlist[] = {"hull", "chain", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O|s:dynamic_hull_vertices", (char**)kwlist, &py_hull, &chain))
+        return (PyObject*)NULL;
+
+    DynamicHull* hull = get_dynamic_hull(py_hull);
+    if(hull == NULL)
+        return (PyObject*)NULL;
+
+    if(strcmp(chain, "upper") == 0)
+        hull->upper(ids);
+    else if(strcmp(chain, "lower") == 0)
+        hull->lower(ids);
+    else if(strcmp(chain, "hull") == 0)
+        hull->hull(ids);
+    else
+    {
+        PyErr_SetString(PyExc_ValueError, "chain must be 'hull', 'upper' or 'lower'.");
+        return (PyObject*)NULL;
+    }
+
+    return CVector_PyBuffer(ids);
+}
+
+PyMethodDef datastructuresCppMethods[] =
+{
+    {"dynamic_hull", (PyCFunction)dynamic_hull_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a dynamic convex hull of points (a list of points or an (n, 2) int64 array, faster if sorted by x and then y); the id of each point is its index. Repeated points are only counted once."},
+    {"dynamic_hull_update", (PyCFunction)dynamic_hull_update_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Inserts p into hull and returns its id (the one it already had if it was there); with delete=True removes it instead and returns the id it had, or -1 if it was not there."},
+    {"dynamic_hull_find", (PyCFunction)dynamic_hull_find_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the id of p in hull, or -1 if it is not there."},
+    {"dynamic_hull_point", (PyCFunction)dynamic_hull_point_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the point with the given id (also if it was deleted)."},
+    {"dynamic_hull_size", (PyCFunction)dynamic_hull_size_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the number of points in hull."},
+    {"dynamic_hull_vertices", (PyCFunction)dynamic_hull_vertices_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns an int32 bytearray with the ids of the vertices of the convex hull in ccw order starting at the leftmost one (chain='hull'), or of the upper or lower hull from left to right (chain='upper' or 'lower')."},
+    {NULL, NULL, 0, NULL}
+};
+
+PyMODINIT_FUNC
+initdatastructuresCpp(void)
+{
+    (void) Py_InitModule3("datastructuresCpp", datastructuresCppMethods,
+                          "Extension in C++ with array-backed data structures.");
+}
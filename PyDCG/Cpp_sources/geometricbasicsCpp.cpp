@@ -333,6 +333,50 @@ void orderandsplit(const vector<Punto>& points, vector<puntos_ordenados> &ordere
 	}
 }
 
+void sort_right_indices(const vector<Punto>& points, int i, vector<int> &r, vector<int> *l)
+{
+	/*
+	 * Stores in r the indices of the points that lie to the right
+	 * of points[i], sorted ccw around it, as in orderandsplit.
+	 * If l is given, the ones to its left are stored there.
+	 */
+	const Punto &p = points[i];
+	Punto p1(p.x, p.y+1);
+	r.clear();
+	r.reserve(points.size());
+	if(l != NULL)
+		l->clear();
+
+	for(unsigned int j=0; j<points.size(); j++)
+		if(points[j]!=p)
+		{
+			int t = turn(p, p1, points[j]);
+			if(t == RIGHT || (t == COLLINEAR && p.y < points[j].y))
+				r.push_back(j);
+			else if(l != NULL)
+				l->push_back(j);
+		}
+
+	auto cmp = [&p, &points](int a, int b)->bool{
+		return turn(p, points[a], points[b]) < 0;
+	};
+	sort(r.begin(), r.end(), cmp);
+	if(l != NULL)
+		sort(l->begin(), l->end(), cmp);
+}
+
+void orderandsplit_indices(const vector<Punto>& points, vector<vector<int> > &right)
+{
+	/*
+	 * Same as orderandsplit, but only the points that lie to the
+	 * right of each p are kept, and they are stored as indices
+	 * into points instead of copies.
+	 */
+	right.resize(points.size());
+	for(unsigned int i=0; i<points.size(); i++)
+		sort_right_indices(points, i, right[i]);
+}
+
 int slow_generalposition(vector<Punto>& pts)
 {
 	/*
@@ -376,6 +420,260 @@ int general_position(vector<Punto>& points)
 	return col;
 }
 
+void convex_hull(const vector<Punto>& points, size_t begin, size_t end, vector<int>& hull)
+{
+	/*
+	 * Appends to hull the indices (counted from begin) of the vertices of
+	 * the convex hull of points[begin], ..., points[end-1] in ccw order,
+	 * starting at the leftmost one (the lowest of them if there are
+	 * several). Points in the interior of hull edges and repeated points
+	 * are left out. Andrew's monotone chain, O(n log n).
+	 */
+	vector<int> idx(end - begin);
+	for(unsigned int i=0; i<idx.size(); i++)
+		idx[i] = i;
+	auto P = [&](int i)->const Punto& { return points[begin + i]; };
+	std::sort(idx.begin(), idx.end(), [&](int i, int j)->bool{
+		return P(i).x < P(j).x || (P(i).x == P(j).x && (P(i).y < P(j).y || (P(i).y == P(j).y && i < j)));
+	});
+	idx.erase(std::unique(idx.begin(), idx.end(), [&](int i, int j)->bool{
+		return P(i).x == P(j).x && P(i).y == P(j).y;
+	}), idx.end());
+
+	int m = idx.size();
+	if(m <= 1)
+	{
+		hull.insert(hull.end(), idx.begin(), idx.end());
+		return;
+	}
+
+	vector<int> H(2*m);
+	int k = 0;
+	for(int i=0; i<m; i++)
+	{
+		while(k >= 2 && turn(P(H[k-2]), P(H[k-1]), P(idx[i])) != LEFT)
+			k--;
+		H[k++] = idx[i];
+	}
+	for(int i=m-2, t=k+1; i>=0; i--)
+	{
+		while(k >= t && turn(P(H[k-2]), P(H[k-1]), P(idx[i])) != LEFT)
+			k--;
+		H[k++] = idx[i];
+	}
+	hull.insert(hull.end(), H.begin(), H.begin() + k - 1);
+}
+
+static void boundary_chain(const vector<Punto>& points, const vector<int>& sorted, int side, vector<int>& chain)
+{
+	//Upper (side = RIGHT) or lower (side = LEFT) hull of the x-sorted indices, keeping the points on its edges
+	chain.clear();
+	for(int i : sorted)
+	{
+		while(chain.size() >= 2 && turn(points[chain[chain.size()-2]], points[chain.back()], points[i]) == -side)
+			chain.pop_back();
+		chain.push_back(i);
+	}
+}
+
+static void merge_chains(const vector<Punto>& points, const vector<int>& A, const vector<int>& B, int side, vector<int>& chain)
+{
+	//Same as boundary_chain over A followed by B, for two such chains with A to the left of B: only the bridge is walked to
+	if(A.empty() || B.empty())
+	{
+		chain = A.empty() ? B : A;
+		return;
+	}
+	int i = A.size()-1, j = 0;
+	for(bool moved=true; moved; )
+	{
+		moved = false;
+		while(i > 0 && turn(points[A[i-1]], points[A[i]], points[B[j]]) == -side)
+		{
+			i--;
+			moved = true;
+		}
+		while(j+1 < int(B.size()) && turn(points[A[i]], points[B[j]], points[B[j+1]]) == -side)
+		{
+			j++;
+			moved = true;
+		}
+	}
+	chain.assign(A.begin(), A.begin()+i+1);
+	chain.insert(chain.end(), B.begin()+j, B.end());
+}
+
+void convex_layers(const vector<Punto>& points, vector<int32_t>& layers)
+{
+	/*
+	 * layers[i] is the convex layer of points[i]: 0 for the points on
+	 * the boundary of the convex hull, 1 for the ones on the boundary of
+	 * the hull of the rest, and so on. The points sorted by x are split
+	 * in blocks, and a binary tree over the blocks keeps the upper and
+	 * lower hulls of each subtree, each one joined from the hulls of its
+	 * children through their bridge. Peeling a layer only rebuilds the
+	 * nodes above its points, so for point sets whose partial hulls are
+	 * small (random ones, for instance) the whole thing takes about
+	 * O(n log n) time. The tree works on a sorted copy of the points,
+	 * so that the nodes read nearby memory. Repeated points are kept
+	 * once there and all their copies get the same layer.
+	 */
+	const int B = 16;
+	int n = points.size();
+	layers.assign(n, -1);
+	if(n == 0)
+		return;
+
+	vector<int> order(n);
+	for(int i=0; i<n; i++)
+		order[i] = i;
+	std::sort(order.begin(), order.end(), [&](int i, int j)->bool{
+		return points[i].x < points[j].x || (points[i].x == points[j].x && (points[i].y < points[j].y || (points[i].y == points[j].y && i < j)));
+	});
+	//position[i] is the position in sorted of points[order[i]]
+	vector<Punto> sorted;
+	vector<int> position(n);
+	for(int i=0; i<n; i++)
+	{
+		const Punto &p = points[order[i]];
+		if(sorted.empty() || p.x != sorted.back().x || p.y != sorted.back().y)
+			sorted.push_back(p);
+		position[i] = sorted.size() - 1;
+	}
+	n = sorted.size();
+
+	//The chains hold positions in sorted
+	vector<int> peeled(n, -1);
+	int blocks = (n + B - 1) / B, size = 1;
+	while(size < blocks)
+		size *= 2;
+	vector<vector<int> > upper(2*size), lower(2*size);
+	vector<int> buf;
+
+	auto build = [&](int v){
+		if(v >= size)
+		{
+			buf.clear();
+			for(int i=(v-size)*B; i<std::min(n, (v-size+1)*B); i++)
+				if(peeled[i] == -1)
+					buf.push_back(i);
+			boundary_chain(sorted, buf, RIGHT, upper[v]);
+			boundary_chain(sorted, buf, LEFT, lower[v]);
+			return;
+		}
+		merge_chains(sorted, upper[2*v], upper[2*v+1], RIGHT, upper[v]);
+		merge_chains(sorted, lower[2*v], lower[2*v+1], LEFT, lower[v]);
+	};
+
+	for(int v=2*size-1; v>=1; v--)
+		build(v);
+
+	vector<int> dirty;
+	for(int layer=0; !upper[1].empty(); layer++)
+	{
+		dirty.clear();
+		for(auto chain : {&upper[1], &lower[1]})
+			for(int i : *chain)
+				if(peeled[i] == -1)
+				{
+					peeled[i] = layer;
+					dirty.push_back(size + i / B);
+				}
+		//Rebuild the blocks of the peeled points and everything above them, one level at a time
+		while(!dirty.empty())
+		{
+			std::sort(dirty.begin(), dirty.end());
+			dirty.erase(std::unique(dirty.begin(), dirty.end()), dirty.end());
+			for(int v : dirty)
+				build(v);
+			if(dirty[0] == 1)
+				break;
+			for(int &v : dirty)
+				v /= 2;
+		}
+	}
+
+	for(unsigned int i=0; i<order.size(); i++)
+		layers[order[i]] = peeled[position[i]];
+}
+
+static bool signed_directions(const vector<Punto>& points, const Punto& p, vector<int>& seq)
+{
+	/*
+	 * Stores in seq the ccw order, starting at the positive x axis,
+	 * of the directions from p to each points[j] (coded as 2j) and
+	 * their opposites (2j+1). Returns false if p is one of the points
+	 * or is collinear with two of them.
+	 */
+	int n = points.size();
+	seq.resize(2*n);
+	for(int j=0; j<n; j++)
+	{
+		if(points[j] == p)
+			return false;
+		seq[2*j] = 2*j;
+		seq[2*j+1] = 2*j+1;
+	}
+
+	//Whether direction d is in [0, pi)
+	auto upper = [&p, &points](int d)->bool{
+		const Punto &q = points[d>>1];
+		bool up = q.y > p.y || (q.y == p.y && q.x > p.x);
+		return (d & 1) ? !up : up;
+	};
+	//Sign of the cross product of directions d and e
+	auto ccw = [&p, &points](int d, int e)->int{
+		int s = -turn(p, points[d>>1], points[e>>1]);
+		return ((d ^ e) & 1) ? -s : s;
+	};
+	sort(seq.begin(), seq.end(), [&upper, &ccw](int d, int e)->bool{
+		bool ud = upper(d), ue = upper(e);
+		if(ud != ue)
+			return ud;
+		return ccw(d, e) > 0;
+	});
+
+	//Two points collinear with p give equal directions, which end up together
+	for(int k=0; k+1<2*n; k++)
+		if(upper(seq[k]) == upper(seq[k+1]) && ccw(seq[k], seq[k+1]) == 0)
+			return false;
+	return true;
+}
+
+bool preserves_order_type(const vector<Punto>& points, const Punto& a, const Punto& b)
+{
+	/*
+	 * Decides whether moving a point from a to b, with points being
+	 * the rest of the set, keeps the order type; that is, whether no
+	 * line spanned by two of the points crosses or touches the segment
+	 * ab. The orientations of the triples that contain a are given by
+	 * the cyclic order of the directions from a to the points and
+	 * their opposites, so the orders around a and b must be rotations
+	 * of each other. Takes O(n log n) time.
+	 */
+	vector<int> sa, sb;
+	if(!signed_directions(points, a, sa) || !signed_directions(points, b, sb))
+		return false;
+	size_t m = sa.size();
+	if(m == 0)
+		return true;
+	size_t r = std::find(sb.begin(), sb.end(), sa[0]) - sb.begin();
+	for(size_t k=0; k<m; k++)
+		if(sa[k] != sb[(k+r) % m])
+			return false;
+	return true;
+}
+
+bool general_position_p(const vector<Punto>& points, const Punto& p)
+{
+	/*
+	 * Decides whether p is not one of the points and is not
+	 * collinear with two of them. Takes O(n log n) time.
+	 */
+	vector<int> seq;
+	return signed_directions(points, p, seq);
+}
+
 void print_pts(long pts[][2], int n)
 {
     int i;
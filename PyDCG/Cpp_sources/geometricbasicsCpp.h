@@ -74,7 +74,13 @@ struct puntos_ordenados
 int turn(const long long p0[], const long long p1[], const long long p2[]);
 int turn(const Punto&, const Punto&, const Punto&);
 void orderandsplit(const std::vector<Punto>&, std::vector<puntos_ordenados>&);
+void sort_right_indices(const std::vector<Punto>&, int, std::vector<int>&, std::vector<int>* =NULL);
+void orderandsplit_indices(const std::vector<Punto>&, std::vector<std::vector<int> >&);
 int general_position(std::vector<Punto>&);
+void convex_hull(const std::vector<Punto>&, size_t, size_t, std::vector<int>&);
+void convex_layers(const std::vector<Punto>&, std::vector<int32_t>&);
+bool preserves_order_type(const std::vector<Punto>&, const Punto&, const Punto&);
+bool general_position_p(const std::vector<Punto>&, const Punto&);
 
 void sort_around_point(long long const*, long long** const, int);
 //void sort_around_point2(long long const*, long long** const, int);
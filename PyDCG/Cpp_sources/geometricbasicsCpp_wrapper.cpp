@@ -193,10 +193,172 @@ PyObject* sort_around_point_wrapper(PyObject* self, PyObject* args, PyObject *ke
 	return res;
 }
 
+PyObject* convex_hull_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void convex_hull(const std::vector<Punto>&, size_t, size_t, std::vector<int>&);
+    PyObject* py_pts;
+    vector<Punto> pts;
+    vector<int> hull;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    //points may be a list of points or an (n, 2) int64 array
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:convex_hull", (char**)kwlist, &py_pts))
+        return NULL;
+
+    if(pyPoints_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    convex_hull(pts, 0, pts.size(), hull);
+
+    PyObject* res = PyList_New(hull.size());
+    if(res == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<hull.size(); i++)
+        PyList_SET_ITEM(res, i, PyInt_FromLong(hull[i]));
+
+    return res;
+}
+
+PyObject* convex_hulls_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void convex_hull(const std::vector<Punto>&, size_t, size_t, std::vector<int>&);
+    PyObject* py_pts;
+    PyObject* py_offsets;
+    vector<Punto> pts;
+    vector<int> offsets, hulls, hull_offsets;
+
+    static const char *kwlist[] = {"points", "offsets", NULL};
+
+    //points may be a list of points or an (n, 2) int64 array, offsets is a list of ints
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO!:convex_hulls", (char**)kwlist, &py_pts, &PyList_Type, &py_offsets))
+        return NULL;
+
+    if(pyPoints_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_ssize_t m = PyList_Size(py_offsets);
+    for(Py_ssize_t i=0; i<m; i++)
+    {
+        offsets.push_back((int)PyInt_AsLong(PyList_GetItem(py_offsets, i)));
+        if(PyErr_Occurred() != NULL)
+            return (PyObject*)NULL;
+        if(offsets[i] < 0 || offsets[i] > (int)pts.size() || (i > 0 && offsets[i] < offsets[i-1]))
+        {
+            PyErr_SetString(PyExc_ValueError, "The offsets must be non decreasing and at most the number of points.");
+            return (PyObject*)NULL;
+        }
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    hull_offsets.push_back(0);
+    for(Py_ssize_t i=0; i+1<m; i++)
+    {
+        convex_hull(pts, offsets[i], offsets[i+1], hulls);
+        hull_offsets.push_back(hulls.size());
+    }
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("NN", CVector_PyBuffer(hulls), CVector_PyBuffer(hull_offsets));
+}
+
+PyObject* convex_layers_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void convex_layers(const std::vector<Punto>&, std::vector<int32_t>&);
+    PyObject* py_pts;
+    vector<Punto> pts;
+    vector<int32_t> layers;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    //points may be a list of points or an (n, 2) int64 array
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:convex_layers", (char**)kwlist, &py_pts))
+        return NULL;
+
+    if(pyPoints_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    convex_layers(pts, layers);
+    Py_END_ALLOW_THREADS
+
+    return CVector_PyBuffer(layers);
+}
+
+PyObject* preserves_order_type_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //bool preserves_order_type(const std::vector<Punto>&, const Punto&, const Punto&);
+    PyObject *py_p, *py_q, *py_pts;
+    Punto p, q;
+    vector<Punto> pts;
+    bool res;
+
+    static const char *kwlist[] = {"p", "q", "points", NULL};
+
+    //points may be a list of points or an (n, 2) int64 array
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!O!O:preserves_order_type", (char**)kwlist, &PyList_Type, &py_p, &PyList_Type, &py_q, &py_pts))
+        return NULL;
+
+    if(pyPoint_CPoint(py_p, p) == FAIL || pyPoint_CPoint(py_q, q) == FAIL)
+        return (PyObject*)NULL;
+
+    if(pyPoints_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    res = preserves_order_type(pts, p, q);
+    Py_END_ALLOW_THREADS
+
+    return PyBool_FromLong(res);
+}
+
+PyObject* general_position_p_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //bool general_position_p(const std::vector<Punto>&, const Punto&);
+    PyObject *py_p, *py_pts;
+    Punto p;
+    vector<Punto> pts;
+    bool res;
+
+    static const char *kwlist[] = {"p", "points", NULL};
+
+    //points may be a list of points or an (n, 2) int64 array
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!O:general_position_p", (char**)kwlist, &PyList_Type, &py_p, &py_pts))
+        return NULL;
+
+    if(pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    if(pyPoints_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    res = general_position_p(pts, p);
+    Py_END_ALLOW_THREADS
+
+    return PyBool_FromLong(res);
+}
+
 PyMethodDef geometricbasicsCppMethods[] =
 {
     {"turn", (PyCFunction)turn_wrapper, METH_VARARGS | METH_KEYWORDS, turn_doc},
     {"sort_around_point", (PyCFunction)sort_around_point_wrapper, METH_VARARGS | METH_KEYWORDS, sort_around_point_doc},
+    {"convex_hull", (PyCFunction)convex_hull_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the list of indices into points (a list of points or an (n, 2) int64 array) of the vertices of their convex hull in ccw order, starting at the leftmost one. Points in the interior of hull edges and repeated points are left out."},
+    {"convex_hulls", (PyCFunction)convex_hulls_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Computes convex_hull for each of the point sets points[offsets[i]:offsets[i+1]]. Returns two int32 bytearrays (hulls, hull_offsets): the hull of the i-th set is hulls[hull_offsets[i]:hull_offsets[i+1]], with indices counted from offsets[i]."},
+    {"convex_layers", (PyCFunction)convex_layers_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns an int32 bytearray with the convex layer of each point of points (a list of points or an (n, 2) int64 array), 0 for the points on the boundary of their convex hull."},
+    {"preserves_order_type", (PyCFunction)preserves_order_type_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns True if moving a point from p to q, with points (a list of points or an (n, 2) int64 array) the rest of the set, keeps the order type: no line spanned by two of the points crosses or touches the segment pq."},
+    {"general_position_p", (PyCFunction)general_position_p_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns True if p is not one of points (a list of points or an (n, 2) int64 array) and is not collinear with two of them."},
     {NULL, NULL, 0, NULL}
 };
 
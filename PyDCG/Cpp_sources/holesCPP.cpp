@@ -19,6 +19,7 @@
 */
 
 #include "holesCPP.h"
+#include "parallel.h"
 #include <cmath>
 #include <algorithm>
 #include <utility>
@@ -34,7 +35,9 @@ using std::list;
 
 //-------------------------------------------------------------
 
-static vector<Punto> _default;
+//Scratch space for the left points when join == true. It is per thread
+//so that count_convex_rholes_p_many can call sort_around_point.
+static thread_local vector<Punto> _default;
 
 void sort_around_point(Punto p, const vector<Punto>& points, vector<Punto>& r,
                        vector<Punto>& l = _default, bool join = true)
@@ -103,6 +106,43 @@ void sort_around_point(Punto p, const vector<Punto>& points, vector<Punto>& r,
 	_default.clear();
 }
 
+void sort_around_point_indices(Punto p, const vector<Punto>& points, vector<int>& r)
+{
+	/*
+	 * Same as sort_around_point with join == true, but it
+	 * stores in r the indices of the sorted points.
+	 */
+	Punto p1(p.x, p.y + 1);
+	vector<int> l;
+	r.reserve(points.size());
+	l.reserve(points.size());
+
+	for (unsigned int i = 0; i < points.size(); i++)
+	{
+		int t = turn(p, p1, points[i]);
+		if (t == RIGHT || (t == COLLINEAR && p.y < points[i].y))
+			r.push_back(i);
+		else
+			l.push_back(i);
+	}
+
+	auto cmp = [&p, &points](int a, int b)->bool
+	{
+		return turn(p, points[a], points[b]) < 0;
+	};
+
+	sort(l.begin(), l.end(), cmp);
+	sort(r.begin(), r.end(), cmp);
+	r.insert(r.end(), l.begin(), l.end());
+
+	for (unsigned int i = 0; i < r.size(); i++)
+		if (turn(points[r[i]], p, points[r[(i + 1) % r.size()]]) < 0)
+		{
+			std::rotate(r.begin(), r.begin() + (i + 1) % r.size(), r.end());
+			break;
+		}
+}
+
 vector<vector<pair<vector<int>, vector<int> > > > compute_visibility_graph(const vector<puntos_ordenados>& sorted_points)
 {
 	/* Computes the visibility of every
@@ -144,6 +184,161 @@ vector<vector<pair<vector<int>, vector<int> > > > compute_visibility_graph(const
 	return G;
 }
 
+pivot_graph::pivot_graph() : pivot(-1)
+{}
+
+size_t pivot_graph::num_edges() const
+{
+	return out_adj.size();
+}
+
+size_t pivot_graph::memory() const
+{
+	return sizeof(int32_t) * (order.size() + in_off.size() + in_adj.size() +
+			in_eid.size() + out_off.size() + out_adj.size() + L.size());
+}
+
+void build_pivot_graph(const vector<Punto>& points, int p, pivot_graph& g)
+{
+	/*
+	 * Computes the visibility graph of the points to the right of
+	 * points[p] as in compute_visibility_graph, and stores it in g.
+	 * The queues of "Searching for empty convex polygons" are kept
+	 * as linked lists in a single pool and proceed is unrolled into
+	 * an explicit stack (within one call to proceed j never changes).
+	 */
+	vector<int> right;
+	sort_right_indices(points, p, right);
+	build_pivot_graph(points, p, right, g);
+}
+
+void build_pivot_graph(const vector<Punto>& points, int p, const vector<int>& right, pivot_graph& g)
+{
+	/*
+	 * Same as above, with the points to the right of points[p]
+	 * already sorted as sort_right_indices does.
+	 */
+	g.pivot = p;
+	g.L.clear();
+	g.order.assign(right.begin(), right.end());
+
+	int m = g.order.size();
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+
+	vector<int32_t> qhead(m, -1), qtail(m, -1), qval, qnext, src, dst, stack;
+
+	for(int j=1; j<m; j++)
+	{
+		stack.push_back(j-1);
+		while(!stack.empty())
+		{
+			int i = stack.back();
+			int h = qhead[i];
+			if(h != -1 && turn(P(qval[h]), P(i), P(j)) == LEFT)
+			{
+				stack.push_back(qval[h]);
+				continue;
+			}
+			//Q[j].push_back(i) and we add ij to the graph
+			qval.push_back(i);
+			qnext.push_back(-1);
+			if(qtail[j] == -1)
+				qhead[j] = qval.size() - 1;
+			else
+				qnext[qtail[j]] = qval.size() - 1;
+			qtail[j] = qval.size() - 1;
+			src.push_back(i);
+			dst.push_back(j);
+			stack.pop_back();
+			if(!stack.empty())
+			{
+				//Q[parent].pop_front()
+				int parent = stack.back();
+				qhead[parent] = qnext[qhead[parent]];
+				if(qhead[parent] == -1)
+					qtail[parent] = -1;
+			}
+		}
+	}
+
+	//Counting sort of the edges into CSR, keeping the insertion order
+	int E = src.size();
+	g.out_off.assign(m+1, 0);
+	g.in_off.assign(m+1, 0);
+	for(int e=0; e<E; e++)
+	{
+		g.out_off[src[e]+1]++;
+		g.in_off[dst[e]+1]++;
+	}
+	for(int i=0; i<m; i++)
+	{
+		g.out_off[i+1] += g.out_off[i];
+		g.in_off[i+1] += g.in_off[i];
+	}
+	g.out_adj.resize(E);
+	g.in_adj.resize(E);
+	g.in_eid.resize(E);
+	vector<int32_t> out_pos(g.out_off.begin(), g.out_off.end() - (m > 0)),
+					in_pos(g.in_off.begin(), g.in_off.end() - (m > 0));
+	for(int e=0; e<E; e++)
+	{
+		int eid = out_pos[src[e]]++;
+		int k = in_pos[dst[e]]++;
+		g.out_adj[eid] = dst[e];
+		g.in_adj[k] = src[e];
+		g.in_eid[k] = eid;
+	}
+}
+
+void compute_max_chain(const vector<Punto>& points, pivot_graph& g, bool mono)
+{
+	/*
+	 * MAX CHAIN of "Searching for empty convex polygons". Stores in
+	 * g.L, indexed by edge id, the length of the longest convex
+	 * chain starting with each edge. With mono only the chains with
+	 * the color of the pivot are considered (the other edges get 0).
+	 */
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	int color = points[g.pivot].color;
+	g.L.assign(g.num_edges(), 0);
+
+	for(int q=int(g.order.size())-1; q>=0; q--)
+	{
+		int a = g.out_off[q];
+		int l = g.out_off[q+1] - 1;
+		int max = 0;
+
+		for(int vi=g.in_off[q+1]-1; vi>=g.in_off[q]; vi--)
+		{
+			if(mono && (P(q).color != color || P(g.in_adj[vi]).color != color))
+				continue;
+			int32_t &Lin = g.L[g.in_eid[vi]];
+			Lin = max + 1;
+			while(l >= a && turn(P(g.in_adj[vi]), P(q), P(g.out_adj[l])) == LEFT)
+			{
+				if(g.L[l] > max)
+				{
+					max = g.L[l];
+					Lin = max + 1;
+				}
+				l--;
+			}
+		}
+	}
+}
+
+vector<pivot_graph> build_pivot_graphs(const vector<Punto>& points, bool max_chain)
+{
+	vector<pivot_graph> G(points.size());
+	for(unsigned int p=0; p<points.size(); p++)
+	{
+		build_pivot_graph(points, p, G[p]);
+		if(max_chain)
+			compute_max_chain(points, G[p]);
+	}
+	return G;
+}
+
 vector<pair<vector<int>, vector<int> > > visibility_graph_around_p(Punto p, const vector<Punto>& points, bool debug) {
 	/* Computes the visibility graph of the point set
 	 * polygon formed by the points ordered around p
@@ -159,10 +354,25 @@ vector<pair<vector<int>, vector<int> > > visibility_graph_around_p(Punto p, cons
 
 	sorted_points.insert(sorted_points.end(), l.begin(), l.end());
 
+	return visibility_graph_around_sorted(p, sorted_points, limit);
+}
 
+vector<pair<vector<int>, vector<int> > > visibility_graph_around_sorted(Punto p, vector<Punto>& sorted_points, int limit,
+																		 vector<int32_t>* idx)
+{
+	/* Same as visibility_graph_around_p, but the points must be
+	 * already sorted as sort_around_point does with join == false:
+	 * first the limit points to the right of p, then the ones to
+	 * its left. If p is a convex hull point, sorted_points (and
+	 * idx, if given) are rotated to start after the gap at p, as
+	 * sort_around_point does with join == true.
+	 */
 	vector<pair<vector<int>, vector<int> > > vis_graph(sorted_points.size());
 	std::deque<vector<int> > Q(sorted_points.size());
 
+	if (sorted_points.empty())
+		return vis_graph;
+
 	std::function<void(int,int,bool)> proceed=[&](int i, int j, bool first_pass){
 		int k=0;
 		while(k<(int)Q[i].size() && turn(sorted_points[Q[i][k]], sorted_points[i], sorted_points[j])<=0)
@@ -191,6 +401,8 @@ vector<pair<vector<int>, vector<int> > > visibility_graph_around_p(Punto p, cons
 			for (int j = 0; j < s; j++)
 				new_sorted_points[j] = sorted_points[(i + 1 + j)% s];
 			sorted_points = new_sorted_points;
+			if (idx != NULL)
+				std::rotate(idx->begin(), idx->begin() + (i + 1) % s, idx->end());
 			for (int j = 0; j < s - 1; j++)
 				proceed(j, j + 1, false);
 			return vis_graph;
@@ -298,15 +510,31 @@ int countEmptyTriangs(const vector<Punto>& points)
 vector<vector<Punto> > report_empty_triangles(const vector<Punto>& points)
 {
 	vector<vector<Punto> > triangles;
-	vector<puntos_ordenados> sorted_points;
-	orderandsplit(points, sorted_points);
-	auto G = compute_visibility_graph(sorted_points);
+	auto idx = report_empty_triangles_indices(points);
+	triangles.reserve(idx.size() / 3);
+	for(size_t i=0; i<idx.size(); i+=3)
+		triangles.emplace_back(vector<Punto>({points[idx[i]], points[idx[i+1]], points[idx[i+2]]}));
+	return triangles;
+}
+
+vector<int32_t> report_empty_triangles_indices(const vector<Punto>& points)
+{
+	/*
+	 * Same as report_empty_triangles, but each triangle is
+	 * stored as three consecutive indices into points.
+	 */
+	vector<int32_t> triangles;
+	pivot_graph g;
 	for(unsigned int p=0; p<points.size(); p++)
 	{
-		auto& right_points = sorted_points[p].r;
-		for(unsigned int q=0; q<right_points.size(); q++)
-			for(auto& r:G[p][q].first)
-				triangles.emplace_back(vector<Punto>({points[p], right_points[r], right_points[q]}));
+		build_pivot_graph(points, p, g);
+		for(unsigned int q=0; q<g.order.size(); q++)
+			for(int i=g.in_off[q]; i<g.in_off[q+1]; i++)
+			{
+				triangles.push_back(p);
+				triangles.push_back(g.order[g.in_adj[i]]);
+				triangles.push_back(g.order[q]);
+			}
 	}
 	return triangles;
 }
@@ -468,6 +696,69 @@ void report_empty_triangles_p(Punto p, const vector<Punto>& points, vector<vecto
 	}
 }
 
+void report_empty_triangles_p_indices(Punto p, const vector<Punto>& points, vector<int32_t>& A, vector<int32_t>& B)
+{
+	/*
+	 * Same as report_empty_triangles_p, but each triangle is stored
+	 * as three consecutive indices into points. The index points.size()
+	 * stands for p.
+	 */
+	auto G = visibility_graph_around_p(p, points);
+	vector<int> idx;
+	sort_around_point_indices(p, points, idx);
+	vector<Punto> sorted_points;
+	sorted_points.reserve(idx.size());
+	for(auto i : idx)
+		sorted_points.push_back(points[i]);
+
+	class triHash{
+    public:
+        size_t operator()(const trio triang) const{
+            return (size_t(triang.a) * 73856093) ^ (size_t(triang.b) * 19349663) ^ (size_t(triang.c) * 83492791);
+        }
+    };
+
+	std::unordered_set<trio, triHash> B_idx;
+	int32_t n = points.size();
+
+	for(unsigned int q = 0; q < sorted_points.size(); q++)
+	{
+		auto& incoming = G[q].first;
+		auto& outgoing = G[q].second;
+
+		for(auto r: incoming)
+		{
+			A.push_back(n);
+			A.push_back(idx[q]);
+			A.push_back(idx[r]);
+		}
+
+		unsigned int j = 0;
+		for(unsigned int i = 0; i < incoming.size(); i++)
+		{
+			while(j < outgoing.size() && turn(sorted_points[incoming[i]],
+			                                  sorted_points[q], sorted_points[outgoing[j]]) > 0)
+				j++;
+
+			for(unsigned int k = j; k < outgoing.size(); k++)
+			{
+				if(turn(p, sorted_points[incoming[i]], sorted_points[outgoing[k]]) >= 0 &&
+				   std::find(G[outgoing[k]].second.begin(), G[outgoing[k]].second.end(), incoming[i]) != G[outgoing[k]].second.end())
+				{
+					trio aux = {incoming[i], int(q), outgoing[k]};
+					sort_trio(aux);
+					if(B_idx.insert(aux).second)
+					{
+						B.push_back(idx[aux.a]);
+						B.push_back(idx[aux.b]);
+						B.push_back(idx[aux.c]);
+					}
+				}
+			}
+		}
+	}
+}
+
 int count_empty_triangles_for_each_p(vector<Punto> points)
 {
 	/*Sums the the number of empty triangles
@@ -485,337 +776,453 @@ int count_empty_triangles_for_each_p(vector<Punto> points)
  * rholes
  */
 
-int count_convex_rholes(const vector<Punto> &points, int r, bool mono)
+static void sort_by_L(const pivot_graph& g, int q, vector<int32_t>& by_W)
+{
+	//Positions of the edges leaving q, sorted by decreasing L
+	int a = g.out_off[q];
+	by_W.resize(g.out_off[q+1] - a);
+	for(unsigned int i=0; i<by_W.size(); i++)
+		by_W[i] = i;
+	std::stable_sort(by_W.begin(), by_W.end(), [&](int i, int j)->bool{
+		return g.L[a+i] > g.L[a+j];
+	});
+}
+
+long long count_convex_rholes_pivot(const vector<Punto>& points, const pivot_graph& g, int r, bool mono)
 {
 	/*
-	 * Counts the number of rholes in points, as described
-	 * in "Search for Empty Convex Polygons"
+	 * Counts the r-holes whose leftmost vertex is the pivot of g.
+	 * g.L must have been computed. Chains that reach the same edge
+	 * with the same length extend in the same way, so instead of
+	 * keeping them one by one we keep how many there are of each
+	 * length, in a flat table indexed by edge id.
 	 */
-	int total = 0;
-	vector<puntos_ordenados> sorted_points;
-	sorted_points.reserve(points.size());
-	orderandsplit(points, sorted_points);
-	auto G=compute_visibility_graph(sorted_points);
-	//vector<std::unordered_map<pair<int, int>, int, pairHash> > L_array;
-	typedef std::unordered_map<pair<int, int>, int, pairHash> mapa;
-	vector<mapa> L_array;
-	L_array.reserve(points.size());
+	if(r <= 3)
+		return 0;
 
-	//Start of MAX CHAIN
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	int K = r - 3;
+	int color = mono ? points[g.pivot].color : 0;
+	long long total = 0;
+	vector<long long> C(g.num_edges() * K, 0);
+	vector<int32_t> by_W;
 
-	for(unsigned int p=0, s=points.size(); p<s; p++)
+	for(int q=0, m=g.order.size(); q<m-1; q++)
 	{
-		vector<Punto> &right_points=sorted_points[p].r;
-		mapa L;
-//		int tam=0;
-//		for(auto &par : G[p])
-//			tam+=par.second.size();
-		L.reserve(G[p].size()*10);
-
-		for(int q=right_points.size()-1; q>=0; q--)
+		int a = g.out_off[q], deg = g.out_off[q+1] - a;
+		if(deg == 0)
+			continue;
+		sort_by_L(g, q, by_W);
+
+		for(int e=a; e<a+deg; e++)
+			if(g.L[e] >= r-2 &&
+				(!mono || (P(q).color == color && P(g.out_adj[e]).color == color)))
+				C[size_t(e)*K]++;
+
+		int m_out = 0;
+		for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
 		{
-			vector<int> &outgoing_vertices=G[p][q].second;
-			vector<int> &incoming_vertices=G[p][q].first;
-			int max=0;
-			int l=outgoing_vertices.size()-1;
+			while(m_out < deg && turn(P(g.in_adj[vi]), P(q), P(g.out_adj[a+m_out])) == RIGHT)
+			{
+				by_W.erase(std::find(by_W.begin(), by_W.end(), m_out));
+				m_out++;
+			}
 
-			for(int vi=incoming_vertices.size()-1; vi>=0; vi--)
+			long long *ch = &C[size_t(g.in_eid[vi])*K];
+			for(int l=1; l<=K; l++)
 			{
-				L[make_pair(incoming_vertices[vi], q)]=max+1;
-				while(l>=0 && turn(right_points[incoming_vertices[vi]],
-						right_points[q],
-						right_points[outgoing_vertices[l]])==-1)
+				if(ch[l-1] == 0)
+					continue;
+				for(unsigned int t=0; t<by_W.size() && g.L[a+by_W[t]] >= r-2-l; t++)
 				{
-					if(L[make_pair(q, outgoing_vertices[l])]>max)
-					{
-						max=L[make_pair(q, outgoing_vertices[l])];
-						L[make_pair(incoming_vertices[vi], q)]=max+1;
-					}
-					l--;
+					int e = a + by_W[t];
+					if(mono && P(g.out_adj[e]).color != color)
+						continue;
+					if(l == K)
+						total += ch[l-1];
+					else
+						C[size_t(e)*K+l] += ch[l-1];
 				}
 			}
 		}
-		L_array.push_back(std::move(L));
 	}
+	return total;
+}
+
+void report_convex_rholes_pivot(const vector<Punto>& points, const pivot_graph& g, int r, bool mono, vector<int32_t>& report)
+{
+	/*
+	 * Appends to report the r-holes whose leftmost vertex is the
+	 * pivot of g, as r consecutive indices into points. g.L must
+	 * have been computed. The chains share their tails: each one is
+	 * a node (vertex, next) in a pool, and the chains that end at an
+	 * edge are kept in a linked list of entries hanging from it.
+	 */
+	if(r <= 3)
+		return;
+
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	int color = mono ? points[g.pivot].color : 0;
+	size_t E = g.num_edges();
+	vector<int32_t> node_v, node_next;
+	vector<int32_t> ent_node, ent_len, ent_next;
+	vector<int32_t> head(E, -1), tail(E, -1);
+	vector<int32_t> by_W;
+
+	auto new_node = [&](int32_t v, int32_t next)->int32_t{
+		node_v.push_back(v);
+		node_next.push_back(next);
+		return node_v.size() - 1;
+	};
+	auto push_chain = [&](int e, int32_t node, int32_t len){
+		ent_node.push_back(node);
+		ent_len.push_back(len);
+		ent_next.push_back(-1);
+		int32_t k = ent_node.size() - 1;
+		if(tail[e] == -1)
+			head[e] = k;
+		else
+			ent_next[tail[e]] = k;
+		tail[e] = k;
+	};
 
-	//End of MAX_CHAIN
+	int32_t pivot_node = new_node(g.pivot, -1);
 
-	for(unsigned int p=0, ps=points.size(); p<ps; p++)
+	for(int q=0, m=g.order.size(); q<m-1; q++)
 	{
-		int color=0;
-		if(mono)
-			color=points[p].color;
-		vector<Punto> &right_points=sorted_points[p].r;
-		mapa &L=L_array[p];
-
-		//We create the sets holding the convex chains
+		int a = g.out_off[q], deg = g.out_off[q+1] - a;
+		if(deg == 0)
+			continue;
+		sort_by_L(g, q, by_W);
+
+		int32_t q_node = -1;
+		for(int e=a; e<a+deg; e++)
+			if(g.L[e] >= r-2 &&
+				(!mono || (P(q).color == color && P(g.out_adj[e]).color == color)))
+			{
+				if(q_node == -1)
+					q_node = new_node(g.order[q], pivot_node);
+				push_chain(e, new_node(g.order[g.out_adj[e]], q_node), 1);
+			}
 
-		std::unordered_map<pair<int, int>, vector<int>, pairHash> C;
-		for(unsigned int q=0, rs=right_points.size(); rs>0 && q<rs-1; q++)
+		int m_out = 0;
+		for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
 		{
-			vector<int> &outgoing_vertices=G[p][q].second;
-			vector<int> &incoming_vertices=G[p][q].first;
-			vector<int> idx;
-
-			for(unsigned int i=0; i<outgoing_vertices.size(); i++)
-				idx.push_back(i);
-
-			std::sort(idx.begin(), idx.end(), [&](int i, int j)->bool{
-				if(L[make_pair(q,outgoing_vertices[j])]-L[make_pair(q,outgoing_vertices[i])]<0)
-					return true;
-				else
-					return false;
-			});
-
-			vector<int> outgoing_by_W;
-
-			for(unsigned int i=0; i<idx.size(); i++)
-				outgoing_by_W.push_back(outgoing_vertices[idx[i]]);
-
-			for(auto vo : outgoing_vertices)
+			while(m_out < deg && turn(P(g.in_adj[vi]), P(q), P(g.out_adj[a+m_out])) == RIGHT)
 			{
-				if(L[make_pair(q, vo)]>=r-2)
-				{
-					if(mono)
-					{
-						if(right_points[q].color == color &&
-								right_points[vo].color==color)
-							C[make_pair(q, vo)].push_back(1);
-						else
-							C[make_pair(q, vo)]=vector<int>();
-					}
-					else
-						C[make_pair(q, vo)].push_back(1);
-				}
-				else
-					C[make_pair(q, vo)]=vector<int>();
+				by_W.erase(std::find(by_W.begin(), by_W.end(), m_out));
+				m_out++;
 			}
 
-			unsigned int m=0;
-			int mprime=outgoing_vertices.size();
-
-			for(auto vi : incoming_vertices)
+			for(int32_t k=head[g.in_eid[vi]]; k!=-1; k=ent_next[k])
 			{
-				while(m<outgoing_vertices.size() && turn(right_points[vi],
-						right_points[q], right_points[outgoing_vertices[m]])==1)
+				int l = ent_len[k];
+				for(unsigned int t=0; t<by_W.size() && g.L[a+by_W[t]] >= r-2-l; t++)
 				{
-					outgoing_by_W.erase(find(outgoing_by_W.begin(), outgoing_by_W.end(), outgoing_vertices[m]));
-					mprime--;
-					m++;
-				}
-
-				for(auto ch : C[make_pair(vi, q)])
-				{
-					int t=0;
-					int l=ch;
-					while(t<mprime && L[make_pair(q, outgoing_by_W[t])]>=r-2-l)
+					int e = a + by_W[t];
+					int32_t o = g.order[g.out_adj[e]];
+					if(mono && points[o].color != color)
+						continue;
+					if(l == r-3)
 					{
-						int chprime=ch+1;
-						if(l==r-3)
-						{
-							if(mono){
-								if(right_points[outgoing_by_W[t]].color==color)
-									total++;
-							}
-							else
-								total++;
-						}
-						else{
-							if(mono){
-								if(right_points[outgoing_by_W[t]].color==color)
-									C[make_pair(q, outgoing_by_W[t])].push_back(chprime);
-							}
-							else
-								C[make_pair(q,outgoing_by_W[t])].push_back(chprime);
-						}
-						t++;
+						report.push_back(o);
+						for(int32_t n=ent_node[k]; n!=-1; n=node_next[n])
+							report.push_back(node_v[n]);
 					}
+					else
+						push_chain(e, new_node(o, ent_node[k]), l+1);
 				}
 			}
 		}
 	}
+}
+
+template <typename F>
+static void for_each_pivot(const vector<Punto>& points, bool low_memory, F f)
+{
+	/*
+	 * Calls f on the visibility graph (with its MAX CHAIN table) of
+	 * every point. With low_memory only the graph of the current
+	 * pivot is kept; otherwise all of them are built first.
+	 */
+	if(low_memory)
+	{
+		pivot_graph g;
+		for(unsigned int p=0; p<points.size(); p++)
+		{
+			build_pivot_graph(points, p, g);
+			compute_max_chain(points, g);
+			f(g);
+		}
+	}
+	else
+		for(auto& g : build_pivot_graphs(points))
+			f(g);
+}
+
+long long count_convex_rholes(const vector<Punto> &points, int r, bool mono, bool low_memory)
+{
+	/*
+	 * Counts the number of rholes in points, as described
+	 * in "Search for Empty Convex Polygons"
+	 */
+	long long total = 0;
+	for_each_pivot(points, low_memory, [&](const pivot_graph& g){
+		total += count_convex_rholes_pivot(points, g, r, mono);
+	});
 	return total;
 }
 
-std::deque<vector<Punto> > report_convex_rholes(const vector<Punto>& points, int r, bool mono)
+std::deque<vector<Punto> > report_convex_rholes(const vector<Punto>& points, int r, bool mono, bool low_memory)
 {
 	/*
 	 * Reports the number of rholes in points, as described
 	 * in "Search for Empty Convex Polygons"
 	 */
 	std::deque<vector<Punto> > report;
-//	int total = 0;
-	vector<puntos_ordenados> sorted_points;
-	orderandsplit(points, sorted_points);
-	auto G = compute_visibility_graph(sorted_points);
-	vector<std::unordered_map<pair<int, int>, int, pairHash> > L_array;
-
-	//Start of MAX CHAIN
-
-	for (unsigned int p = 0, s = points.size(); p < s; p++)
+	vector<int32_t> idx;
+	for_each_pivot(points, low_memory, [&](const pivot_graph& g){
+		report_convex_rholes_pivot(points, g, r, mono, idx);
+	});
+	for(size_t i=0; r>0 && i<idx.size(); i+=r)
 	{
-		auto right_points = sorted_points[p].r;
-		std::unordered_map<pair<int, int>, int, pairHash> L;
-		vector<int> idx_list;
+		vector<Punto> hole;
+		for(int j=0; j<r; j++)
+			hole.push_back(points[idx[i+j]]);
+		report.push_front(std::move(hole));
+	}
+	return report;
+}
 
-		for (int i = right_points.size() - 1; i >= 0; i--)
-			idx_list.push_back(i);
+vector<int32_t> report_convex_rholes_indices(const vector<Punto>& points, int r, bool mono, bool low_memory)
+{
+	/*
+	 * Same as report_convex_rholes, but each r-hole is stored
+	 * as r consecutive indices into points, in the same order
+	 * in which report_convex_rholes reports its vertices.
+	 */
+	vector<int32_t> report;
+	for_each_pivot(points, low_memory, [&](const pivot_graph& g){
+		report_convex_rholes_pivot(points, g, r, mono, report);
+	});
+
+	//report_convex_rholes pushes the holes to the front of its deque
+	for (size_t i = 0, j = report.size() / r; r > 0 && i < j / 2; i++)
+		std::swap_ranges(report.begin() + i * r, report.begin() + (i + 1) * r,
+						 report.begin() + (j - 1 - i) * r);
+	return report;
+}
 
-		for (auto q : idx_list)
+long long empty_triangles_incidence_pivot(const vector<Punto>& points, const pivot_graph& g, vector<int64_t>& inc,
+										  bool mono)
+{
+	/*
+	 * Adds to inc[i] the number of empty triangles with leftmost
+	 * vertex the pivot of g that have points[i] as a vertex, and
+	 * returns how many there are. Every edge x -> q of g is the
+	 * empty triangle pivot, x, q. With mono only the triangles with
+	 * the color of the pivot are counted.
+	 */
+	int color = points[g.pivot].color;
+	long long total = 0;
+	for(unsigned int q=0; q<g.order.size(); q++)
+	{
+		if(mono && points[g.order[q]].color != color)
+			continue;
+		for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
 		{
-			auto outgoing_vertices = G[p][q].second;
-			auto incoming_vertices = G[p][q].first;
-			int max = 0;
-			int l = outgoing_vertices.size() - 1;
-			vector<int> idx_inc;
+			int x = g.order[g.in_adj[vi]];
+			if(mono && points[x].color != color)
+				continue;
+			inc[x]++;
+			inc[g.order[q]]++;
+			total++;
+		}
+	}
+	inc[g.pivot] += total;
+	return total;
+}
 
-			for (int i = incoming_vertices.size()-1; i >= 0; i--)
-				idx_inc.push_back(i);
+static void convex_chain_tables(const vector<Punto>& points, const pivot_graph& g, int r, bool mono,
+								vector<long long>& F, vector<long long>& G)
+{
+	/*
+	 * Each r-hole with leftmost vertex the pivot of g is a convex
+	 * chain of r-2 edges of g. With K = r-2, F[e*K+j] is the number
+	 * of chains that reach the edge e as their (j+1)-th edge and
+	 * G[e*K+t] the number of ways to go on from e with t more edges.
+	 * Both tables are filled with prefix (suffix) sums over the edges
+	 * leaving each vertex, since the ones that continue an incoming
+	 * edge convexly are always a suffix of them that shrinks as the
+	 * incoming edge turns. With mono the edges without the color of
+	 * the pivot are in no chain.
+	 */
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	int K = r - 2, m = g.order.size();
+	int color = points[g.pivot].color;
+	auto ok = [&](int q, int e)->bool {
+		return !mono || (P(q).color == color && P(g.out_adj[e]).color == color);
+	};
+	F.assign(g.num_edges() * K, 0);
+	G.assign(g.num_edges() * K, 0);
+	vector<long long> acc(K);
 
-			for (auto& vi : idx_inc)
+	vector<long long> D;
+	for(int q=0; q<m; q++)
+	{
+		int a = g.out_off[q], deg = g.out_off[q+1] - a;
+		if(deg == 0)
+			continue;
+		//D[k][j]: chains of j edges that may go on with the k-th edge leaving q and the following ones
+		D.assign(size_t(deg+1) * K, 0);
+		int m_out = 0;
+		for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
+		{
+			while(m_out < deg && turn(P(g.in_adj[vi]), P(q), P(g.out_adj[a+m_out])) == RIGHT)
+				m_out++;
+			const long long *fin = &F[size_t(g.in_eid[vi])*K];
+			for(int j=0; j<K-1; j++)
+				D[size_t(m_out)*K+j+1] += fin[j];
+		}
+		std::fill(acc.begin(), acc.end(), 0);
+		for(int k=0; k<deg; k++)
+		{
+			long long *f = &F[size_t(a+k)*K];
+			for(int j=1; j<K; j++)
 			{
-				L[make_pair(incoming_vertices[vi], q)] = max + 1;
-
-				while (l >= 0 && turn(right_points[incoming_vertices[vi]],
-								right_points[q],
-								right_points[outgoing_vertices[l]]) == -1)
-				{
-					if (L[make_pair(q, outgoing_vertices[l])] > max)
-					{
-						max = L[make_pair(q, outgoing_vertices[l])];
-						L[make_pair(incoming_vertices[vi], q)] = max + 1;
-					}
-					l--;
-				}
+				acc[j] += D[size_t(k)*K+j];
+				f[j] = ok(q, a+k) ? acc[j] : 0;
 			}
+			f[0] = ok(q, a+k);
 		}
-		L_array.push_back(L);
 	}
-	//END OF MAX_CHAIN
 
-	for (unsigned int p = 0, ps = points.size(); p < ps; p++)
+	for(int y=m-1; y>=0; y--)
 	{
-		int color = 0;
-
-		if (mono)
-			color = points[p].color;
-
-		vector<Punto> right_points = sorted_points[p].r;
-		std::unordered_map<pair<int, int>, int, pairHash> L = L_array[p];
-
-		//We create the sets holding the convex chains
-
-		std::unordered_map<pair<int, int>, vector<vector<Punto> >, pairHash> C;
+		int a = g.out_off[y], l = g.out_off[y+1] - 1;
+		std::fill(acc.begin(), acc.end(), 0);
+		for(int vi=g.in_off[y+1]-1; vi>=g.in_off[y]; vi--)
+		{
+			while(l >= a && turn(P(g.in_adj[vi]), P(y), P(g.out_adj[l])) == LEFT)
+			{
+				for(int t=0; t<K-1; t++)
+					acc[t+1] += G[size_t(l)*K+t];
+				l--;
+			}
+			int e = g.in_eid[vi];
+			if(!ok(g.in_adj[vi], e))
+				continue;
+			long long *h = &G[size_t(e)*K];
+			h[0] = 1;
+			for(int t=1; t<K; t++)
+				h[t] = acc[t];
+		}
+	}
+}
 
-		for (unsigned int q = 0, rs = right_points.size(); rs > 0 && q < rs - 1; q++)
+static long long chain_incidence(const pivot_graph& g, int r, const vector<long long>& F,
+								 const vector<long long>& G, vector<int64_t>& inc)
+{
+	//The incidences of the r-holes of g, from the tables of convex_chain_tables
+	int K = r - 2, m = g.order.size();
+	long long total = 0;
+	for(int q=0; q<m; q++)
+		for(int e=g.out_off[q]; e<g.out_off[q+1]; e++)
 		{
-			vector<int> outgoing_vertices = G[p][q].second;
-			vector<int> incoming_vertices = G[p][q].first;
-			vector<int> idx;
+			const long long *f = &F[size_t(e)*K], *h = &G[size_t(e)*K];
+			long long first = f[0]*h[K-1];
+			inc[g.order[q]] += first;
+			total += first;
+			for(int j=0; j<K; j++)
+				inc[g.order[g.out_adj[e]]] += f[j]*h[K-1-j];
+		}
+	inc[g.pivot] += total;
+	return total;
+}
 
-			for (unsigned int i = 0; i < outgoing_vertices.size(); i++)
-				idx.push_back(i);
+long long convex_rholes_incidence_pivot(const vector<Punto>& points, const pivot_graph& g, int r, bool mono,
+										vector<int64_t>& inc)
+{
+	/*
+	 * Adds to inc[i] the number of r-holes with leftmost vertex the
+	 * pivot of g that have points[i] as a vertex, and returns how
+	 * many there are. With the tables of convex_chain_tables, the
+	 * edge e is the (j+1)-th edge of F[e][j]*G[e][r-3-j] r-holes.
+	 */
+	if(r == 3)
+		return empty_triangles_incidence_pivot(points, g, inc, mono);
+	if(r < 3)
+		return 0;
+
+	vector<long long> F, G;
+	convex_chain_tables(points, g, r, mono, F, G);
+	return chain_incidence(g, r, F, G, inc);
+}
 
-			sort(idx.begin(), idx.end(),
-					[&](int i, int j)->bool
-					{
-						if(L[make_pair(q,outgoing_vertices[j])]-L[make_pair(q,outgoing_vertices[i])]<0)
-							return true;
-						else
-							return false;
-					});
+long long empty_triangles_incidence(const vector<Punto>& points, vector<int64_t>& inc)
+{
+	/*
+	 * Stores in inc[i] the number of empty triangles that have
+	 * points[i] as a vertex and returns the number of empty
+	 * triangles. Only the graph of the current pivot is kept.
+	 */
+	inc.assign(points.size(), 0);
+	long long total = 0;
+	pivot_graph g;
+	for(unsigned int p=0; p<points.size(); p++)
+	{
+		build_pivot_graph(points, p, g);
+		total += empty_triangles_incidence_pivot(points, g, inc);
+	}
+	return total;
+}
 
-			vector<int> outgoing_by_W;
-
-			for (auto i : idx)
-				outgoing_by_W.push_back(outgoing_vertices[i]);
-
-			for (auto vo : outgoing_vertices)
-			{
-				if (L[make_pair(q, vo)] >= r - 2)
-				{
-					if (mono)
-					{
-						if (right_points[q].color == color
-								&& right_points[vo].color == color)
-						{
-							vector<Punto> tmplist =
-									{ right_points[vo], right_points[q],
-											points[p] };
-
-							C[make_pair(q, vo)].push_back(tmplist);
-						}
-						else
-							C[make_pair(q, vo)] = vector<vector<Punto> >();
-					}
-					else
-					{
-						vector<Punto> tmplist =
-						{ right_points[vo], right_points[q], points[p] };
-
-						C[make_pair(q, vo)].push_back(tmplist);
-					}
-				}
-				else
-					C[make_pair(q, vo)] = vector<vector<Punto> >();
-			}
-
-			unsigned int m = 0;
-			int mprime = outgoing_vertices.size();
-
-			for (auto vi : incoming_vertices)
-			{
-				while (m < outgoing_vertices.size()
-						&& turn(right_points[vi], right_points[q],
-								right_points[outgoing_vertices[m]]) == 1)
-				{
-					outgoing_by_W.erase(
-							find(outgoing_by_W.begin(), outgoing_by_W.end(),
-									outgoing_vertices[m]));
-					mprime--;
-					m++;
-				}
+long long convex_rholes_incidence(const vector<Punto>& points, int r, vector<int64_t>& inc, bool mono)
+{
+	/*
+	 * Same as empty_triangles_incidence, for the r-holes
+	 * (monochromatic ones if mono is true). For r = 3 these are
+	 * the empty triangles.
+	 */
+	inc.assign(points.size(), 0);
+	long long total = 0;
+	pivot_graph g;
+	for(unsigned int p=0; p<points.size(); p++)
+	{
+		build_pivot_graph(points, p, g);
+		total += convex_rholes_incidence_pivot(points, g, r, mono, inc);
+	}
+	return total;
+}
 
-				for (auto& ch : C[make_pair(vi, q)])
-				{
-					int t = 0;
-					int l = ch.size() - 2;
-					while (t < mprime
-							&& L[make_pair(q, outgoing_by_W[t])]
-									>= r - 2 - l)
-					{
-						vector<Punto> chprime =
-						{ right_points[outgoing_by_W[t]] };
-						chprime.insert(chprime.end(), ch.begin(), ch.end());
-						if (l == r - 3)
-						{
-							if (mono){
-								if(right_points[outgoing_by_W[t]].color
-											== color)
-									report.push_front(chprime);
-							}
-							else
-								report.push_front(chprime);
-						}
-						else
-						{
-							if (mono){
-								if(right_points[outgoing_by_W[t]].color
-											== color)
-									C[make_pair(q, outgoing_by_W[t])].push_back(
-										chprime);
-							}
-							else
-								C[make_pair(q, outgoing_by_W[t])].push_back(
-										chprime);
-						}
-						t++;
-					}
-				}
-			}
+unsigned long long estimate_memory(const vector<Punto>& points, int r, bool low_memory)
+{
+	/*
+	 * Estimates the peak number of bytes used by count_convex_rholes
+	 * on points. The visibility graphs are built (one at a time) to
+	 * know their sizes, so this takes about as long as counting the
+	 * empty triangles of points.
+	 */
+	unsigned long long kept = 0, peak = 0;
+	pivot_graph g;
+	for(unsigned int p=0; p<points.size(); p++)
+	{
+		build_pivot_graph(points, p, g);
+		unsigned long long m = g.order.size(), E = g.num_edges();
+		unsigned long long graph = g.memory() + E * sizeof(int32_t); //plus L
+		//queues, edge list and stack of the builder
+		unsigned long long build = (4 * E + 3 * m) * sizeof(int32_t);
+		//chain counts per edge and length, and the sorted outgoing edges
+		unsigned long long count = E * (r > 3 ? r - 3 : 0) * sizeof(long long) + m * sizeof(int32_t);
+		if(low_memory)
+			peak = std::max(peak, graph + std::max(build, count));
+		else
+		{
+			kept += graph;
+			peak = std::max(peak, std::max(build, count));
 		}
 	}
-	return report;
+	return points.size() * sizeof(Punto) + kept + peak;
 }
 
 //void count_convex_rholes_p(Punto p, const std::vector<Punto>& points, int r, vector<vector<int> >& resA, vector<vector<int> >& resB, bool mono)
@@ -823,6 +1230,8 @@ void count_convex_rholes_p(Punto p, const std::vector<Punto>& points, int r, int
 {
 	resA=0;
 	resB=0;
+	if(points.empty())
+		return;
 	int rA=r, rB=r+1;
 	vector<Punto> rp, lp, sorted_points;
 	rp.reserve(points.size()/2);
@@ -837,11 +1246,16 @@ void count_convex_rholes_p(Punto p, const std::vector<Punto>& points, int r, int
 	sort_around_point(p, points, rp, lp, false);
 	sort_around_point(p, points, sorted_points);
 
+	std::unordered_map<Punto, int, pointHash> position;
+	position.reserve(sorted_points.size());
+	for(int i=0; i<(int)sorted_points.size(); i++)
+		position.emplace(sorted_points[i], i);
+
 	for(auto &Punto : rp)
-		ir.push_back(std::find(sorted_points.begin(), sorted_points.end(), Punto) - sorted_points.begin());
+		ir.push_back(position[Punto]);
 
 	for(auto &Punto : lp)
-		il.push_back(std::find(sorted_points.begin(), sorted_points.end(), Punto) - sorted_points.begin());
+		il.push_back(position[Punto]);
 
 	Punto q(p);
 	Punto qp(p);
@@ -1267,3 +1681,1007 @@ void count_convex_rholes_p(Punto p, const std::vector<Punto>& points, int r, int
 	}
 	//END REPORTING_2
 }
+
+void count_convex_rholes_p_many(const std::vector<Punto>& Q, const std::vector<Punto>& points, int r,
+								vector<int>& resA, vector<int>& resB, bool mono, int threads)
+{
+	/*
+	 * Calls count_convex_rholes_p for each point of Q against
+	 * points, spreading the points of Q among several threads.
+	 * If threads <= 0 one thread per core is used.
+	 */
+	resA.assign(Q.size(), 0);
+	resB.assign(Q.size(), 0);
+	parallel_for(Q.size(), threads, [&](size_t i){
+		count_convex_rholes_p(Q[i], points, r, resA[i], resB[i], mono);
+	});
+}
+
+void empty_triangles_edge_degrees(const vector<Punto>& points, vector<int32_t>& degs, int threads)
+{
+	/*
+	 * Stores in degs the n x n row-major matrix whose entry (i, j)
+	 * is the number of empty triangles that have points[i]points[j]
+	 * as an edge, taking them from the graphs of the pivots as
+	 * countEmptyTriangs does. The pivots are split into blocks, one
+	 * per thread (one per core if threads <= 0), each adding to its
+	 * own matrix.
+	 */
+	size_t n = points.size();
+	int blocks = num_threads(threads, n);
+	vector<vector<int32_t> > part(blocks);
+	parallel_for(blocks, blocks, [&](size_t b){
+		vector<int32_t> &D = part[b];
+		D.assign(n*n, 0);
+		pivot_graph g;
+		for(size_t p=b; p<n; p+=blocks)
+		{
+			build_pivot_graph(points, p, g);
+			for(unsigned int q=0; q<g.order.size(); q++)
+				for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
+				{
+					size_t x = g.order[g.in_adj[vi]], y = g.order[q];
+					D[p*n+x]++;
+					D[x*n+p]++;
+					D[p*n+y]++;
+					D[y*n+p]++;
+					D[x*n+y]++;
+					D[y*n+x]++;
+				}
+		}
+	});
+	degs = std::move(part[0]);
+	for(int b=1; b<blocks; b++)
+		for(size_t i=0; i<degs.size(); i++)
+			degs[i] += part[b][i];
+}
+
+void empty_triangles_edge_degrees_coo(const vector<Punto>& points, vector<int32_t>& rows, vector<int32_t>& cols,
+									  vector<int32_t>& vals, int threads)
+{
+	/*
+	 * Same as empty_triangles_edge_degrees, but only the edges i < j
+	 * in at least one empty triangle are stored, as (rows[k],
+	 * cols[k]) with degree vals[k], sorted by row and column.
+	 */
+	vector<int32_t> degs;
+	empty_triangles_edge_degrees(points, degs, threads);
+	size_t n = points.size();
+	rows.clear();
+	cols.clear();
+	vals.clear();
+	for(size_t i=0; i<n; i++)
+		for(size_t j=i+1; j<n; j++)
+			if(degs[i*n+j] > 0)
+			{
+				rows.push_back(i);
+				cols.push_back(j);
+				vals.push_back(degs[i*n+j]);
+			}
+}
+
+//-------------------------------------------------------------
+
+static void around_graph_csr(const vector<pair<vector<int>, vector<int> > >& G, pivot_graph& g)
+{
+	/*
+	 * Stores the graph returned by visibility_graph_around_sorted
+	 * in the CSR arrays of g.
+	 */
+	int m = G.size();
+	g.in_off.assign(m+1, 0);
+	g.out_off.assign(m+1, 0);
+	g.in_adj.clear();
+	g.out_adj.clear();
+	for(int i=0; i<m; i++)
+	{
+		g.in_adj.insert(g.in_adj.end(), G[i].first.begin(), G[i].first.end());
+		g.out_adj.insert(g.out_adj.end(), G[i].second.begin(), G[i].second.end());
+		g.in_off[i+1] = g.in_adj.size();
+		g.out_off[i+1] = g.out_adj.size();
+	}
+}
+
+void build_around_graph(const vector<Punto>& points, int p, const vector<int>& right, const vector<int>& left,
+						pivot_graph& g)
+{
+	/*
+	 * Builds in g the visibility graph around points[p] of the
+	 * other points (see visibility_graph_around_p). right and left
+	 * are the indices of the points to the right and to the left
+	 * of p, as computed by sort_right_indices. g.order holds the
+	 * indices in the order of the graph; in_eid is not used.
+	 */
+	g.pivot = p;
+	g.order.assign(right.begin(), right.end());
+	g.order.insert(g.order.end(), left.begin(), left.end());
+	vector<Punto> sorted_points;
+	sorted_points.reserve(g.order.size());
+	for(auto i : g.order)
+		sorted_points.push_back(points[i]);
+
+	around_graph_csr(visibility_graph_around_sorted(points[p], sorted_points, right.size(), &g.order), g);
+}
+
+void build_around_graph(const vector<Punto>& points, int p, pivot_graph& g)
+{
+	vector<int> right, left;
+	sort_right_indices(points, p, right, &left);
+	build_around_graph(points, p, right, left, g);
+}
+
+long long count_non_convex_four_holes_pivot(const vector<Punto>& points, const pivot_graph& g, bool mono)
+{
+	/*
+	 * Counts the non-convex 4-holes whose reflex vertex is the pivot
+	 * of the graph g around it. Such a 4-hole is an empty triangle
+	 * x, i, y of g that makes a right turn at i. The y's of the
+	 * edges leaving i that do so for a given incoming edge x form a
+	 * prefix of them, and that prefix grows with x, so they are
+	 * counted with a single pointer.
+	 */
+	long long total = 0;
+	int color = points[g.pivot].color;
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	for(int i=0, m=g.order.size(); i<m; i++)
+	{
+		if(mono && P(i).color != color)
+			continue;
+		int j = g.out_off[i], same = 0;
+		for(int x=g.in_off[i]; x<g.in_off[i+1]; x++)
+		{
+			while(j < g.out_off[i+1] && turn(P(g.in_adj[x]), P(i), P(g.out_adj[j])) > 0)
+			{
+				if(P(g.out_adj[j]).color == color)
+					same++;
+				j++;
+			}
+			if(!mono)
+				total += j - g.out_off[i];
+			else if(P(g.in_adj[x]).color == color)
+				total += same;
+		}
+	}
+	return total;
+}
+
+template <typename Pt, typename Accept>
+static long long count_triangles_containing(const Punto& p, const pivot_graph& g, Pt P, Accept accept)
+{
+	/*
+	 * Counts the triangles of the graph g around p that contain p,
+	 * that is, the empty triangles of the other points with p in
+	 * their interior, among those whose vertices q, x, y satisfy
+	 * accept(q, x, y). The edges leaving each vertex are copied and
+	 * sorted to test the closing edge y -> x by binary search. Each
+	 * triangle is found once from each of its vertices.
+	 */
+	vector<int32_t> out(g.out_adj);
+	int m = g.out_off.size() - 1;
+	for(int i=0; i<m; i++)
+		std::sort(out.begin() + g.out_off[i], out.begin() + g.out_off[i+1]);
+
+	long long B = 0;
+	for(int q=0; q<m; q++)
+	{
+		int j = g.out_off[q];
+		for(int i=g.in_off[q]; i<g.in_off[q+1]; i++)
+		{
+			int x = g.in_adj[i];
+			while(j < g.out_off[q+1] && turn(P(x), P(q), P(g.out_adj[j])) > 0)
+				j++;
+			for(int k=j; k<g.out_off[q+1]; k++)
+			{
+				int y = g.out_adj[k];
+				if(accept(q, x, y) && turn(p, P(x), P(y)) >= 0 &&
+				   std::binary_search(out.begin() + g.out_off[y], out.begin() + g.out_off[y+1], x))
+					B++;
+			}
+		}
+	}
+	return B / 3;
+}
+
+long long count_non_convex_four_islands_pivot(const vector<Punto>& points, const pivot_graph& g, bool mono)
+{
+	/*
+	 * Counts the non-convex 4-islands whose interior point is the
+	 * pivot of the graph g around it, i.e. the empty triangles of
+	 * the other points that contain it. With mono, all four points
+	 * must have the color of the pivot.
+	 */
+	int color = points[g.pivot].color;
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	return count_triangles_containing(points[g.pivot], g, P, [&](int q, int x, int y){
+		return !mono || (P(q).color == color && P(x).color == color && P(y).color == color);
+	});
+}
+
+template <typename F>
+static long long sum_around_pivots(const vector<Punto>& points, int threads, F f)
+{
+	/*
+	 * Returns the sum of f(g) over the graphs g around every point,
+	 * with the pivots split among threads (one per core if
+	 * threads <= 0). Each graph is dropped once f is done with it.
+	 */
+	vector<long long> res(points.size(), 0);
+	parallel_for(points.size(), threads, [&](size_t p){
+		pivot_graph g;
+		build_around_graph(points, p, g);
+		res[p] = f(g);
+	});
+	long long total = 0;
+	for(auto x : res)
+		total += x;
+	return total;
+}
+
+long long count_non_convex_four_holes(const vector<Punto>& points, bool mono, int threads)
+{
+	return sum_around_pivots(points, threads, [&](const pivot_graph& g){
+		return count_non_convex_four_holes_pivot(points, g, mono);
+	});
+}
+
+long long count_non_convex_four_islands(const vector<Punto>& points, bool mono, int threads)
+{
+	return sum_around_pivots(points, threads, [&](const pivot_graph& g){
+		return count_non_convex_four_islands_pivot(points, g, mono);
+	});
+}
+
+void count_emptymon_triangles_p(Punto p, const vector<Punto>& points, int& A, int& B)
+{
+	/*
+	 * Returns (A,B), where A is the number of monochromatic empty
+	 * triangles that contain p as a vertex and B the number of
+	 * monochromatic triangles that contain only p in their interior.
+	 */
+	A = 0;
+	B = 0;
+	if(points.empty())
+		return;
+
+	vector<Punto> sorted_points, l;
+	sort_around_point(p, points, sorted_points, l, false);
+	int limit = sorted_points.size();
+	sorted_points.insert(sorted_points.end(), l.begin(), l.end());
+
+	pivot_graph g;
+	around_graph_csr(visibility_graph_around_sorted(p, sorted_points, limit), g);
+	auto P = [&](int i)->const Punto& { return sorted_points[i]; };
+
+	for(int q=0, m=sorted_points.size(); q<m; q++)
+		if(P(q).color == p.color)
+			for(int i=g.in_off[q]; i<g.in_off[q+1]; i++)
+				if(P(g.in_adj[i]).color == p.color)
+					A++;
+
+	B = count_triangles_containing(p, g, P, [&](int q, int x, int y){
+		return P(x).color == P(q).color && P(y).color == P(q).color;
+	});
+}
+
+static vector<int> point_colors(const vector<Punto>& points)
+{
+	//The distinct colors of points, sorted
+	vector<int> colors;
+	for(auto &p : points)
+		colors.push_back(p.color);
+	std::sort(colors.begin(), colors.end());
+	colors.erase(std::unique(colors.begin(), colors.end()), colors.end());
+	return colors;
+}
+
+void count_mono_rholes_by_color(const vector<Punto>& points, int r, vector<int>& colors, vector<long long>& counts,
+								int threads)
+{
+	/*
+	 * Counts the monochromatic r-holes (empty triangles for r = 3)
+	 * of each color at once. A monochromatic r-hole has the color of
+	 * its leftmost vertex, so the count of every pivot graph goes to
+	 * the color of its pivot. colors are the distinct colors of
+	 * points, sorted, and counts[c] is the count of colors[c]. The
+	 * pivots are split among threads (one per core if threads <= 0).
+	 */
+	colors = point_colors(points);
+	counts.assign(colors.size(), 0);
+	if(r < 3)
+		return;
+
+	vector<long long> res(points.size(), 0);
+	parallel_for(points.size(), threads, [&](size_t p){
+		pivot_graph g;
+		build_pivot_graph(points, p, g);
+		int color = points[p].color;
+		if(r == 3)
+		{
+			for(unsigned int q=0; q<g.order.size(); q++)
+				if(points[g.order[q]].color == color)
+					for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
+						res[p] += points[g.order[g.in_adj[vi]]].color == color;
+		}
+		else
+		{
+			compute_max_chain(points, g);
+			res[p] = count_convex_rholes_pivot(points, g, r, true);
+		}
+	});
+	for(unsigned int p=0; p<points.size(); p++)
+		counts[std::lower_bound(colors.begin(), colors.end(), points[p].color) - colors.begin()] += res[p];
+}
+
+static void color_incidence_pivot(const vector<Punto>& points, const pivot_graph& g, int r, int color,
+								  int64_t* W, int stride)
+{
+	/*
+	 * Adds to W[i*stride] the number of r-holes with leftmost vertex
+	 * the pivot of g that have points[i] as a vertex and whose other
+	 * vertices all have the given color. This is the same computation
+	 * as convex_rholes_incidence_pivot, except that the color of the
+	 * vertex an edge arrives at (or, for the first edge, starts from)
+	 * is not checked: F[e][j] counts the chains up to e whose
+	 * vertices before the target of e have the color and G[e][t] the
+	 * continuations after it whose vertices have the color.
+	 */
+	auto C = [&](int i)->int64_t { return points[i].color == color; };
+	int64_t cp = C(g.pivot);
+	if(r == 3)
+	{
+		for(unsigned int q=0; q<g.order.size(); q++)
+			for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
+			{
+				int x = g.order[g.in_adj[vi]], y = g.order[q];
+				W[size_t(g.pivot)*stride] += C(x)*C(y);
+				W[size_t(x)*stride] += cp*C(y);
+				W[size_t(y)*stride] += cp*C(x);
+			}
+		return;
+	}
+	if(r < 3)
+		return;
+
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	auto CP = [&](int i)->int64_t { return C(g.order[i]); };
+	int K = r - 2, m = g.order.size();
+	vector<int64_t> F(g.num_edges() * K, 0), G(g.num_edges() * K, 0), acc(K), D;
+
+	for(int q=0; q<m; q++)
+	{
+		int a = g.out_off[q], deg = g.out_off[q+1] - a;
+		if(deg == 0)
+			continue;
+		D.assign(size_t(deg+1) * K, 0);
+		int m_out = 0;
+		for(int vi=g.in_off[q]; vi<g.in_off[q+1]; vi++)
+		{
+			while(m_out < deg && turn(P(g.in_adj[vi]), P(q), P(g.out_adj[a+m_out])) == RIGHT)
+				m_out++;
+			const int64_t *fin = &F[size_t(g.in_eid[vi])*K];
+			for(int j=0; j<K-1; j++)
+				D[size_t(m_out)*K+j+1] += fin[j];
+		}
+		std::fill(acc.begin(), acc.end(), 0);
+		for(int k=0; k<deg; k++)
+		{
+			int64_t *f = &F[size_t(a+k)*K];
+			for(int j=1; j<K; j++)
+			{
+				acc[j] += D[size_t(k)*K+j];
+				f[j] = CP(q)*acc[j];
+			}
+			f[0] = cp*CP(q);
+		}
+	}
+
+	for(int y=m-1; y>=0; y--)
+	{
+		int a = g.out_off[y], l = g.out_off[y+1] - 1;
+		std::fill(acc.begin(), acc.end(), 0);
+		for(int vi=g.in_off[y+1]-1; vi>=g.in_off[y]; vi--)
+		{
+			while(l >= a && turn(P(g.in_adj[vi]), P(y), P(g.out_adj[l])) == LEFT)
+			{
+				int64_t cz = CP(g.out_adj[l]);
+				for(int t=0; t<K-1; t++)
+					acc[t+1] += cz*G[size_t(l)*K+t];
+				l--;
+			}
+			int64_t *h = &G[size_t(g.in_eid[vi])*K];
+			h[0] = 1;
+			for(int t=1; t<K; t++)
+				h[t] = acc[t];
+		}
+	}
+
+	for(int q=0; q<m; q++)
+		for(int e=g.out_off[q]; e<g.out_off[q+1]; e++)
+		{
+			const int64_t *f = &F[size_t(e)*K], *h = &G[size_t(e)*K];
+			int y = g.out_adj[e];
+			W[size_t(g.order[q])*stride] += cp*CP(y)*h[K-1];
+			W[size_t(g.pivot)*stride] += CP(q)*CP(y)*h[K-1];
+			for(int j=0; j<K; j++)
+				W[size_t(g.order[y])*stride] += f[j]*h[K-1-j];
+		}
+}
+
+void color_incidence(const vector<Punto>& points, int r, vector<int>& colors, vector<int64_t>& M, int threads)
+{
+	/*
+	 * colors are the distinct colors of points, sorted, and M is an
+	 * n x colors.size() row-major matrix: M[i][c] is the number of
+	 * r-holes (empty triangles for r = 3) with points[i] as a vertex
+	 * whose other vertices all have color colors[c]. Recoloring
+	 * points[i] with colors[c] changes the number of monochromatic
+	 * r-holes by M[i][c] - M[i][its color]. The pivots are split
+	 * into blocks, one per thread (one per core if threads <= 0),
+	 * each with its own copy of M.
+	 */
+	colors = point_colors(points);
+	size_t n = points.size(), k = colors.size();
+	int blocks = num_threads(threads, n);
+	vector<vector<int64_t> > part(blocks);
+	parallel_for(blocks, blocks, [&](size_t b){
+		part[b].assign(n*k, 0);
+		pivot_graph g;
+		for(size_t p=b; p<n; p+=blocks)
+		{
+			build_pivot_graph(points, p, g);
+			for(size_t c=0; c<k; c++)
+				color_incidence_pivot(points, g, r, colors[c], &part[b][c], k);
+		}
+	});
+	M.assign(n*k, 0);
+	for(auto &W : part)
+		for(size_t i=0; i<W.size(); i++)
+			M[i] += W[i];
+}
+
+static bool find_convex_rhole_pivot(const vector<Punto>& points, const pivot_graph& g, int r, vector<int>& hole)
+{
+	/*
+	 * Looks for an r-hole whose leftmost vertex is the pivot of g,
+	 * using g.L: there is one if and only if some edge starts a
+	 * convex chain of r-2 edges, and the chain is rebuilt by always
+	 * going on with an edge whose chain is still long enough.
+	 */
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	int m = g.order.size();
+	for(int q=0; q<m; q++)
+		for(int e=g.out_off[q]; e<g.out_off[q+1]; e++)
+		{
+			if(g.L[e] < r-2)
+				continue;
+			hole.assign(1, g.pivot);
+			hole.push_back(g.order[q]);
+			int x = q, y = g.out_adj[e];
+			hole.push_back(g.order[y]);
+			for(int left=r-3; left>0; left--)
+			{
+				int next = -1;
+				for(int f=g.out_off[y]; f<g.out_off[y+1] && next == -1; f++)
+					if(g.L[f] >= left && turn(P(x), P(y), P(g.out_adj[f])) == LEFT)
+						next = g.out_adj[f];
+				x = y;
+				y = next;
+				hole.push_back(g.order[y]);
+			}
+			return true;
+		}
+	return false;
+}
+
+bool find_convex_rhole(const vector<Punto>& points, int r, vector<int>& hole, bool mono, int threads)
+{
+	/*
+	 * Looks for an r-hole (r >= 3; monochromatic if mono is true)
+	 * and stops as soon as one is found, storing the indices of its
+	 * vertices in hole. The pivots are tried from left to right,
+	 * since the leftmost points have the most points to their right
+	 * and so the most chances of being the leftmost vertex of an
+	 * r-hole. With several threads (one per core if threads <= 0)
+	 * the pivots after the first one known to work are skipped, and
+	 * the hole returned is still the one of the first such pivot.
+	 */
+	hole.clear();
+	if(r < 3)
+		return false;
+	vector<int> order(points.size());
+	for(unsigned int i=0; i<order.size(); i++)
+		order[i] = i;
+	std::stable_sort(order.begin(), order.end(), [&](int i, int j)->bool{
+		return points[i].x < points[j].x;
+	});
+
+	std::atomic<size_t> first(order.size());
+	vector<vector<int> > found(order.size());
+	parallel_for(order.size(), threads, [&](size_t i){
+		if(i > first)
+			return;
+		pivot_graph g;
+		build_pivot_graph(points, order[i], g);
+		compute_max_chain(points, g, mono);
+		if(!find_convex_rhole_pivot(points, g, r, found[i]))
+			return;
+		size_t cur = first;
+		while(i < cur && !first.compare_exchange_weak(cur, i));
+	});
+	if(first == order.size())
+		return false;
+	hole = found[first];
+	return true;
+}
+
+static int largest_convex_hole_pivot(const pivot_graph& g)
+{
+	//Size of the largest hole whose leftmost vertex is the pivot of g, 0 if there is none
+	int max = 0;
+	for(auto l : g.L)
+		max = std::max(max, l);
+	return max > 0 ? max + 2 : 0;
+}
+
+int largest_convex_hole(const vector<Punto>& points, vector<int>& hole, bool mono, int threads)
+{
+	/*
+	 * Returns the size of the largest empty convex polygon
+	 * (monochromatic if mono is true) and stores the indices of its
+	 * vertices in hole. The largest one with each pivot as its
+	 * leftmost vertex is read off g.L, so the whole search costs the
+	 * same as a single count_convex_rholes; only the graph of the
+	 * best pivot is built again to recover the vertices. The pivots
+	 * are split among threads (one per core if threads <= 0).
+	 */
+	hole.clear();
+	vector<int> sizes(points.size(), 0);
+	parallel_for(points.size(), threads, [&](size_t p){
+		pivot_graph g;
+		build_pivot_graph(points, p, g);
+		compute_max_chain(points, g, mono);
+		sizes[p] = largest_convex_hole_pivot(g);
+	});
+	if(sizes.empty())
+		return 0;
+
+	int p = std::max_element(sizes.begin(), sizes.end()) - sizes.begin();
+	if(sizes[p] == 0)
+		return 0;
+	pivot_graph g;
+	build_pivot_graph(points, p, g);
+	compute_max_chain(points, g, mono);
+	find_convex_rhole_pivot(points, g, sizes[p], hole);
+	return sizes[p];
+}
+
+static void points_below(const vector<Punto>& points, vector<int>& rank, vector<int32_t>& U, int threads)
+{
+	/*
+	 * rank[i] is the position of points[i] in lexicographic order.
+	 * For rank[i] < rank[j], U[rank[i]*n+rank[j]] is the number of
+	 * points between them in that order that lie to the right of
+	 * points[i]points[j]. Those to the right of points[i] come
+	 * sorted around it, so each row is a sweep with a Fenwick tree
+	 * over the ranks: O(n^2 log n) time in all.
+	 */
+	int n = points.size();
+	vector<int> order(n);
+	for(int i=0; i<n; i++)
+		order[i] = i;
+	std::sort(order.begin(), order.end(), [&](int i, int j)->bool{
+		return points[i].x < points[j].x || (points[i].x == points[j].x && (points[i].y < points[j].y || (points[i].y == points[j].y && i < j)));
+	});
+	rank.resize(n);
+	for(int i=0; i<n; i++)
+		rank[order[i]] = i;
+
+	U.assign(size_t(n)*n, 0);
+	parallel_for(n, threads, [&](size_t i){
+		vector<int> right, fenwick(n+1, 0);
+		sort_right_indices(points, i, right);
+		for(int j : right)
+		{
+			int below = 0;
+			for(int k=rank[j]; k>0; k-=k&-k)
+				below += fenwick[k];
+			U[size_t(rank[i])*n+rank[j]] = below;
+			for(int k=rank[j]+1; k<=n; k+=k&-k)
+				fenwick[k]++;
+		}
+	});
+}
+
+static int points_in_triangle(const vector<Punto>& points, const vector<int>& rank, const vector<int32_t>& U,
+							  int a, int b, int c)
+{
+	//The number of points inside the triangle a, b, c, from the table of points_below
+	size_t n = points.size();
+	if(rank[a] > rank[b])
+		std::swap(a, b);
+	if(rank[b] > rank[c])
+		std::swap(b, c);
+	if(rank[a] > rank[b])
+		std::swap(a, b);
+	int ab = U[rank[a]*n+rank[b]], bc = U[rank[b]*n+rank[c]], ac = U[rank[a]*n+rank[c]];
+	if(turn(points[a], points[c], points[b]) == RIGHT)
+		return ac - ab - bc - 1;
+	return ab + bc - ac;
+}
+
+static void one_point_rgons_pivot(const vector<Punto>& points, const pivot_graph& g, int r, bool mono,
+								  const vector<long long>& F, const vector<long long>& G,
+								  const vector<int>& rank, const vector<int32_t>& U, vector<int64_t>& B)
+{
+	/*
+	 * Adds to B[x] the number of convex r-gons with leftmost vertex
+	 * the pivot of g (monochromatic ones if mono is true) that have
+	 * only points[x] inside. Such an r-gon is a convex chain of g
+	 * with one step a -> b more whose triangle with the pivot holds
+	 * x alone. Then the triangles pivot, a, x and pivot, x, b are
+	 * empty, so a -> x and x -> b are edges of g, x lies on the
+	 * side of ab of the pivot and the triangle a, x, b is empty.
+	 * The chains before a and after b are counted with the tables
+	 * of convex_chain_tables (not used for r = 3).
+	 */
+	auto P = [&](int i)->const Punto& { return points[g.order[i]]; };
+	const Punto &pivot = points[g.pivot];
+	int K = r - 2, color = pivot.color;
+	vector<long long> before(K), after(K);
+
+	for(int x=0, m=g.order.size(); x<m; x++)
+		for(int vi=g.in_off[x]; vi<g.in_off[x+1]; vi++)
+		{
+			int a = g.in_adj[vi];
+			if(mono && P(a).color != color)
+				continue;
+			for(int e=g.out_off[x]; e<g.out_off[x+1]; e++)
+			{
+				int b = g.out_adj[e];
+				if((mono && P(b).color != color) ||
+					turn(P(a), P(b), P(x)) != turn(P(a), P(b), pivot) ||
+					points_in_triangle(points, rank, U, g.order[a], g.order[x], g.order[b]) != 0)
+					continue;
+
+				//before[j] chains of j edges end at a, after[t] chains of t edges start at b
+				std::fill(before.begin(), before.end(), 0);
+				std::fill(after.begin(), after.end(), 0);
+				before[0] = after[0] = 1;
+				for(int vj=g.in_off[a]; K>1 && vj<g.in_off[a+1]; vj++)
+					if(turn(P(g.in_adj[vj]), P(a), P(b)) == LEFT)
+						for(int j=1; j<K; j++)
+							before[j] += F[size_t(g.in_eid[vj])*K+j-1];
+				for(int f=g.out_off[b]; K>1 && f<g.out_off[b+1]; f++)
+					if(turn(P(a), P(b), P(g.out_adj[f])) == LEFT)
+						for(int t=1; t<K; t++)
+							after[t] += G[size_t(f)*K+t-1];
+				for(int j=0; j<K; j++)
+					B[g.order[x]] += before[j]*after[K-1-j];
+			}
+		}
+}
+
+void rholes_remove_point(const vector<Punto>& points, int r, vector<int64_t>& res, bool mono, int threads)
+{
+	/*
+	 * Stores in res[i] the number of r-holes (monochromatic ones if
+	 * mono is true, empty triangles for r = 3) of points without
+	 * points[i]. These are the r-holes of points that do not have
+	 * points[i] as a vertex, as in convex_rholes_incidence, plus the
+	 * convex r-gons with only points[i] inside, which
+	 * one_point_rgons_pivot finds in the same graphs. All of it is
+	 * a single enumeration of the pivots, split into blocks, one
+	 * per thread (one per core if threads <= 0), each adding to its
+	 * own arrays.
+	 */
+	size_t n = points.size();
+	res.assign(n, 0);
+	if(r < 3)
+		return;
+
+	vector<int> rank;
+	vector<int32_t> U;
+	points_below(points, rank, U, threads);
+
+	int blocks = num_threads(threads, n);
+	vector<vector<int64_t> > inc(blocks), B(blocks);
+	vector<long long> total(blocks, 0);
+	parallel_for(blocks, blocks, [&](size_t b){
+		inc[b].assign(n, 0);
+		B[b].assign(n, 0);
+		pivot_graph g;
+		vector<long long> F, G;
+		for(size_t p=b; p<n; p+=blocks)
+		{
+			build_pivot_graph(points, p, g);
+			if(r == 3)
+				total[b] += empty_triangles_incidence_pivot(points, g, inc[b], mono);
+			else
+			{
+				convex_chain_tables(points, g, r, mono, F, G);
+				total[b] += chain_incidence(g, r, F, G, inc[b]);
+			}
+			one_point_rgons_pivot(points, g, r, mono, F, G, rank, U, B[b]);
+		}
+	});
+
+	long long holes = 0;
+	for(int b=0; b<blocks; b++)
+		holes += total[b];
+	for(size_t i=0; i<n; i++)
+	{
+		res[i] = holes;
+		for(int b=0; b<blocks; b++)
+			res[i] += B[b][i] - inc[b][i];
+	}
+}
+
+//-------------------------------------------------------------
+
+HoleIndex::HoleIndex(const vector<Punto>& points) : pts(points), has_left(false), has_max_chain(false)
+{}
+
+const vector<Punto>& HoleIndex::points() const
+{
+	return pts;
+}
+
+void HoleIndex::compute_orders(bool with_left)
+{
+	if(right.size() == pts.size() && (has_left || !with_left))
+		return;
+	right.resize(pts.size());
+	left.resize(pts.size());
+	for(unsigned int p=0; p<pts.size(); p++)
+		sort_right_indices(pts, p, right[p], with_left ? &left[p] : NULL);
+	has_left = with_left;
+}
+
+void HoleIndex::compute_pivot_graphs(bool max_chain)
+{
+	if(pivots.size() != pts.size())
+	{
+		compute_orders(false);
+		pivots.resize(pts.size());
+		for(unsigned int p=0; p<pts.size(); p++)
+			build_pivot_graph(pts, p, right[p], pivots[p]);
+	}
+	if(max_chain && !has_max_chain)
+	{
+		for(auto &g : pivots)
+			compute_max_chain(pts, g);
+		has_max_chain = true;
+	}
+}
+
+void HoleIndex::compute_around_graphs(int threads)
+{
+	if(around.size() == pts.size())
+		return;
+	compute_orders(true);
+	around.resize(pts.size());
+	parallel_for(pts.size(), threads, [&](size_t p){
+		build_around_graph(pts, p, right[p], left[p], around[p]);
+	});
+}
+
+long long HoleIndex::count_convex_rholes(int r, bool mono)
+{
+	compute_pivot_graphs(true);
+	long long total = 0;
+	for(auto &g : pivots)
+		total += count_convex_rholes_pivot(pts, g, r, mono);
+	return total;
+}
+
+vector<int32_t> HoleIndex::report_convex_rholes(int r, bool mono)
+{
+	/*
+	 * Same as report_convex_rholes_indices.
+	 */
+	compute_pivot_graphs(true);
+	vector<int32_t> report;
+	for(auto &g : pivots)
+		report_convex_rholes_pivot(pts, g, r, mono, report);
+	for (size_t i = 0, j = report.size() / r; r > 0 && i < j / 2; i++)
+		std::swap_ranges(report.begin() + i * r, report.begin() + (i + 1) * r,
+						 report.begin() + (j - 1 - i) * r);
+	return report;
+}
+
+template <typename F>
+long long HoleIndex::sum_around(int threads, F f)
+{
+	compute_around_graphs(threads);
+	vector<long long> res(pts.size(), 0);
+	parallel_for(pts.size(), threads, [&](size_t p){
+		res[p] = f(around[p]);
+	});
+	long long total = 0;
+	for(auto x : res)
+		total += x;
+	return total;
+}
+
+long long HoleIndex::count_non_convex_four_holes(bool mono, int threads)
+{
+	return sum_around(threads, [&](const pivot_graph& g){
+		return count_non_convex_four_holes_pivot(pts, g, mono);
+	});
+}
+
+long long HoleIndex::count_non_convex_four_islands(bool mono, int threads)
+{
+	return sum_around(threads, [&](const pivot_graph& g){
+		return count_non_convex_four_islands_pivot(pts, g, mono);
+	});
+}
+
+long long HoleIndex::count_empty_triangles()
+{
+	compute_pivot_graphs(false);
+	long long total = 0;
+	for(auto &g : pivots)
+		total += g.num_edges();
+	return total;
+}
+
+vector<int32_t> HoleIndex::report_empty_triangles()
+{
+	/*
+	 * Same as report_empty_triangles_indices.
+	 */
+	compute_pivot_graphs(false);
+	vector<int32_t> triangles;
+	for(auto &g : pivots)
+		for(unsigned int q=0; q<g.order.size(); q++)
+			for(int i=g.in_off[q]; i<g.in_off[q+1]; i++)
+			{
+				triangles.push_back(g.pivot);
+				triangles.push_back(g.order[g.in_adj[i]]);
+				triangles.push_back(g.order[q]);
+			}
+	return triangles;
+}
+
+long long HoleIndex::empty_triangles_incidence(vector<int64_t>& inc)
+{
+	compute_pivot_graphs(false);
+	inc.assign(pts.size(), 0);
+	long long total = 0;
+	for(auto &g : pivots)
+		total += empty_triangles_incidence_pivot(pts, g, inc);
+	return total;
+}
+
+int HoleIndex::largest_convex_hole(vector<int>& hole)
+{
+	//Same as the free largest_convex_hole (with mono false), reusing the max chains of count_convex_rholes
+	compute_pivot_graphs(true);
+	hole.clear();
+	int best = 0, p = -1;
+	for(unsigned int i=0; i<pivots.size(); i++)
+	{
+		int size = largest_convex_hole_pivot(pivots[i]);
+		if(size > best)
+		{
+			best = size;
+			p = i;
+		}
+	}
+	if(p >= 0)
+		find_convex_rhole_pivot(pts, pivots[p], best, hole);
+	return best;
+}
+
+long long HoleIndex::convex_rholes_incidence(int r, vector<int64_t>& inc, bool mono)
+{
+	compute_pivot_graphs(false);
+	inc.assign(pts.size(), 0);
+	long long total = 0;
+	for(auto &g : pivots)
+		total += convex_rholes_incidence_pivot(pts, g, r, mono, inc);
+	return total;
+}
+
+size_t HoleIndex::memory() const
+{
+	/*
+	 * Bytes used by the orders and graphs computed so far.
+	 */
+	size_t total = pts.size() * sizeof(Punto);
+	for(unsigned int p=0; p<right.size(); p++)
+		total += (right[p].size() + left[p].size()) * sizeof(int);
+	for(auto &g : pivots)
+		total += g.memory();
+	for(auto &g : around)
+		total += g.memory();
+	return total;
+}
+
+//-------------------------------------------------------------
+
+HoleCounter::HoleCounter(const vector<Punto>& points, int r, bool mono) :
+		pts(points), r(r), mono(mono), pending_i(-1), pending_delta(0)
+{
+	//count_convex_rholes does not count the empty triangles
+	if(r == 3 && mono)
+	{
+		vector<int> colors;
+		vector<long long> counts;
+		count_mono_rholes_by_color(pts, 3, colors, counts);
+		total = 0;
+		for(long long c : counts)
+			total += c;
+	}
+	else if(r == 3)
+		total = countEmptyTriangs(pts);
+	else
+		total = count_convex_rholes(pts, r, mono);
+}
+
+const vector<Punto>& HoleCounter::points() const
+{
+	return pts;
+}
+
+long long HoleCounter::count() const
+{
+	return total;
+}
+
+bool HoleCounter::pending() const
+{
+	return pending_i != -1;
+}
+
+void HoleCounter::count_p(Punto p, const vector<Punto>& others, int& A, int& B) const
+{
+	if(r == 3 && mono)
+		count_emptymon_triangles_p(p, others, A, B);
+	else if(r == 3)
+		count_empty_triangles_p(p, others, A, B);
+	else
+		count_convex_rholes_p(p, others, r, A, B, mono);
+}
+
+long long HoleCounter::propose(int i, Punto q)
+{
+	/*
+	 * Returns the change in the number of r-holes if pts[i] is
+	 * moved to q (which keeps the color of pts[i]). The r-holes
+	 * that do not use pts[i] do not change, so the difference
+	 * is (A_q - A_p) - (B_q - B_p), as in
+	 * holes.count_convex_rholes_difference. Both positions are
+	 * evaluated at the same time in two threads.
+	 */
+	vector<Punto> others(pts);
+	others.erase(others.begin() + i);
+	q.color = pts[i].color;
+	q._has_color = pts[i]._has_color;
+
+	int Ap, Bp, Aq, Bq;
+	std::thread old_position([&](){ count_p(pts[i], others, Ap, Bp); });
+	count_p(q, others, Aq, Bq);
+	old_position.join();
+
+	pending_i = i;
+	pending_q = q;
+	pending_delta = (long long)Aq - Ap + Bp - Bq;
+	return pending_delta;
+}
+
+bool HoleCounter::commit()
+{
+	if(pending_i == -1)
+		return false;
+	pts[pending_i] = pending_q;
+	total += pending_delta;
+	pending_i = -1;
+	return true;
+}
+
+void HoleCounter::rollback()
+{
+	pending_i = -1;
+}
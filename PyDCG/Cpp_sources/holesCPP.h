@@ -26,15 +26,50 @@
 #include <list>
 #include <unordered_set>
 #include <functional>
+#include <deque>
 
 //-------------------------------------------------------------
 
 void sort_around_point(Punto, const std::vector<Punto>&, std::vector<Punto> &, std::vector<Punto> &, bool);
 
+void sort_around_point_indices(Punto, const std::vector<Punto>&, std::vector<int>&);
+
 std::vector<std::vector<std::pair<std::vector<int>, std::vector<int> > > > compute_visibility_graph(const std::vector<puntos_ordenados>&);
 
+/*
+ * Visibility graph of the points to the right of a pivot, stored in
+ * CSR form. The vertices are the positions 0..m-1 of those points in
+ * order (ccw around the pivot). The edges leaving q are
+ * out_adj[out_off[q]..out_off[q+1]) and the position of an edge in
+ * out_adj is its edge id. The edges entering q are
+ * in_adj[in_off[q]..in_off[q+1]), and in_eid gives their edge ids.
+ * L[e] is the length of the longest convex chain that starts with
+ * edge e (the MAX CHAIN table), or empty if it was not computed.
+ */
+struct pivot_graph
+{
+	int pivot;
+	std::vector<int32_t> order;
+	std::vector<int32_t> in_off, in_adj, in_eid;
+	std::vector<int32_t> out_off, out_adj;
+	std::vector<int32_t> L;
+	pivot_graph();
+	size_t num_edges() const;
+	size_t memory() const;
+};
+
+void build_pivot_graph(const std::vector<Punto>&, int, pivot_graph&);
+
+void build_pivot_graph(const std::vector<Punto>&, int, const std::vector<int>&, pivot_graph&);
+
+void compute_max_chain(const std::vector<Punto>&, pivot_graph&, bool=false);
+
+std::vector<pivot_graph> build_pivot_graphs(const std::vector<Punto>&, bool=true);
+
 std::vector<std::pair<std::vector<int>, std::vector<int> > > visibility_graph_around_p(Punto, const std::vector<Punto>&, bool debug=false);
 
+std::vector<std::pair<std::vector<int>, std::vector<int> > > visibility_graph_around_sorted(Punto, std::vector<Punto>&, int, std::vector<int32_t>* idx=NULL);
+
 int slow_generalposition(std::vector<Punto>&);
 
 //-------------------------------------------------------------
@@ -47,7 +82,13 @@ public:
 //
 //    	return ((k.first+k.second)*(k.first+k.second+1)+k.second)/2;
 
-    	return (k.first << 16) ^ k.second;
+    	//(first << 16) ^ second collides as soon as the indices need more
+    	//than 16 bits, so the pair is packed into 64 bits and mixed.
+    	uint64_t h = (uint64_t(uint32_t(k.first)) << 32) | uint32_t(k.second);
+    	h ^= h >> 33;
+    	h *= 0xff51afd7ed558ccdULL;
+    	h ^= h >> 33;
+    	return size_t(h);
     }
 };
 
@@ -70,6 +111,8 @@ int countEmptyTriangs(const std::vector<Punto>&);
 
 std::vector<std::vector<Punto> > report_empty_triangles(const std::vector<Punto>&);
 
+std::vector<int32_t> report_empty_triangles_indices(const std::vector<Punto>&);
+
 int slow_count_empty_triangles_containing_p(Punto p, const std::vector<Punto>&);
 
 int count_empty_triangles_around_p(Punto, const std::vector<Punto>&);
@@ -84,6 +127,7 @@ public:
 
 std::pair<std::list<triangulo>, std::unordered_set<triangulo, triangHash> > WHYreport_empty_triangles_p(Punto, const vector<Punto>&);
 void report_empty_triangles_p(Punto, const vector<Punto>&, vector<vector<Punto> >&, vector<vector<Punto> >&);
+void report_empty_triangles_p_indices(Punto, const vector<Punto>&, vector<int32_t>&, vector<int32_t>&);
 
 void slow_count_empty_triangles_p(Punto, const std::vector<Punto>&, int&, int&);
 
@@ -93,10 +137,125 @@ int count_empty_triangles_for_each_p(std::vector<Punto>);
 
 //-------------------------------------------------------------
 
-int count_convex_rholes(const std::vector<Punto>&, int, bool=false);
+long long count_convex_rholes_pivot(const std::vector<Punto>&, const pivot_graph&, int, bool=false);
+
+void report_convex_rholes_pivot(const std::vector<Punto>&, const pivot_graph&, int, bool, std::vector<int32_t>&);
 
-std::deque<std::vector<Punto> > report_convex_rholes(const std::vector<Punto>&, int, bool=false);
+long long count_convex_rholes(const std::vector<Punto>&, int, bool=false, bool=false);
+
+std::deque<std::vector<Punto> > report_convex_rholes(const std::vector<Punto>&, int, bool=false, bool=false);
+
+std::vector<int32_t> report_convex_rholes_indices(const std::vector<Punto>&, int, bool=false, bool=false);
+
+long long empty_triangles_incidence_pivot(const std::vector<Punto>&, const pivot_graph&, std::vector<int64_t>&, bool=false);
+
+long long convex_rholes_incidence_pivot(const std::vector<Punto>&, const pivot_graph&, int, bool, std::vector<int64_t>&);
+
+long long empty_triangles_incidence(const std::vector<Punto>&, std::vector<int64_t>&);
+
+long long convex_rholes_incidence(const std::vector<Punto>&, int, std::vector<int64_t>&, bool=false);
+
+unsigned long long estimate_memory(const std::vector<Punto>&, int, bool=false);
 
 void count_convex_rholes_p(Punto, const std::vector<Punto>&, int, int&, int&, bool=false);
 
+void count_convex_rholes_p_many(const std::vector<Punto>&, const std::vector<Punto>&, int,
+								std::vector<int>&, std::vector<int>&, bool=false, int=0);
+
+void empty_triangles_edge_degrees(const std::vector<Punto>&, std::vector<int32_t>&, int=0);
+
+void empty_triangles_edge_degrees_coo(const std::vector<Punto>&, std::vector<int32_t>&, std::vector<int32_t>&,
+									  std::vector<int32_t>&, int=0);
+
+void build_around_graph(const std::vector<Punto>&, int, const std::vector<int>&, const std::vector<int>&, pivot_graph&);
+
+void build_around_graph(const std::vector<Punto>&, int, pivot_graph&);
+
+long long count_non_convex_four_holes_pivot(const std::vector<Punto>&, const pivot_graph&, bool=false);
+
+long long count_non_convex_four_islands_pivot(const std::vector<Punto>&, const pivot_graph&, bool=false);
+
+long long count_non_convex_four_holes(const std::vector<Punto>&, bool=false, int=0);
+
+long long count_non_convex_four_islands(const std::vector<Punto>&, bool=false, int=0);
+
+void count_emptymon_triangles_p(Punto, const std::vector<Punto>&, int&, int&);
+
+bool find_convex_rhole(const std::vector<Punto>&, int, std::vector<int>&, bool=false, int=0);
+
+int largest_convex_hole(const std::vector<Punto>&, std::vector<int>&, bool=false, int=0);
+
+void rholes_remove_point(const std::vector<Punto>&, int, std::vector<int64_t>&, bool=false, int=0);
+
+void count_mono_rholes_by_color(const std::vector<Punto>&, int, std::vector<int>&, std::vector<long long>&, int=0);
+
+void color_incidence(const std::vector<Punto>&, int, std::vector<int>&, std::vector<int64_t>&, int=0);
+
+/*
+ * Owns the sorted orders and visibility graphs of a fixed point set
+ * and answers several counting and reporting queries on it. Every
+ * piece is computed the first time a query needs it and reused
+ * afterwards. It is not safe to query the same index from several
+ * threads at once.
+ */
+class HoleIndex
+{
+public:
+	HoleIndex(const std::vector<Punto>&);
+	const std::vector<Punto>& points() const;
+	long long count_convex_rholes(int, bool=false);
+	std::vector<int32_t> report_convex_rholes(int, bool=false);
+	long long count_non_convex_four_holes(bool=false, int=0);
+	long long count_non_convex_four_islands(bool=false, int=0);
+	long long count_empty_triangles();
+	std::vector<int32_t> report_empty_triangles();
+	long long empty_triangles_incidence(std::vector<int64_t>&);
+	long long convex_rholes_incidence(int, std::vector<int64_t>&, bool=false);
+	int largest_convex_hole(std::vector<int>&);
+	size_t memory() const;
+private:
+	std::vector<Punto> pts;
+	bool has_left, has_max_chain;
+	//Indices of the points to the right and to the left of each point
+	std::vector<std::vector<int> > right, left;
+	//Visibility graphs of the points to the right of each point
+	std::vector<pivot_graph> pivots;
+	//Visibility graphs around each point (in_eid is not used)
+	std::vector<pivot_graph> around;
+	void compute_orders(bool);
+	void compute_pivot_graphs(bool);
+	void compute_around_graphs(int=0);
+	template <typename F>
+	long long sum_around(int, F);
+};
+
+/*
+ * Keeps the number of r-holes of a point set up to date while its
+ * points are moved one at a time. propose(i, q) returns the change
+ * in the count if point i were moved to q, which only needs
+ * count_convex_rholes_p (count_empty_triangles_p for r = 3) on the
+ * old and new positions; commit() applies the last proposal and
+ * rollback() discards it.
+ */
+class HoleCounter
+{
+public:
+	HoleCounter(const std::vector<Punto>&, int, bool=false);
+	const std::vector<Punto>& points() const;
+	long long count() const;
+	long long propose(int, Punto);
+	bool pending() const;
+	bool commit();
+	void rollback();
+private:
+	std::vector<Punto> pts;
+	int r;
+	bool mono;
+	long long total;
+	int pending_i;
+	Punto pending_q;
+	long long pending_delta;
+	void count_p(Punto, const std::vector<Punto>&, int&, int&) const;
+};
+
 #endif /* HOLES_H_ */
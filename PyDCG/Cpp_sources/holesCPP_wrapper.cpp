@@ -22,7 +22,7 @@
 #include "holesCPP.h"
 
 static const char* count_convex_rholes_doc =
-"count_convex_rholes(points, r, mono = True)\n\
+"count_convex_rholes(points, r, mono = True, low_memory = False)\n\
     \n\
     Counts the r-holes in a point set.\n\
     \n\
@@ -40,6 +40,10 @@ static const char* count_convex_rholes_doc =
         The number of sides of the holes we want to fint in the point set.\n\
     mono : boolean\n\
         Determines wheter to look for monochromatic `r`-holes or not.\n\
+    low_memory : boolean\n\
+        If True, the visibility graph of each point is computed and\n\
+        discarded in turn, instead of keeping all of them. Same running\n\
+        time, with a much smaller peak memory for large point sets.\n\
     \n\
     Returns\n\
     -------\n\
@@ -65,32 +69,42 @@ static const char* count_convex_rholes_doc =
 
 PyObject* count_convex_rholes_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
 {
-    //The C++ function prototype is: int count_convex_rholes(const std::vector<Punto>&, int, bool=false);
+    //The C++ function prototype is: long long count_convex_rholes(const std::vector<Punto>&, int, bool=false, bool=false);
     PyObject* py_pts;
     PyObject* py_mono = NULL;
+    PyObject* py_low_memory = NULL;
 
     int r;
     bool mono = false;
+    bool low_memory = false;
     vector<Punto> pts;
 
-    static const char *kwlist[] = {"points", "r", "mono", NULL};
+    static const char *kwlist[] = {"points", "r", "mono", "low_memory", NULL};
 
     //The arguments must be: a list with the points (each point is a list of two integers),
     //an integer (r) and a boolean (mono). The boolean is optional.
-    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!:count_convex_rholes", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono))
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!O!:count_convex_rholes", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono, &PyBool_Type, &py_low_memory))
         return (PyObject*)NULL;                                                     //This cast ^ is stupid. I just put to avoid the annoying warnings that appear if
                                                                          //kwlist isn't declared const
     if(py_mono == Py_True)
         mono = true;
 
+    if(py_low_memory == Py_True)
+        low_memory = true;
+
     if(pyPointset_CPointset(py_pts, pts) == FAIL)
         return (PyObject*)NULL;
 
-    return Py_BuildValue("i", count_convex_rholes(pts, r, mono));
+    long long res;
+    Py_BEGIN_ALLOW_THREADS
+    res = count_convex_rholes(pts, r, mono, low_memory);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", res);
 }
 
 static const char* report_convex_rholes_doc =
-"report_convex_rholes(points, r, mono = True)\n\
+"report_convex_rholes(points, r, mono = True, low_memory = False)\n\
     \n\
     Reports the r-holes in a point set.\n\
     \n\
@@ -108,6 +122,8 @@ static const char* report_convex_rholes_doc =
         The number of sides of the holes we want to fint in the point set.\n\
     mono : boolean\n\
         Determines wheter to look for monochromatic `r`-holes or not\n\
+    low_memory : boolean\n\
+        Same as in count_convex_rholes.\n\
     \n\
     Returns\n\
     -------\n\
@@ -124,28 +140,33 @@ static const char* report_convex_rholes_doc =
 extern "C" PyObject* report_convex_rholes_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
 {
     //The C++ function prototype is:
-    //std::deque<std::vector<Punto> > report_convex_rholes(const std::vector<Punto>&, int, bool=false);
+    //std::deque<std::vector<Punto> > report_convex_rholes(const std::vector<Punto>&, int, bool=false, bool=false);
     PyObject* py_pts;
     PyObject* py_mono = NULL;
+    PyObject* py_low_memory = NULL;
 
     int r;
     bool mono = false;
+    bool low_memory = false;
     vector<Punto> pts;
 
-    static const char *kwlist[] = {"points", "r", "mono", NULL};
+    static const char *kwlist[] = {"points", "r", "mono", "low_memory", NULL};
 
     //The arguments must be: a list with the points (each point is a list of two integers),
     //an integer (r) and a boolean (mono). The boolean is optional.
-    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!:count_convex_rholes", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono))
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!O!:count_convex_rholes", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono, &PyBool_Type, &py_low_memory))
         return (PyObject*)NULL;                                                            //See comment in count_convex_rholes_p_wrapper about this cast.
 
     if(py_mono == Py_True)
         mono = true;
 
+    if(py_low_memory == Py_True)
+        low_memory = true;
+
     if(pyPointset_CPointset(py_pts, pts) == FAIL)
         return (PyObject*)NULL;
 
-    auto res = report_convex_rholes(pts, r, mono);
+    auto res = report_convex_rholes(pts, r, mono, low_memory);
 
     PyObject* py_res = PyList_New(0);
 
@@ -230,7 +251,9 @@ extern "C" PyObject* count_convex_rholes_p_wrapper(PyObject* self, PyObject* arg
         return (PyObject*)NULL;
 
     int A, B;
+    Py_BEGIN_ALLOW_THREADS
     count_convex_rholes_p(p, pts, r, A, B, mono);
+    Py_END_ALLOW_THREADS
 
     return Py_BuildValue("ii", A, B);
 }
@@ -249,7 +272,12 @@ extern "C" PyObject* countEmptyTriangs_wrapper(PyObject* self, PyObject* args, P
     if(pyPointset_CPointset(py_pts, pts) == FAIL)
         return (PyObject*)NULL;
 
-    return Py_BuildValue("i", countEmptyTriangs(pts));
+    int res;
+    Py_BEGIN_ALLOW_THREADS
+    res = countEmptyTriangs(pts);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("i", res);
 }
 
 extern "C" PyObject* report_empty_triangles_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
@@ -308,7 +336,9 @@ extern "C" PyObject* count_empty_triangles_p_wrapper(PyObject* self, PyObject* a
         return (PyObject*)NULL;
 
     int A, B;
+    Py_BEGIN_ALLOW_THREADS
     count_empty_triangles_p(p, pts, A, B);
+    Py_END_ALLOW_THREADS
 
     return Py_BuildValue("ii", A, B);
 }
@@ -368,6 +398,83 @@ extern "C" PyObject* report_empty_triangles_p_wrapper(PyObject* self, PyObject*
 	return Py_BuildValue("NN", py_A, py_B);
 }
 
+extern "C" PyObject* report_convex_rholes_indices_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //std::vector<int32_t> report_convex_rholes_indices(const std::vector<Punto>&, int, bool=false, bool=false);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+    PyObject* py_low_memory = NULL;
+
+    int r;
+    bool mono = false;
+    bool low_memory = false;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", "r", "mono", "low_memory", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!O!:report_convex_rholes_indices", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono, &PyBool_Type, &py_low_memory))
+        return (PyObject*)NULL;
+
+    if(py_mono == Py_True)
+        mono = true;
+
+    if(py_low_memory == Py_True)
+        low_memory = true;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    return CVector_PyBuffer(report_convex_rholes_indices(pts, r, mono, low_memory));
+}
+
+extern "C" PyObject* report_empty_triangles_indices_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //std::vector<int32_t> report_empty_triangles_indices(const std::vector<Punto>&);
+    PyObject* py_pts;
+
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!:report_empty_triangles_indices", (char**)kwlist, &PyList_Type, &py_pts))
+        return NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    return CVector_PyBuffer(report_empty_triangles_indices(pts));
+}
+
+extern "C" PyObject* report_empty_triangles_p_indices_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void report_empty_triangles_p_indices(Punto, const vector<Punto>&, vector<int32_t>&, vector<int32_t>&);
+    PyObject* py_pts;
+    PyObject* py_p;
+
+    vector<Punto> pts;
+    Punto p;
+
+    static const char *kwlist[] = {"p", "points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!O!:report_empty_triangles_p_indices", (char**)kwlist, &PyList_Type, &py_p, &PyList_Type, &py_pts))
+        return NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    if (pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    vector<int32_t> A, B;
+
+    report_empty_triangles_p_indices(p, pts, A, B);
+
+    return Py_BuildValue("NN", CVector_PyBuffer(A), CVector_PyBuffer(B));
+}
+
 extern "C" PyObject* general_position_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
 {
     //The C++ function prototype is: general_position(vector<Punto>& points)
@@ -388,6 +495,785 @@ extern "C" PyObject* general_position_wrapper(PyObject* self, PyObject* args, Py
     return Py_BuildValue("i", general_position(points));
 }
 
+extern "C" PyObject* count_non_convex_four_holes_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //long long count_non_convex_four_holes(const std::vector<Punto>&, bool=false, int=0);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+
+    int threads = 0;
+    long long res;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!|O!i:count_non_convex_four_holes", (char**)kwlist, &PyList_Type, &py_pts, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    res = count_non_convex_four_holes(pts, py_mono == Py_True, threads);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", res);
+}
+
+extern "C" PyObject* count_non_convex_four_islands_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //long long count_non_convex_four_islands(const std::vector<Punto>&, bool=false, int=0);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+
+    int threads = 0;
+    long long res;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!|O!i:count_non_convex_four_islands", (char**)kwlist, &PyList_Type, &py_pts, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    res = count_non_convex_four_islands(pts, py_mono == Py_True, threads);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", res);
+}
+
+extern "C" PyObject* count_emptymon_triangles_p_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_pts;
+    PyObject* py_p;
+
+    vector<Punto> pts;
+    Punto p;
+
+    static const char *kwlist[] = {"p", "points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!O!:count_emptymon_triangles_p", (char**)kwlist, &PyList_Type, &py_p, &PyList_Type, &py_pts))
+        return (PyObject*)NULL;
+
+    if (pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    int A, B;
+    count_emptymon_triangles_p(p, pts, A, B);
+
+    return Py_BuildValue("ii", A, B);
+}
+
+extern "C" PyObject* empty_triangles_incidence_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //long long empty_triangles_incidence(const std::vector<Punto>&, std::vector<int64_t>&);
+    PyObject* py_pts;
+
+    vector<Punto> pts;
+    vector<int64_t> inc;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!:empty_triangles_incidence", (char**)kwlist, &PyList_Type, &py_pts))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    empty_triangles_incidence(pts, inc);
+    return CVector_PyBuffer(inc);
+}
+
+extern "C" PyObject* convex_rholes_incidence_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //long long convex_rholes_incidence(const std::vector<Punto>&, int, std::vector<int64_t>&, bool=false);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+
+    int r;
+    vector<Punto> pts;
+    vector<int64_t> inc;
+
+    static const char *kwlist[] = {"points", "r", "mono", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!:convex_rholes_incidence", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    convex_rholes_incidence(pts, r, inc, py_mono == Py_True);
+    return CVector_PyBuffer(inc);
+}
+
+extern "C" PyObject* rholes_remove_point_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void rholes_remove_point(const std::vector<Punto>&, int, std::vector<int64_t>&, bool=false, int=0);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+
+    int r, threads = 0;
+    bool mono = false;
+    vector<Punto> pts;
+    vector<int64_t> res;
+
+    static const char *kwlist[] = {"points", "r", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!i:rholes_remove_point", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    if(py_mono == Py_True)
+        mono = true;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rholes_remove_point(pts, r, res, mono, threads);
+    Py_END_ALLOW_THREADS
+
+    return CVector_PyBuffer(res);
+}
+
+extern "C" PyObject* count_mono_rholes_by_color_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void count_mono_rholes_by_color(const std::vector<Punto>&, int, std::vector<int>&, std::vector<long long>&, int=0);
+    PyObject* py_pts;
+
+    int r, threads = 0;
+    vector<Punto> pts;
+    vector<int> colors;
+    vector<long long> counts;
+
+    static const char *kwlist[] = {"points", "r", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|i:count_mono_rholes_by_color", (char**)kwlist, &PyList_Type, &py_pts, &r, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    count_mono_rholes_by_color(pts, r, colors, counts, threads);
+    Py_END_ALLOW_THREADS
+
+    PyObject* py_res = PyList_New(colors.size());
+    if(py_res == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<colors.size(); i++)
+        PyList_SET_ITEM(py_res, i, Py_BuildValue("(iL)", colors[i], counts[i]));
+
+    return py_res;
+}
+
+extern "C" PyObject* color_incidence_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void color_incidence(const std::vector<Punto>&, int, std::vector<int>&, std::vector<int64_t>&, int=0);
+    PyObject* py_pts;
+
+    int r, threads = 0;
+    vector<Punto> pts;
+    vector<int> colors;
+    vector<int64_t> M;
+
+    static const char *kwlist[] = {"points", "r", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|i:color_incidence", (char**)kwlist, &PyList_Type, &py_pts, &r, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    color_incidence(pts, r, colors, M, threads);
+    Py_END_ALLOW_THREADS
+
+    PyObject* py_colors = PyList_New(colors.size());
+    if(py_colors == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<colors.size(); i++)
+        PyList_SET_ITEM(py_colors, i, PyInt_FromLong(colors[i]));
+
+    return Py_BuildValue("NN", py_colors, CVector_PyBuffer(M));
+}
+
+extern "C" PyObject* find_convex_rhole_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //bool find_convex_rhole(const std::vector<Punto>&, int, std::vector<int>&, bool=false, int=0);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+
+    int r, threads = 1;
+    bool found;
+    vector<Punto> pts;
+    vector<int> hole;
+
+    static const char *kwlist[] = {"points", "r", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!i:find_convex_rhole", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    found = find_convex_rhole(pts, r, hole, py_mono == Py_True, threads);
+    Py_END_ALLOW_THREADS
+
+    if(!found)
+        Py_RETURN_NONE;
+
+    PyObject* py_hole = PyList_New(hole.size());
+    if(py_hole == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<hole.size(); i++)
+        PyList_SET_ITEM(py_hole, i, PyInt_FromLong(hole[i]));
+
+    return py_hole;
+}
+
+extern "C" PyObject* largest_convex_hole_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //int largest_convex_hole(const std::vector<Punto>&, std::vector<int>&, bool=false, int=0);
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+
+    int size, threads = 0;
+    vector<Punto> pts;
+    vector<int> hole;
+
+    static const char *kwlist[] = {"points", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!|O!i:largest_convex_hole", (char**)kwlist, &PyList_Type, &py_pts, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    size = largest_convex_hole(pts, hole, py_mono == Py_True, threads);
+    Py_END_ALLOW_THREADS
+
+    PyObject* py_hole = PyList_New(hole.size());
+    if(py_hole == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<hole.size(); i++)
+        PyList_SET_ITEM(py_hole, i, PyInt_FromLong(hole[i]));
+
+    return Py_BuildValue("iN", size, py_hole);
+}
+
+extern "C" PyObject* empty_triangles_edge_degrees_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototypes are:
+    //void empty_triangles_edge_degrees(const std::vector<Punto>&, std::vector<int32_t>&, int=0);
+    //void empty_triangles_edge_degrees_coo(const std::vector<Punto>&, std::vector<int32_t>&, std::vector<int32_t>&,
+    //                                      std::vector<int32_t>&, int=0);
+    PyObject* py_pts;
+    PyObject* py_sparse = NULL;
+
+    int threads = 0;
+    bool sparse = false;
+    vector<Punto> pts;
+    vector<int32_t> rows, cols, vals;
+
+    static const char *kwlist[] = {"points", "sparse", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!|O!i:empty_triangles_edge_degrees", (char**)kwlist, &PyList_Type, &py_pts, &PyBool_Type, &py_sparse, &threads))
+        return (PyObject*)NULL;
+
+    if(py_sparse == Py_True)
+        sparse = true;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    if(sparse)
+        empty_triangles_edge_degrees_coo(pts, rows, cols, vals, threads);
+    else
+        empty_triangles_edge_degrees(pts, vals, threads);
+    Py_END_ALLOW_THREADS
+
+    if(sparse)
+        return Py_BuildValue("NNN", CVector_PyBuffer(rows), CVector_PyBuffer(cols), CVector_PyBuffer(vals));
+    return CVector_PyBuffer(vals);
+}
+
+static void hole_index_destructor(PyObject* capsule)
+{
+    delete (HoleIndex*)PyCapsule_GetPointer(capsule, "holesCpp.hole_index");
+}
+
+static HoleIndex* get_hole_index(PyObject* py_index)
+{
+    return (HoleIndex*)PyCapsule_GetPointer(py_index, "holesCpp.hole_index");
+}
+
+extern "C" PyObject* hole_index_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_pts;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!:hole_index", (char**)kwlist, &PyList_Type, &py_pts))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    return PyCapsule_New(new HoleIndex(pts), "holesCpp.hole_index", hole_index_destructor);
+}
+
+extern "C" PyObject* hole_index_count_convex_rholes_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_mono = NULL;
+    int r;
+
+    static const char *kwlist[] = {"index", "r", "mono", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "Oi|O!:hole_index_count_convex_rholes", (char**)kwlist, &py_index, &r, &PyBool_Type, &py_mono))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("L", index->count_convex_rholes(r, py_mono == Py_True));
+}
+
+extern "C" PyObject* hole_index_report_convex_rholes_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_mono = NULL;
+    int r;
+
+    static const char *kwlist[] = {"index", "r", "mono", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "Oi|O!:hole_index_report_convex_rholes", (char**)kwlist, &py_index, &r, &PyBool_Type, &py_mono))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    return CVector_PyBuffer(index->report_convex_rholes(r, py_mono == Py_True));
+}
+
+extern "C" PyObject* hole_index_count_non_convex_four_holes_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_mono = NULL;
+
+    int threads = 0;
+    long long res;
+
+    static const char *kwlist[] = {"index", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O|O!i:hole_index_count_non_convex_four_holes", (char**)kwlist, &py_index, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    res = index->count_non_convex_four_holes(py_mono == Py_True, threads);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", res);
+}
+
+extern "C" PyObject* hole_index_count_non_convex_four_islands_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_mono = NULL;
+
+    int threads = 0;
+    long long res;
+
+    static const char *kwlist[] = {"index", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O|O!i:hole_index_count_non_convex_four_islands", (char**)kwlist, &py_index, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    res = index->count_non_convex_four_islands(py_mono == Py_True, threads);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", res);
+}
+
+extern "C" PyObject* hole_index_countEmptyTriangs_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+
+    static const char *kwlist[] = {"index", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:hole_index_countEmptyTriangs", (char**)kwlist, &py_index))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("L", index->count_empty_triangles());
+}
+
+extern "C" PyObject* hole_index_report_empty_triangles_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+
+    static const char *kwlist[] = {"index", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:hole_index_report_empty_triangles", (char**)kwlist, &py_index))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    return CVector_PyBuffer(index->report_empty_triangles());
+}
+
+extern "C" PyObject* hole_index_empty_triangles_incidence_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+
+    static const char *kwlist[] = {"index", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:hole_index_empty_triangles_incidence", (char**)kwlist, &py_index))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    vector<int64_t> inc;
+    index->empty_triangles_incidence(inc);
+    return CVector_PyBuffer(inc);
+}
+
+extern "C" PyObject* hole_index_convex_rholes_incidence_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_mono = NULL;
+
+    int r;
+
+    static const char *kwlist[] = {"index", "r", "mono", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "Oi|O!:hole_index_convex_rholes_incidence", (char**)kwlist, &py_index, &r, &PyBool_Type, &py_mono))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    vector<int64_t> inc;
+    index->convex_rholes_incidence(r, inc, py_mono == Py_True);
+    return CVector_PyBuffer(inc);
+}
+
+extern "C" PyObject* hole_index_largest_convex_hole_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+
+    static const char *kwlist[] = {"index", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:hole_index_largest_convex_hole", (char**)kwlist, &py_index))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    vector<int> hole;
+    int size = index->largest_convex_hole(hole);
+
+    PyObject* py_hole = PyList_New(hole.size());
+    if(py_hole == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<hole.size(); i++)
+        PyList_SET_ITEM(py_hole, i, PyInt_FromLong(hole[i]));
+
+    return Py_BuildValue("iN", size, py_hole);
+}
+
+extern "C" PyObject* hole_index_count_convex_rholes_p_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_p;
+    PyObject* py_mono = NULL;
+    int r;
+    Punto p;
+
+    static const char *kwlist[] = {"index", "p", "r", "mono", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO!i|O!:hole_index_count_convex_rholes_p", (char**)kwlist, &py_index, &PyList_Type, &py_p, &r, &PyBool_Type, &py_mono))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    if(pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    int A, B;
+    count_convex_rholes_p(p, index->points(), r, A, B, py_mono == Py_True);
+
+    return Py_BuildValue("ii", A, B);
+}
+
+extern "C" PyObject* hole_index_report_empty_triangles_p_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+    PyObject* py_p;
+    Punto p;
+
+    static const char *kwlist[] = {"index", "p", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO!:hole_index_report_empty_triangles_p", (char**)kwlist, &py_index, &PyList_Type, &py_p))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    if(pyPoint_CPoint(py_p, p) == FAIL)
+        return (PyObject*)NULL;
+
+    vector<int32_t> A, B;
+    report_empty_triangles_p_indices(p, index->points(), A, B);
+
+    return Py_BuildValue("NN", CVector_PyBuffer(A), CVector_PyBuffer(B));
+}
+
+extern "C" PyObject* hole_index_memory_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_index;
+
+    static const char *kwlist[] = {"index", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O:hole_index_memory", (char**)kwlist, &py_index))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("K", (unsigned long long)index->memory());
+}
+
+static void hole_counter_destructor(PyObject* capsule)
+{
+    delete (HoleCounter*)PyCapsule_GetPointer(capsule, "holesCpp.hole_counter");
+}
+
+static HoleCounter* get_hole_counter(PyObject* args)
+{
+    PyObject* py_counter;
+    if (!PyArg_ParseTuple(args, "O", &py_counter))
+        return NULL;
+    return (HoleCounter*)PyCapsule_GetPointer(py_counter, "holesCpp.hole_counter");
+}
+
+extern "C" PyObject* hole_counter_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_pts;
+    PyObject* py_mono = NULL;
+    int r;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", "r", "mono", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!:hole_counter", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_mono))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    HoleCounter* counter;
+    Py_BEGIN_ALLOW_THREADS
+    counter = new HoleCounter(pts, r, py_mono == Py_True);
+    Py_END_ALLOW_THREADS
+
+    return PyCapsule_New(counter, "holesCpp.hole_counter", hole_counter_destructor);
+}
+
+extern "C" PyObject* hole_counter_count_wrapper(PyObject* self, PyObject* args)
+{
+    HoleCounter* counter = get_hole_counter(args);
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("L", counter->count());
+}
+
+extern "C" PyObject* hole_counter_propose_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    PyObject* py_counter;
+    PyObject* py_q;
+    int i;
+    Punto q;
+
+    static const char *kwlist[] = {"counter", "i", "q", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OiO!:hole_counter_propose", (char**)kwlist, &py_counter, &i, &PyList_Type, &py_q))
+        return (PyObject*)NULL;
+
+    HoleCounter* counter = (HoleCounter*)PyCapsule_GetPointer(py_counter, "holesCpp.hole_counter");
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    if(i < 0 || i >= (int)counter->points().size())
+    {
+        PyErr_SetString(PyExc_IndexError, "point index out of range");
+        return (PyObject*)NULL;
+    }
+
+    if(pyPoint_CPoint(py_q, q) == FAIL)
+        return (PyObject*)NULL;
+
+    long long delta;
+    Py_BEGIN_ALLOW_THREADS
+    delta = counter->propose(i, q);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("L", delta);
+}
+
+extern "C" PyObject* hole_counter_commit_wrapper(PyObject* self, PyObject* args)
+{
+    HoleCounter* counter = get_hole_counter(args);
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    if(!counter->commit())
+    {
+        PyErr_SetString(PyExc_ValueError, "there is no proposal to commit");
+        return (PyObject*)NULL;
+    }
+
+    return Py_BuildValue("L", counter->count());
+}
+
+extern "C" PyObject* hole_counter_rollback_wrapper(PyObject* self, PyObject* args)
+{
+    HoleCounter* counter = get_hole_counter(args);
+    if(counter == NULL)
+        return (PyObject*)NULL;
+
+    counter->rollback();
+    Py_RETURN_NONE;
+}
+
+extern "C" PyObject* count_convex_rholes_p_many_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void count_convex_rholes_p_many(const std::vector<Punto>&, const std::vector<Punto>&, int,
+    //                                std::vector<int>&, std::vector<int>&, bool=false, int=0);
+    PyObject* py_index;
+    PyObject* py_Q;
+    PyObject* py_mono = NULL;
+
+    int r, threads = 0;
+    bool mono = false;
+    vector<Punto> Q;
+
+    static const char *kwlist[] = {"index", "Q", "r", "mono", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "OO!i|O!i:count_convex_rholes_p_many", (char**)kwlist, &py_index, &PyList_Type, &py_Q, &r, &PyBool_Type, &py_mono, &threads))
+        return (PyObject*)NULL;
+
+    HoleIndex* index = get_hole_index(py_index);
+    if(index == NULL)
+        return (PyObject*)NULL;
+
+    if(py_mono == Py_True)
+        mono = true;
+
+    if(pyPointset_CPointset(py_Q, Q) == FAIL)
+        return (PyObject*)NULL;
+
+    vector<int> A, B;
+
+    Py_BEGIN_ALLOW_THREADS
+    count_convex_rholes_p_many(Q, index->points(), r, A, B, mono, threads);
+    Py_END_ALLOW_THREADS
+
+    PyObject* py_res = PyList_New(Q.size());
+    if(py_res == NULL)
+        return (PyObject*)NULL;
+
+    for(size_t i=0; i<Q.size(); i++)
+        PyList_SET_ITEM(py_res, i, Py_BuildValue("ii", A[i], B[i]));
+
+    return py_res;
+}
+
+static const char* estimate_memory_doc =
+"estimate_memory(points, r, low_memory = False)\n\
+    \n\
+    Estimates the peak memory, in bytes, used by count_convex_rholes.\n\
+    \n\
+    The visibility graphs of the points are built one at a time to know\n\
+    their sizes, so this takes about as long as counting the empty\n\
+    triangles of `points`. Reporting the `r`-holes needs additional\n\
+    memory for the holes themselves.";
+
+extern "C" PyObject* estimate_memory_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //unsigned long long estimate_memory(const std::vector<Punto>&, int, bool=false);
+    PyObject* py_pts;
+    PyObject* py_low_memory = NULL;
+
+    int r;
+    bool low_memory = false;
+    vector<Punto> pts;
+
+    static const char *kwlist[] = {"points", "r", "low_memory", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|O!:estimate_memory", (char**)kwlist, &PyList_Type, &py_pts, &r, &PyBool_Type, &py_low_memory))
+        return (PyObject*)NULL;
+
+    if(py_low_memory == Py_True)
+        low_memory = true;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    return Py_BuildValue("K", estimate_memory(pts, r, low_memory));
+}
+
 PyMethodDef holesCppMethods[] =
 {
     {"count_convex_rholes", (PyCFunction)count_convex_rholes_wrapper, METH_VARARGS | METH_KEYWORDS, count_convex_rholes_doc},
@@ -401,6 +1287,73 @@ PyMethodDef holesCppMethods[] =
         "Returns (A_p, B_p), the number of empty triangles with p as a vertex and the number of triangles with only p inside. points must not contain p."},
 	{"report_empty_triangles_p", (PyCFunction)report_empty_triangles_p_wrapper, METH_VARARGS | METH_KEYWORDS,
 			 "Report the the empty triangles in points that have p as a vertex and the triangles in points that have only p inside them."},
+    {"report_convex_rholes_indices", (PyCFunction)report_convex_rholes_indices_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as report_convex_rholes, but returns a bytearray with r int32 indices into points for each r-hole."},
+    {"report_empty_triangles_indices", (PyCFunction)report_empty_triangles_indices_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as report_empty_triangles, but returns a bytearray with 3 int32 indices into points for each triangle."},
+    {"report_empty_triangles_p_indices", (PyCFunction)report_empty_triangles_p_indices_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as report_empty_triangles_p, but returns two bytearrays with 3 int32 indices for each triangle. The index len(points) stands for p."},
+    {"count_non_convex_four_holes", (PyCFunction)count_non_convex_four_holes_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Counts the non-convex 4-holes (monochromatic ones if mono is True) of points. The points are split among threads (one per core if threads <= 0)."},
+    {"count_non_convex_four_islands", (PyCFunction)count_non_convex_four_islands_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Counts the non-convex 4-islands (monochromatic ones if mono is True) of points. The points are split among threads (one per core if threads <= 0)."},
+    {"count_emptymon_triangles_p", (PyCFunction)count_emptymon_triangles_p_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns (A_p, B_p), the number of monochromatic empty triangles with p as a vertex and the number of monochromatic triangles with only p inside. points must not contain p."},
+    {"empty_triangles_incidence", (PyCFunction)empty_triangles_incidence_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a bytearray with an int64 for each point: the number of empty triangles of points that have it as a vertex."},
+    {"convex_rholes_incidence", (PyCFunction)convex_rholes_incidence_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a bytearray with an int64 for each point: the number of r-holes of points (monochromatic ones if mono is True) that have it as a vertex. For r = 3 these are the empty triangles."},
+    {"rholes_remove_point", (PyCFunction)rholes_remove_point_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a bytearray with an int64 for each point p: the number of r-holes (monochromatic ones if mono is True, empty triangles for r = 3) of points without p. All of them come from a single enumeration of the r-holes of points. The pivots are split among threads (one per core if threads <= 0)."},
+    {"count_mono_rholes_by_color", (PyCFunction)count_mono_rholes_by_color_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a list of pairs (color, count): the number of monochromatic r-holes (empty triangles for r = 3) of each color of points, computed in a single pass. The points are split among threads (one per core if threads <= 0)."},
+    {"color_incidence", (PyCFunction)color_incidence_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns (colors, M): the sorted colors of points and a bytearray with an n x len(colors) int64 matrix, where M[i][c] is the number of r-holes (empty triangles for r = 3) with points[i] as a vertex whose other vertices all have color colors[c]. The points are split among threads (one per core if threads <= 0)."},
+    {"find_convex_rhole", (PyCFunction)find_convex_rhole_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the list of indices into points of the vertices of an r-hole (monochromatic if mono is True), or None if there is none. It stops at the first one found. The pivots are split among threads (one per core if threads <= 0)."},
+    {"largest_convex_hole", (PyCFunction)largest_convex_hole_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns (k, indices), the size of the largest empty convex polygon of points (monochromatic if mono is True) and the indices into points of its vertices, starting at the leftmost one. It is (0, []) if there is none. The pivots are split among threads (one per core if threads <= 0)."},
+    {"empty_triangles_edge_degrees", (PyCFunction)empty_triangles_edge_degrees_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a bytearray with the n x n int32 matrix of the number of empty triangles of points that have each pair of points as an edge. If sparse is True, returns three bytearrays (rows, cols, vals) of int32 with the nonzero entries with row < col. The points are split among threads (one per core if threads <= 0)."},
+    {"hole_index", (PyCFunction)hole_index_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns an opaque HoleIndex of points for the hole_index_* functions and count_convex_rholes_p_many. It computes the orders and visibility graphs of points the first time a query needs them and keeps them."},
+    {"hole_index_count_convex_rholes", (PyCFunction)hole_index_count_convex_rholes_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as count_convex_rholes, on the points of index."},
+    {"hole_index_report_convex_rholes", (PyCFunction)hole_index_report_convex_rholes_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as report_convex_rholes_indices, on the points of index."},
+    {"hole_index_count_non_convex_four_holes", (PyCFunction)hole_index_count_non_convex_four_holes_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as count_non_convex_four_holes, on the points of index."},
+    {"hole_index_count_non_convex_four_islands", (PyCFunction)hole_index_count_non_convex_four_islands_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as count_non_convex_four_islands, on the points of index."},
+    {"hole_index_countEmptyTriangs", (PyCFunction)hole_index_countEmptyTriangs_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as countEmptyTriangs, on the points of index."},
+    {"hole_index_report_empty_triangles", (PyCFunction)hole_index_report_empty_triangles_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as report_empty_triangles_indices, on the points of index."},
+    {"hole_index_empty_triangles_incidence", (PyCFunction)hole_index_empty_triangles_incidence_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as empty_triangles_incidence, on the points of index."},
+    {"hole_index_convex_rholes_incidence", (PyCFunction)hole_index_convex_rholes_incidence_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as convex_rholes_incidence, on the points of index."},
+    {"hole_index_largest_convex_hole", (PyCFunction)hole_index_largest_convex_hole_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as largest_convex_hole (with mono False), on the points of index. It reuses the max chains of hole_index_count_convex_rholes."},
+    {"hole_index_count_convex_rholes_p", (PyCFunction)hole_index_count_convex_rholes_p_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as count_convex_rholes_p, on the points of index."},
+    {"hole_index_report_empty_triangles_p", (PyCFunction)hole_index_report_empty_triangles_p_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Same as report_empty_triangles_p_indices, on the points of index."},
+    {"hole_index_memory", (PyCFunction)hole_index_memory_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Bytes used by the orders and graphs that index has computed so far."},
+    {"hole_counter", (PyCFunction)hole_counter_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns an opaque HoleCounter that keeps the number of r-holes of points while they are moved (see the hole_counter_* functions)."},
+    {"hole_counter_count", (PyCFunction)hole_counter_count_wrapper, METH_VARARGS,
+        "Current number of r-holes of counter."},
+    {"hole_counter_propose", (PyCFunction)hole_counter_propose_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the change in the number of r-holes of counter if its i-th point is moved to q, and keeps it as the pending proposal."},
+    {"hole_counter_commit", (PyCFunction)hole_counter_commit_wrapper, METH_VARARGS,
+        "Applies the pending proposal of counter and returns the new number of r-holes."},
+    {"hole_counter_rollback", (PyCFunction)hole_counter_rollback_wrapper, METH_VARARGS,
+        "Discards the pending proposal of counter, if any."},
+    {"count_convex_rholes_p_many", (PyCFunction)count_convex_rholes_p_many_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns the list of count_convex_rholes_p(q, points, r, mono) for each q in Q, where points are the points of index (see hole_index). The points of Q are split among threads (one per core if threads <= 0)."},
+    {"estimate_memory", (PyCFunction)estimate_memory_wrapper, METH_VARARGS | METH_KEYWORDS, estimate_memory_doc},
     {"general_position", (PyCFunction)general_position_wrapper, METH_VARARGS | METH_KEYWORDS, "Verify if a point set is in general position"},
     {NULL, NULL, 0, NULL}
 };
@@ -0,0 +1,378 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#include "kgonsCPP.h"
+#include "parallel.h"
+#include <utility>
+
+using std::vector;
+using std::pair;
+
+typedef pair<int, int> edge;
+
+static bool lower(const Punto& a, const Punto& b)
+{
+	return a.y < b.y || (a.y == b.y && a.x < b.x);
+}
+
+static int half(BIG_INT dx, BIG_INT dy)
+{
+	//0 for the directions in [0, pi), 1 for the ones in [pi, 2pi)
+	return (dy > 0 || (dy == 0 && dx > 0)) ? 0 : 1;
+}
+
+static void sort_edges_by_angle(const vector<Punto>& points, vector<edge>& edges, vector<int>& group_end)
+{
+	/*
+	 * Puts in edges every ordered pair (u, v) of distinct points sorted by
+	 * the angle of v - u in [0, 2pi). The edges with the same direction are
+	 * consecutive, group_end[i] is one past the last edge with the direction
+	 * of edges[i].
+	 */
+	int n = points.size();
+	edges.clear();
+	edges.reserve(n*(n-1));
+	for(int u=0; u<n; u++)
+		for(int v=0; v<n; v++)
+			if(u != v)
+				edges.push_back(edge(u, v));
+
+	auto angle_less = [&points](const edge& e1, const edge& e2){
+		BIG_INT dx1 = BIG_INT(points[e1.second].x) - points[e1.first].x;
+		BIG_INT dy1 = BIG_INT(points[e1.second].y) - points[e1.first].y;
+		BIG_INT dx2 = BIG_INT(points[e2.second].x) - points[e2.first].x;
+		BIG_INT dy2 = BIG_INT(points[e2.second].y) - points[e2.first].y;
+		int h1 = half(dx1, dy1), h2 = half(dx2, dy2);
+		if(h1 != h2)
+			return h1 < h2;
+		return dx1*dy2 - dy1*dx2 > 0;
+	};
+	//Parallel edges are left in lexicographic order, so the witness is always the same
+	std::stable_sort(edges.begin(), edges.end(), angle_less);
+
+	group_end.assign(edges.size(), 0);
+	for(int i=(int)edges.size()-1; i>=0; i--)
+	{
+		if(i+1 < (int)edges.size() && !angle_less(edges[i], edges[i+1]))
+			group_end[i] = group_end[i+1];
+		else
+			group_end[i] = i+1;
+	}
+}
+
+static int max_kgon_pivot(const vector<Punto>& points, const vector<edge>& edges, const vector<int>& group_end,
+                          int p, vector<int>& f, vector<int>* witness)
+{
+	/*
+	 * Size of the largest convex polygon whose lowest vertex is points[p].
+	 * Sweeping the edges by angle, f[v] is the largest number of edges of a
+	 * convex chain from p to v, so a chain closing at p is a convex polygon.
+	 * The updates of a group of parallel edges are applied together, so no
+	 * chain goes straight through a point. If witness is not NULL, the
+	 * vertices of one such polygon are stored in it in ccw order starting
+	 * at p.
+	 */
+	int n = points.size();
+	const Punto& P = points[p];
+	vector<char> admissible(n);
+	for(int v=0; v<n; v++)
+		admissible[v] = (v == p || lower(P, points[v]));
+
+	f.assign(n, -1);
+	f[p] = 0;
+
+	//Predecessor chains for the witness: node[v] is the last node of the chain ending at v
+	vector<pair<int, int> > nodes; //(vertex, parent node)
+	vector<int> node;
+	if(witness != NULL)
+	{
+		node.assign(n, -1);
+		nodes.push_back(pair<int, int>(p, -1));
+		node[p] = 0;
+	}
+
+	int best = 0, best_node = -1;
+	vector<pair<int, int> > updates; //(edge index, new value)
+	for(size_t i=0; i<edges.size(); i = group_end[i])
+	{
+		updates.clear();
+		for(int j=i; j<group_end[i]; j++)
+		{
+			int u = edges[j].first, v = edges[j].second;
+			if(f[u] < 0 || !admissible[v])
+				continue;
+			if(v == p)
+			{
+				if(f[u]+1 > best)
+				{
+					best = f[u]+1;
+					if(witness != NULL)
+						best_node = node[u];
+				}
+			}
+			else if(f[u]+1 > f[v])
+				updates.push_back(pair<int, int>(j, f[u]+1));
+		}
+		for(auto &up : updates)
+		{
+			int u = edges[up.first].first, v = edges[up.first].second;
+			if(up.second > f[v])
+			{
+				f[v] = up.second;
+				if(witness != NULL)
+				{
+					nodes.push_back(pair<int, int>(v, node[u]));
+					node[v] = nodes.size()-1;
+				}
+			}
+		}
+	}
+
+	if(witness != NULL)
+	{
+		witness->clear();
+		for(int k=best_node; k>=0; k=nodes[k].second)
+			witness->push_back(nodes[k].first);
+		std::reverse(witness->begin(), witness->end());
+	}
+
+	return best;
+}
+
+int max_kgon(const vector<Punto>& points, vector<int>& kgon, int threads)
+{
+	/*
+	 * Size of the largest subset of points in convex position, and in kgon
+	 * the indices of its vertices in ccw order. The largest polygon through
+	 * each point as its lowest vertex is found with an O(n^2) sweep over the
+	 * edges sorted once by angle, so the whole thing takes O(n^3) time and
+	 * O(n^2) space. The points are split among threads (one per core if
+	 * threads <= 0). Three or more collinear points are never taken as
+	 * vertices of the same side.
+	 */
+	int n = points.size();
+	kgon.clear();
+	if(n < 3)
+		return 0;
+
+	vector<edge> edges;
+	vector<int> group_end;
+	sort_edges_by_angle(points, edges, group_end);
+
+	vector<int> sizes(n);
+	parallel_for(n, threads, [&](size_t p){
+		vector<int> f;
+		sizes[p] = max_kgon_pivot(points, edges, group_end, p, f, NULL);
+	});
+
+	int p = std::max_element(sizes.begin(), sizes.end()) - sizes.begin();
+	if(sizes[p] < 3)
+		return 0;
+
+	vector<int> f;
+	return max_kgon_pivot(points, edges, group_end, p, f, &kgon);
+}
+
+static bool convex_kgon_counts_pivot(const vector<Punto>& points, const vector<edge>& edges, const vector<int>& group_end,
+                                     int p, int max_k, vector<kgon_count>& counts)
+{
+	/*
+	 * Adds to counts[k] the number of convex k-gons whose lowest vertex is
+	 * points[p], for k = 3, ..., max_k. It is the sweep of max_kgon_pivot
+	 * with f[v*max_k + j] the number of convex chains from p to v with j
+	 * edges. Returns false if some count does not fit in a kgon_count.
+	 */
+	int n = points.size();
+	const Punto& P = points[p];
+	vector<char> admissible(n);
+	for(int v=0; v<n; v++)
+		admissible[v] = (v == p || lower(P, points[v]));
+
+	vector<kgon_count> f(n*max_k, 0), tmp;
+	f[p*max_k] = 1;
+
+	for(size_t i=0; i<edges.size(); i = group_end[i])
+	{
+		int size = group_end[i]-i;
+		if(size > 1)
+		{
+			//The chains of parallel edges are extended from the counts before the group
+			tmp.resize(size*max_k);
+			for(int j=0; j<size; j++)
+				std::copy(f.begin() + edges[i+j].first*max_k, f.begin() + (edges[i+j].first+1)*max_k, tmp.begin() + j*max_k);
+		}
+		for(int j=0; j<size; j++)
+		{
+			int u = edges[i+j].first, v = edges[i+j].second;
+			if(!admissible[u] || !admissible[v])
+				continue;
+			const kgon_count* fu = (size > 1) ? &tmp[j*max_k] : &f[u*max_k];
+			if(v == p)
+			{
+				for(int k=2; k<max_k; k++)
+					if(__builtin_add_overflow(counts[k+1], fu[k], &counts[k+1]))
+						return false;
+			}
+			else
+			{
+				kgon_count* fv = &f[v*max_k];
+				for(int k=0; k+1<max_k; k++)
+					if(__builtin_add_overflow(fv[k+1], fu[k], &fv[k+1]))
+						return false;
+			}
+		}
+	}
+
+	return true;
+}
+
+bool convex_kgon_counts(const vector<Punto>& points, int max_k, vector<kgon_count>& counts, int threads)
+{
+	/*
+	 * counts[k] is the number of subsets of k points in convex position
+	 * (without three collinear vertices), for k = 0, ..., max_k; the
+	 * entries for k < 3 are 0. It takes O(max_k*n^3) time, the points are
+	 * split among threads (one per core if threads <= 0). Returns false if
+	 * some count does not fit in 128 bits.
+	 */
+	int n = points.size();
+	counts.assign(std::max(max_k+1, 0), 0);
+	if(n < 3 || max_k < 3)
+		return true;
+
+	vector<edge> edges;
+	vector<int> group_end;
+	sort_edges_by_angle(points, edges, group_end);
+
+	int blocks = num_threads(threads, n);
+	vector<vector<kgon_count> > partial(blocks, vector<kgon_count>(max_k+1, 0));
+	std::atomic<bool> ok(true);
+	parallel_for(blocks, blocks, [&](size_t b){
+		for(int p=b; p<n && ok; p+=blocks)
+			if(!convex_kgon_counts_pivot(points, edges, group_end, p, std::min(max_k, n), partial[b]))
+				ok = false;
+	});
+	if(!ok)
+		return false;
+
+	for(auto &part : partial)
+		for(int k=3; k<=max_k; k++)
+			if(__builtin_add_overflow(counts[k], part[k], &counts[k]))
+				return false;
+	return true;
+}
+
+static void longest_chains(const vector<Punto>& points, const vector<int>& order, bool cups,
+                           vector<int16_t>& table, vector<int>& witness)
+{
+	/*
+	 * Fills table[i*n + j] with the number of points of the longest cup
+	 * (cap if cups is false) whose last edge goes from points[i] to
+	 * points[j], for i before j in order (0 otherwise), and stores in
+	 * witness the indices of a longest one. Three collinear points count
+	 * as both a cup and a cap. Around each point j the edges coming in
+	 * and going out are sorted by slope, and a single merge of the two
+	 * lists extends every outgoing edge with the best admissible incoming
+	 * one, so it takes O(n^2 log n) time.
+	 */
+	int n = points.size();
+	table.assign(n*n, 0);
+	witness.clear();
+	if(n < 2)
+		return;
+
+	vector<int> pred(n*n, -1);
+	auto slope_less = [&points](int a, int b, int c, int d){
+		//slope of ab < slope of cd, both going to the right (or straight up)
+		BIG_INT dx1 = BIG_INT(points[b].x) - points[a].x, dy1 = BIG_INT(points[b].y) - points[a].y;
+		BIG_INT dx2 = BIG_INT(points[d].x) - points[c].x, dy2 = BIG_INT(points[d].y) - points[c].y;
+		return dx1*dy2 - dy1*dx2 > 0;
+	};
+
+	vector<int> in, out;
+	int best = 0, best_i = -1, best_j = -1;
+	for(int t=0; t<n; t++)
+	{
+		int j = order[t];
+		in.assign(order.begin(), order.begin()+t);
+		out.assign(order.begin()+t+1, order.end());
+		std::sort(in.begin(), in.end(), [&](int a, int b){ return slope_less(a, j, b, j); });
+		std::sort(out.begin(), out.end(), [&](int a, int b){ return slope_less(j, a, j, b); });
+		if(!cups)
+		{
+			std::reverse(in.begin(), in.end());
+			std::reverse(out.begin(), out.end());
+		}
+
+		int max = 0, arg = -1;
+		size_t a = 0;
+		for(int k : out)
+		{
+			//A cup goes on with edges of larger slope, a cap with edges of smaller slope
+			while(a < in.size() && (cups ? !slope_less(j, k, in[a], j) : !slope_less(in[a], j, j, k)))
+			{
+				if(table[in[a]*n + j] > max)
+				{
+					max = table[in[a]*n + j];
+					arg = in[a];
+				}
+				a++;
+			}
+			table[j*n + k] = max > 0 ? max + 1 : 2;
+			pred[j*n + k] = arg;
+			if(table[j*n + k] > best)
+			{
+				best = table[j*n + k];
+				best_i = j;
+				best_j = k;
+			}
+		}
+	}
+
+	witness.push_back(best_j);
+	for(int i=best_i, j=best_j; i>=0; )
+	{
+		witness.push_back(i);
+		int h = pred[i*n + j];
+		j = i;
+		i = h;
+	}
+	std::reverse(witness.begin(), witness.end());
+}
+
+void cup_cap_tables(const vector<Punto>& points, vector<int16_t>& cups, vector<int16_t>& caps,
+                    vector<int>& cup, vector<int>& cap)
+{
+	/*
+	 * cups[i*n + j] (caps[i*n + j]) is the number of points of the
+	 * longest cup (cap) ending with the edge from points[i] to points[j],
+	 * where points[i] is to the left of points[j] (below it if they have
+	 * the same x coordinate); the other entries are 0. cup and cap get the
+	 * indices of a longest cup and a longest cap, from left to right.
+	 */
+	vector<int> order(points.size());
+	for(unsigned int i=0; i<order.size(); i++)
+		order[i] = i;
+	std::sort(order.begin(), order.end(), [&](int i, int j)->bool{
+		return points[i].x < points[j].x || (points[i].x == points[j].x && points[i].y < points[j].y);
+	});
+	longest_chains(points, order, true, cups, cup);
+	longest_chains(points, order, false, caps, cap);
+}
@@ -0,0 +1,35 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#ifndef KGONSCPP_H_
+#define KGONSCPP_H_
+
+#include "geometricbasicsCpp.h"
+#include <vector>
+#include <cstdint>
+
+typedef unsigned __int128 kgon_count;
+
+int max_kgon(const std::vector<Punto>&, std::vector<int>&, int=0);
+void cup_cap_tables(const std::vector<Punto>&, std::vector<int16_t>&, std::vector<int16_t>&,
+                    std::vector<int>&, std::vector<int>&);
+bool convex_kgon_counts(const std::vector<Punto>&, int, std::vector<kgon_count>&, int=0);
+
+#endif /* KGONSCPP_H_ */
@@ -0,0 +1,175 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#include "utilities.cpp"
+#include "kgonsCPP.h"
+
+static PyObject* CVector_PyList(const vector<int>& v)
+{
+    PyObject* py_list = PyList_New(v.size());
+    if(py_list == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<v.size(); i++)
+        PyList_SET_ITEM(py_list, i, PyInt_FromLong(v[i]));
+
+    return py_list;
+}
+
+extern "C" PyObject* max_kgon_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //int max_kgon(const std::vector<Punto>&, std::vector<int>&, int=0);
+    PyObject* py_pts;
+
+    int size, threads = 0;
+    vector<Punto> pts;
+    vector<int> kgon;
+
+    static const char *kwlist[] = {"points", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!|i:max_kgon", (char**)kwlist, &PyList_Type, &py_pts, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    size = max_kgon(pts, kgon, threads);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("iN", size, CVector_PyList(kgon));
+}
+
+extern "C" PyObject* cup_cap_tables_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //void cup_cap_tables(const std::vector<Punto>&, std::vector<int16_t>&, std::vector<int16_t>&,
+    //                    std::vector<int>&, std::vector<int>&);
+    PyObject* py_pts;
+
+    vector<Punto> pts;
+    vector<int16_t> cups, caps;
+    vector<int> cup, cap;
+
+    static const char *kwlist[] = {"points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!:cup_cap_tables", (char**)kwlist, &PyList_Type, &py_pts))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    cup_cap_tables(pts, cups, caps, cup, cap);
+    Py_END_ALLOW_THREADS
+
+    return Py_BuildValue("NNNN", CVector_PyBuffer(cups), CVector_PyBuffer(caps), CVector_PyList(cup), CVector_PyList(cap));
+}
+
+static PyObject* kgon_count_PyLong(kgon_count c)
+{
+    if(c <= (kgon_count)LONG_MAX)
+        return PyInt_FromLong((long)c);
+
+    //There is no conversion from 128 bit integers in the C-API, so the two halves are joined with python operations
+    PyObject* hi = PyLong_FromUnsignedLongLong((unsigned long long)(c >> 64));
+    PyObject* lo = PyLong_FromUnsignedLongLong((unsigned long long)c);
+    PyObject* shift = PyInt_FromLong(64);
+    PyObject* res = NULL;
+    if(hi != NULL && lo != NULL && shift != NULL)
+    {
+        PyObject* shifted = PyNumber_Lshift(hi, shift);
+        if(shifted != NULL)
+        {
+            res = PyNumber_Or(shifted, lo);
+            Py_DECREF(shifted);
+        }
+    }
+    Py_XDECREF(hi);
+    Py_XDECREF(lo);
+    Py_XDECREF(shift);
+    return res;
+}
+
+extern "C" PyObject* convex_kgon_counts_wrapper(PyObject* self, PyObject* args, PyObject *keywds)
+{
+    //The C++ function prototype is:
+    //bool convex_kgon_counts(const std::vector<Punto>&, int, std::vector<kgon_count>&, int=0);
+    PyObject* py_pts;
+
+    int max_k, threads = 0;
+    bool ok;
+    vector<Punto> pts;
+    vector<kgon_count> counts;
+
+    static const char *kwlist[] = {"points", "max_k", "threads", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "O!i|i:convex_kgon_counts", (char**)kwlist, &PyList_Type, &py_pts, &max_k, &threads))
+        return (PyObject*)NULL;
+
+    if(pyPointset_CPointset(py_pts, pts) == FAIL)
+        return (PyObject*)NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    ok = convex_kgon_counts(pts, max_k, counts, threads);
+    Py_END_ALLOW_THREADS
+
+    if(!ok)
+    {
+        PyErr_SetString(PyExc_OverflowError, "The number of convex k-gons does not fit in 128 bits.");
+        return (PyObject*)NULL;
+    }
+
+    PyObject* py_counts = PyList_New(counts.size());
+    if(py_counts == NULL)
+        return (PyObject*)NULL;
+
+    for(unsigned int i=0; i<counts.size(); i++)
+    {
+        PyObject* py_count = kgon_count_PyLong(counts[i]);
+        if(py_count == NULL)
+        {
+            Py_DECREF(py_counts);
+            return (PyObject*)NULL;
+        }
+        PyList_SET_ITEM(py_counts, i, py_count);
+    }
+
+    return py_counts;
+}
+
+PyMethodDef kgonsCppMethods[] =
+{
+    {"max_kgon", (PyCFunction)max_kgon_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns (k, indices), the size of the largest subset of points in convex position and the indices into points of its vertices in ccw order, starting at the lowest one. The points are split among threads (one per core if threads <= 0)."},
+    {"convex_kgon_counts", (PyCFunction)convex_kgon_counts_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns a list whose k-th entry is the number of convex k-gons with vertices in points, for k = 0, ..., max_k (the entries for k < 3 are 0). Raises OverflowError if a count does not fit in 128 bits. The points are split among threads (one per core if threads <= 0)."},
+    {"cup_cap_tables", (PyCFunction)cup_cap_tables_wrapper, METH_VARARGS | METH_KEYWORDS,
+        "Returns (cups, caps, cup, cap): two bytearrays with the n x n int16 tables of the number of points of the longest cup and cap ending with each edge (i, j), with points[i] before points[j] from left to right (0 for the other entries), and the lists of indices of a longest cup and a longest cap."},
+    {NULL, NULL, 0, NULL}
+};
+
+PyMODINIT_FUNC
+initkgonsCpp(void)
+{
+    (void) Py_InitModule3("kgonsCpp", kgonsCppMethods,
+                          "Extension in C++ with functions to find large subsets in convex position.");
+}
@@ -0,0 +1,60 @@
+/*    PyDCG
+
+   A Python library for Discrete and Combinatorial Geometry.
+
+   Copyright (C) 2015 Ruy Fabila Monroy
+
+   This program is free software; you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation version 2. 
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License along
+    with this program; if not, write to the Free Software Foundation, Inc.,
+    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+*/
+
+#ifndef PARALLEL_H_
+#define PARALLEL_H_
+
+#include <algorithm>
+#include <atomic>
+#include <thread>
+#include <vector>
+
+static inline int num_threads(int threads, size_t n)
+{
+	//One per core if threads <= 0, and never more than n (or less than 1)
+	if(threads <= 0)
+		threads = std::max(1u, std::thread::hardware_concurrency());
+	return std::min<size_t>(threads, std::max<size_t>(n, 1));
+}
+
+template <typename F>
+static void parallel_for(size_t n, int threads, F f)
+{
+	/*
+	 * Calls f(i) for i = 0, ..., n-1, handing out the indices one at
+	 * a time to threads threads (one per core if threads <= 0).
+	 */
+	threads = num_threads(threads, n);
+
+	std::atomic<size_t> next(0);
+	auto work = [&](){
+		for(size_t i=next++; i<n; i=next++)
+			f(i);
+	};
+
+	std::vector<std::thread> pool;
+	for(int t=1; t<threads; t++)
+		pool.emplace_back(work);
+	work();
+	for(auto &t : pool)
+		t.join();
+}
+
+#endif /* PARALLEL_H_ */
@@ -89,9 +89,8 @@ PyObject* CPoint_PyPoint(Punto point)
     if(point._has_color)
     {
         coord = PyInt_FromLong(point.color);
-        if(PyList_SetItem(py_point, 2, coord) == -1) //Append increases reference count
+        if(PyList_SetItem(py_point, 2, coord) == -1) //Set item steals the reference, the list owns coord now
             return NULL;
-        Py_DECREF(coord);
     }
 
     return py_point;
@@ -118,6 +117,46 @@ int pyPointset_CPointset(PyObject* py_pts, vector<Punto>& pts)
 }
 
 
+/**Same as pyPointset_CPointset, but py_pts may also be any object exposing a contiguous buffer of 64 bit
+   integers with two per point, such as an (n, 2) int64 NumPy array. The points of such a buffer have no color.*/
+int pyPoints_CPointset(PyObject* py_pts, vector<Punto>& pts)
+{
+    if(PyList_Check(py_pts))
+        return pyPointset_CPointset(py_pts, pts);
+
+    Py_buffer view;
+    if(PyObject_GetBuffer(py_pts, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == -1)
+        return FAIL;
+
+    int res = SUCCESS;
+    char fmt = view.format == NULL ? 'B' : view.format[strlen(view.format)-1];
+    if(view.itemsize != 8 || (fmt != 'l' && fmt != 'q') || (view.len / 8) % 2 != 0 ||
+       (view.ndim == 2 && view.shape[1] != 2) || view.ndim > 2)
+    {
+        PyErr_SetString(PyExc_ValueError, "The points must be a list or an (n, 2) array of 64 bit integers.");
+        res = FAIL;
+    }
+    else
+    {
+        const long long* coords = (const long long*)view.buf;
+        Py_ssize_t n = view.len / 16;
+        pts.reserve(pts.size() + n);
+        for(Py_ssize_t i=0; i<n && res == SUCCESS; i++)
+        {
+            if(abs(coords[2*i]) > max_val || abs(coords[2*i+1]) > max_val)
+            {
+                PyErr_SetString(PyExc_OverflowError, max_val_error);
+                res = FAIL;
+            }
+            else
+                pts.push_back(Punto(coords[2*i], coords[2*i+1]));
+        }
+    }
+
+    PyBuffer_Release(&view);
+    return res;
+}
+
 /**Recieves a C++ vector of points and returns a python object representing a point set (a list of lists of two numbers).*/
 PyObject* CPointset_PyPointset(vector<Punto>& pts)
 {
@@ -135,3 +174,13 @@ PyObject* CPointset_PyPointset(vector<Punto>& pts)
     }
     return py_pts;
 }
+
+
+/**Recieves a C++ vector of integers and returns a python bytearray holding its raw contents.
+   PyByteArray_FromStringAndSize copies the contents once; the python side then wraps the
+   bytearray in a NumPy array (see utilities.buffer_to_array) without copying it again.*/
+template <typename T>
+PyObject* CVector_PyBuffer(const vector<T>& v)
+{
+    return PyByteArray_FromStringAndSize(reinterpret_cast<const char*>(v.data()), Py_ssize_t(v.size()*sizeof(T)));
+}
@@ -4,13 +4,21 @@
 # David Eppstein, UC Irvine, 7 Mar 2002
 
 from __future__ import generators
+from array import array
+import utilities
+
+if utilities.__load_extensions:
+    import geometricbasicsCpp as gbCpp
 
 def CH(pts):
-    """Returns the convex hull of pts"""
-    if len(pts)<=3:
-        return pts
+    """Returns the vertices of the convex hull of pts in clockwise order,
+    starting at the leftmost one (the lowest of them). Points in the
+    interior of hull edges and repeated points are left out, also for
+    three or fewer points (pts is not modified)"""
     (U,L)=hulls(pts)
-    U.extend(L[1:len(L)-1])
+    if len(U)>1 and U[0][:2]==U[-1][:2]:
+        return U[:1]
+    U.extend(L[-2:0:-1])
     return U
 
 def orientation(p,q,r):
@@ -21,14 +29,112 @@ def hulls(Points):
     '''Graham scan to find upper and lower convex hulls of a set of 2d points.'''
     U = []
     L = []
-    Points.sort()
-    for p in Points:
+    for p in sorted(Points):
         while len(U) > 1 and orientation(U[-2],U[-1],p) <= 0: U.pop()
         while len(L) > 1 and orientation(L[-2],L[-1],p) >= 0: L.pop()
         U.append(p)
         L.append(p)
     return U,L
 
+def hull_indices(pts, speedup=True):
+    """Returns the list of indices into pts of the vertices of its convex
+    hull in ccw order, starting at the leftmost one (the lowest of them).
+    Points in the interior of hull edges and repeated points are left out.
+    pts may be a list of points or an (n, 2) integer NumPy array, and it
+    is not modified. The C++ version runs the monotone chain."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _hull_indices_py(pts)
+    try:
+        return gbCpp.convex_hull(_int64_points(pts))
+    except OverflowError:
+        return _hull_indices_py(pts)
+
+def hulls_many(sets, speedup=True):
+    """Returns [hull_indices(pts) for pts in sets] with a single call to
+    the C++ extension, for many small point sets. sets may be a list of
+    point sets (lists or NumPy arrays) or an (m, k, 2) integer NumPy
+    array of m sets of k points each."""
+    sets = list(sets)
+    if utilities.__config['PURE_PYTHON'] or not speedup or not sets:
+        return [_hull_indices_py(pts) for pts in sets]
+    offsets = [0]
+    for pts in sets:
+        offsets.append(offsets[-1]+len(pts))
+    if any(hasattr(pts, 'dtype') for pts in sets):
+        points = utilities.numpy.concatenate([_int64_points(utilities.numpy.asarray(pts).reshape(-1, 2))
+                                              for pts in sets])
+    else:
+        points = [p for pts in sets for p in pts]
+    try:
+        hulls, hull_offsets = gbCpp.convex_hulls(points, offsets)
+    except OverflowError:
+        return [_hull_indices_py(pts) for pts in sets]
+    hulls = array('i', str(hulls))
+    hull_offsets = array('i', str(hull_offsets))
+    return [hulls[hull_offsets[i]:hull_offsets[i+1]].tolist() for i in xrange(len(sets))]
+
+def convex_layers(pts, speedup=True):
+    """Returns an int32 NumPy array with the convex layer of each point of
+    pts: 0 for the points on the boundary of the convex hull of pts, 1 for
+    the ones on the boundary of the hull of the remaining points, and so
+    on. pts may be a list of points or an (n, 2) integer NumPy array. The
+    C++ version peels the layers from a tree of partial hulls and, unlike
+    calling CH repeatedly, takes about O(n log n) time on random sets."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _convex_layers_py(pts)
+    try:
+        return utilities.buffer_to_array(gbCpp.convex_layers(_int64_points(pts)), 'int32')
+    except OverflowError:
+        return _convex_layers_py(pts)
+
+def _int64_points(pts):
+    """Passes lists through and makes arrays C-contiguous int64, as the C++
+    side expects them."""
+    if hasattr(pts, 'dtype'):
+        return utilities.numpy.ascontiguousarray(pts, dtype='int64')
+    return pts
+
+def _hull_indices_py(pts):
+    idx = sorted(xrange(len(pts)), key=lambda i: (pts[i][0], pts[i][1], i))
+    idx = [i for k, i in enumerate(idx)
+           if k == 0 or (pts[i][0], pts[i][1]) != (pts[idx[k-1]][0], pts[idx[k-1]][1])]
+    if len(idx) <= 1:
+        return idx
+    H = []
+    for chain in (idx, idx[-2::-1]):
+        start = len(H)-1 if H else 0
+        for i in chain:
+            while len(H) >= start+2 and orientation(pts[H[-2]], pts[H[-1]], pts[i]) >= 0:
+                H.pop()
+            H.append(i)
+    return H[:-1]
+
+def _convex_layers_py(pts):
+    layers = [-1]*len(pts)
+    alive = sorted(xrange(len(pts)), key=lambda i: (pts[i][0], pts[i][1], i))
+    #Repeated points are peeled once, their copies take the layer of the first one
+    first = {}
+    for k, i in enumerate(alive):
+        if k > 0 and (pts[i][0], pts[i][1]) == (pts[alive[k-1]][0], pts[alive[k-1]][1]):
+            first[i] = first[alive[k-1]]
+        else:
+            first[i] = i
+    alive = [i for i in alive if first[i] == i]
+    layer = 0
+    while alive:
+        for sign in (1, -1): #upper and lower hulls, with the points on their edges
+            H = []
+            for i in alive:
+                while len(H) >= 2 and sign*orientation(pts[H[-2]], pts[H[-1]], pts[i]) < 0:
+                    H.pop()
+                H.append(i)
+            for i in H:
+                layers[i] = layer
+        alive = [i for i in alive if layers[i] == -1]
+        layer += 1
+    layers = [layers[first[i]] for i in xrange(len(pts))]
+    return utilities.list_to_array(layers, 'int32')
+
 def rotatingCalipers(Points):
     '''Given a list of 2d points, finds all ways of sandwiching the points
 between two parallel lines that touch one point each, and yields the sequence
@@ -287,6 +287,69 @@ def count_crossings_candidate_list(point_index,candidate_list,pts, speedup=True)
         return crossingCpp.count_crossings_candidate_list(point_index,candidate_list,pts)
     except OverflowError:
         return count_crossings_candidate_list_py(point_index,candidate_list,pts)
+
+def _crossing_counter(points, speedup):
+    """Returns the C++ counter used by CrossingCounter, or None if the pure
+    Python version has to be used."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return None
+    try:
+        return crossingCpp.crossing_counter(points)
+    except OverflowError:
+        return None
+
+class CrossingCounter(object):
+
+    """Keeps the number of crossings of the complete geometric graph on
+       points (in general position) up to date while its points are moved
+       one at a time. change(i, q) returns the change in the count if
+       points[i] is moved to q and move(i, q) moves it. Only the crossings
+       at the moved point change: the C++ version counts them in
+       O(n log n) time from the points sorted around each other one, and
+       change can be called from several threads at once. The pure Python
+       version recounts. points is copied, self.points holds the current
+       positions."""
+
+    def __init__(self, points, speedup=True):
+        self.points = [p[:] for p in points]
+        self.speedup = speedup
+        self._counter = _crossing_counter(self.points, speedup)
+        if self._counter is None:
+            self._count = count_crossings_py(self.points)
+
+    def __getstate__(self):
+        #The C++ counter can not be pickled, it is built again
+        return (self.points, self.speedup)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def count(self):
+        """Returns the current number of crossings."""
+        if self._counter is not None:
+            return crossingCpp.crossing_counter_count(self._counter)
+        return self._count
+
+    def change(self, i, q):
+        """Returns the change in the number of crossings if points[i] is
+        moved to q."""
+        q = list(q[:2]) + self.points[i][2:]
+        if self._counter is not None:
+            return crossingCpp.crossing_counter_change(self._counter, i, q)
+        moved = self.points[:]
+        moved[i] = q
+        return count_crossings_py(moved) - self._count
+
+    def move(self, i, q):
+        """Moves points[i] to q and returns the new number of crossings."""
+        q = list(q[:2]) + self.points[i][2:]
+        if self._counter is not None:
+            self.points[i] = q
+            return crossingCpp.crossing_counter_move(self._counter, i, q)
+        self._count += self.change(i, q)
+        self.points[i] = q
+        return self._count
+
     
 #----Removal Functions
 #Added them from Frank's Thesis code.
@@ -24,6 +24,10 @@
 import random
 import warnings
 from geometricbasics import turn
+import utilities
+
+if utilities.__load_extensions:
+    import datastructuresCpp
 
 # TODO: cambiar bridge a miembro o sacarla de la clase (actualmente es
 # miembro de clase)
@@ -391,6 +395,8 @@ class Treap(object):
 
     class Node(object):
 
+        __slots__ = ('key', 'obj', 'priority', 'parent', 'right', 'left')
+
         def __init__(self, key=0, obj=None):
             self.key = key
             self.obj = obj
@@ -456,6 +462,301 @@ def treapToList(T):
     return l
 
 
+class _ArrayTreapStore(object):
+
+    """Parallel lists holding the nodes of one or more ArrayTreaps. Node 0
+       stands for no node (its size is 0); freed nodes are reused."""
+
+    __slots__ = ('key', 'obj', 'priority', 'left', 'right', 'size', 'free')
+
+    def __init__(self):
+        self.key = [None]
+        self.obj = [None]
+        self.priority = [0.0]
+        self.left = [0]
+        self.right = [0]
+        self.size = [0]
+        self.free = []
+
+    def new(self, key, obj):
+        if self.free:
+            t = self.free.pop()
+            self.key[t] = key
+            self.obj[t] = obj
+            self.priority[t] = random.random()
+            self.left[t] = self.right[t] = 0
+            self.size[t] = 1
+            return t
+        self.key.append(key)
+        self.obj.append(obj)
+        self.priority.append(random.random())
+        self.left.append(0)
+        self.right.append(0)
+        self.size.append(1)
+        return len(self.key)-1
+
+    def split(self, t, key, inclusive=False):
+        """Splits the subtree t into the nodes with keys smaller than key
+        (or equal, if inclusive) and the rest. Returns both roots."""
+        keys, left, right, size = self.key, self.left, self.right, self.size
+        L = R = lt = rt = 0
+        path = []
+        while t:
+            path.append(t)
+            if (not key < keys[t]) if inclusive else keys[t] < key:
+                if lt:
+                    right[lt] = t
+                else:
+                    L = t
+                lt = t
+                t = right[t]
+            else:
+                if rt:
+                    left[rt] = t
+                else:
+                    R = t
+                rt = t
+                t = left[t]
+        right[lt] = 0
+        left[rt] = 0
+        for t in reversed(path):
+            size[t] = size[left[t]] + size[right[t]] + 1
+        return L, R
+
+    def join(self, a, b):
+        """Joins the subtrees a and b, every key of a being at most every
+        key of b. Returns the new root."""
+        priority, left, right, size = self.priority, self.left, self.right, self.size
+        root = last = 0
+        from_a = False
+        path = []
+        while a and b:
+            # The node with the highest priority goes on top; one from a
+            # keeps its left subtree, one from b its right subtree
+            if priority[a] > priority[b]:
+                t, a, t_from_a = a, right[a], True
+            else:
+                t, b, t_from_a = b, left[b], False
+            if not last:
+                root = t
+            elif from_a:
+                right[last] = t
+            else:
+                left[last] = t
+            path.append(t)
+            last, from_a = t, t_from_a
+        rest = a or b
+        if not last:
+            return rest
+        if from_a:
+            right[last] = rest
+        else:
+            left[last] = rest
+        for t in reversed(path):
+            size[t] = size[left[t]] + size[right[t]] + 1
+        return root
+
+
+class ArrayTreap(object):
+
+    """A treap kept in parallel lists (see _ArrayTreapStore) instead of
+       Node objects, with the size of every subtree for rank and select.
+       Keys are compared with <, so there is no compare function, and
+       equal keys are allowed. Higher priorities are at the top.
+
+       Nodes are indices into the lists; the ones returned by find, min,
+       max and select stay valid until they are deleted. Treaps obtained
+       from split share the lists of the original one, so split and join
+       never allocate nodes, and only treaps sharing their lists can be
+       joined."""
+
+    __slots__ = ('_s', 'root')
+
+    def __init__(self, keys=(), objs=None):
+        """Builds the treap of keys, which must be sorted, in O(n) time.
+        objs are the objects attached to them (None by default)."""
+        self._s = s = _ArrayTreapStore()
+        keys = list(keys)
+        if any(keys[i+1] < keys[i] for i in xrange(len(keys)-1)):
+            raise ValueError("The keys must be sorted.")
+        if objs is None:
+            objs = [None]*len(keys)
+        n = len(keys)
+        s.key.extend(keys)
+        s.obj.extend(objs)
+        s.priority.extend(random.random() for i in xrange(n))
+        s.left.extend([0]*n)
+        s.right.extend([0]*n)
+        s.size.extend([1]*n)
+        # Cartesian tree on the priorities, with a stack holding its right
+        # spine; a node's subtree is complete when it leaves the spine
+        priority, left, right, size = s.priority, s.left, s.right, s.size
+        stack = []
+        for t in xrange(1, n+1):
+            last = 0
+            while stack and priority[stack[-1]] < priority[t]:
+                last = stack.pop()
+                size[last] = size[left[last]] + size[right[last]] + 1
+            left[t] = last
+            if stack:
+                right[stack[-1]] = t
+            stack.append(t)
+        for t in reversed(stack):
+            size[t] = size[left[t]] + size[right[t]] + 1
+        self.root = stack[0] if stack else 0
+
+    @classmethod
+    def _from_store(cls, store, root):
+        T = cls.__new__(cls)
+        T._s = store
+        T.root = root
+        return T
+
+    def __len__(self):
+        return self._s.size[self.root]
+
+    def __iter__(self):
+        keys, left, right = self._s.key, self._s.left, self._s.right
+        stack = []
+        t = self.root
+        while t or stack:
+            while t:
+                stack.append(t)
+                t = left[t]
+            t = stack.pop()
+            yield keys[t]
+            t = right[t]
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def key(self, node):
+        return self._s.key[node]
+
+    def obj(self, node):
+        return self._s.obj[node]
+
+    def find(self, key):
+        """A node with the given key, or None."""
+        keys, left, right = self._s.key, self._s.left, self._s.right
+        t = self.root
+        while t:
+            if key < keys[t]:
+                t = left[t]
+            elif keys[t] < key:
+                t = right[t]
+            else:
+                return t
+        return None
+
+    def min(self):
+        if not self.root:
+            return None
+        return self.select(0)
+
+    def max(self):
+        if not self.root:
+            return None
+        return self.select(-1)
+
+    def insert(self, key, obj=None):
+        """Inserts key after the equal keys already in the treap and
+        returns its node."""
+        s = self._s
+        keys, priority, left, right, size = s.key, s.priority, s.left, s.right, s.size
+        node = s.new(key, obj)
+        p = priority[node]
+        parent, t = 0, self.root
+        while t and priority[t] > p:
+            size[t] += 1
+            parent = t
+            t = left[t] if key < keys[t] else right[t]
+        left[node], right[node] = s.split(t, key, True)
+        size[node] = size[left[node]] + size[right[node]] + 1
+        if not parent:
+            self.root = node
+        elif key < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        return node
+
+    def delete(self, key):
+        """Deletes a node with the given key and returns its object.
+        Raises KeyError if there is none."""
+        s = self._s
+        keys, left, right, size = s.key, s.left, s.right, s.size
+        parent, t = 0, self.root
+        path = []
+        while t and (key < keys[t] or keys[t] < key):
+            path.append(t)
+            parent = t
+            t = left[t] if key < keys[t] else right[t]
+        if not t:
+            raise KeyError(key)
+        for u in path:
+            size[u] -= 1
+        rest = s.join(left[t], right[t])
+        if not parent:
+            self.root = rest
+        elif left[parent] == t:
+            left[parent] = rest
+        else:
+            right[parent] = rest
+        obj = s.obj[t]
+        s.key[t] = s.obj[t] = None
+        s.free.append(t)
+        return obj
+
+    def rank(self, key):
+        """Number of keys smaller than key."""
+        keys, left, right, size = self._s.key, self._s.left, self._s.right, self._s.size
+        r, t = 0, self.root
+        while t:
+            if keys[t] < key:
+                r += size[left[t]] + 1
+                t = right[t]
+            else:
+                t = left[t]
+        return r
+
+    def select(self, i):
+        """Node with the i-th smallest key (counting from 0; negative i
+        count from the end, as in lists)."""
+        left, right, size = self._s.left, self._s.right, self._s.size
+        n = size[self.root]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("ArrayTreap index out of range")
+        t = self.root
+        while True:
+            l = size[left[t]]
+            if i < l:
+                t = left[t]
+            elif i == l:
+                return t
+            else:
+                i -= l + 1
+                t = right[t]
+
+    def split(self, key):
+        """Returns two treaps with the keys smaller than key and the rest.
+        This treap is left empty."""
+        L, R = self._s.split(self.root, key)
+        self.root = 0
+        return ArrayTreap._from_store(self._s, L), ArrayTreap._from_store(self._s, R)
+
+    def join(self, T2):
+        """Returns the join of self and T2, assuming self <= T2. Both are
+        left empty."""
+        if T2._s is not self._s:
+            raise ValueError("Only treaps split from the same one can be joined.")
+        root = self._s.join(self.root, T2.root)
+        self.root = T2.root = 0
+        return ArrayTreap._from_store(self._s, root)
+
+
 class dynamic_half_hull(object):
 
     def __init__(self, side=UPPER):
@@ -844,6 +1145,8 @@ class dynamic_half_hull(object):
 
     class Node(object):
 
+        __slots__ = ('key', 'Q', 'J', 'parent', 'right', 'left', 'obj', 'priority')
+
         def __init__(self, key=[0, 0], obj=None):
 
             # A point is the node is a leaf, otherwise [0, maxy] where maxy is
@@ -933,6 +1236,146 @@ class dynamic_convex_hull(object):
         print self.toList()
 
 
+def _dynamic_hull(points, speedup):
+    """Returns the C++ structure used by DynamicConvexHull, or None if the
+    pure Python version has to be used."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return None
+    if hasattr(points, 'dtype'):
+        points = utilities.numpy.ascontiguousarray(points, dtype='int64')
+    try:
+        return datastructuresCpp.dynamic_hull(points)
+    except OverflowError:
+        return None
+
+class DynamicConvexHull(object):
+
+    """Convex hull of a point set under insertions and deletions, kept by
+       the C++ extension in arrays instead of Node objects (see
+       dynamic_convex_hull). Building it from n points takes O(n log n)
+       time, O(n) if they are already sorted by x and then by y;
+       insertions and deletions take O(log^2 n) expected time.
+
+       The id of a point is its index in points; inserted points get the
+       next ids. The queries return NumPy arrays of ids. Points may share
+       their x coordinate, and repeated points are kept only once.
+       Without the extension (or with coordinates too large for it) the
+       hull is recomputed on every query."""
+
+    def __init__(self, points=(), speedup=True):
+        self._hull = _dynamic_hull(points, speedup)
+        self._n = len(points)
+        if self._hull is None:
+            self._points = [[p[0], p[1]] for p in points]
+            self._ids = {}
+            for i, p in enumerate(self._points):
+                self._ids.setdefault(tuple(p), i)
+
+    def _to_python(self):
+        """Moves the points out of the C++ structure, for coordinates it
+        cannot hold."""
+        point = datastructuresCpp.dynamic_hull_point
+        self._points = [point(self._hull, i) for i in xrange(self._n)]
+        self._ids = {}
+        for i, p in enumerate(self._points):
+            if datastructuresCpp.dynamic_hull_find(self._hull, p) == i:
+                self._ids[tuple(p)] = i
+        self._hull = None
+
+    def __len__(self):
+        if self._hull is None:
+            return len(self._ids)
+        return datastructuresCpp.dynamic_hull_size(self._hull)
+
+    def __contains__(self, p):
+        return self.find(p) >= 0
+
+    def find(self, p):
+        """Id of p, or -1 if it is not in the set."""
+        if self._hull is None:
+            return self._ids.get((p[0], p[1]), -1)
+        try:
+            return datastructuresCpp.dynamic_hull_find(self._hull, [p[0], p[1]])
+        except OverflowError:
+            return -1
+
+    def point(self, i):
+        """The point with id i."""
+        if self._hull is None:
+            return list(self._points[i])
+        return datastructuresCpp.dynamic_hull_point(self._hull, i)
+
+    def insert(self, p):
+        """Inserts p and returns its id (the one it had if it was already
+        in the set)."""
+        p = [p[0], p[1]]
+        if self._hull is not None:
+            try:
+                i = datastructuresCpp.dynamic_hull_update(self._hull, p)
+            except OverflowError:
+                self._to_python()
+            else:
+                self._n = max(self._n, i+1)
+                return i
+        i = self._ids.get(tuple(p))
+        if i is None:
+            i = self._ids[tuple(p)] = len(self._points)
+            self._points.append(p)
+        return i
+
+    def delete(self, p):
+        """Deletes p and returns the id it had. Raises ValueError if p is not
+        in the set."""
+        i = -1
+        if self._hull is None:
+            i = self._ids.pop((p[0], p[1]), -1)
+        elif p in self:
+            i = datastructuresCpp.dynamic_hull_update(self._hull, [p[0], p[1]], True)
+        if i < 0:
+            raise ValueError("Point %s not in the hull" % (p,))
+        return i
+
+    def _chains(self):
+        """Lower and upper hulls by the monotone chain, without C++."""
+        ids = sorted(self._ids.itervalues(), key=lambda i: self._points[i])
+        lower, upper = [], []
+        for i in ids:
+            for H, side in ((lower, -1), (upper, 1)): #left and right turns
+                while len(H) >= 2 and turn(self._points[H[-2]], self._points[H[-1]], self._points[i]) != side:
+                    H.pop()
+                H.append(i)
+        return lower, upper
+
+    def _vertices(self, chain):
+        if self._hull is not None:
+            return utilities.buffer_to_array(datastructuresCpp.dynamic_hull_vertices(self._hull, chain), 'int32')
+        lower, upper = self._chains()
+        if chain == 'lower':
+            return utilities.list_to_array(lower, 'int32')
+        if chain == 'upper':
+            return utilities.list_to_array(upper, 'int32')
+        if len(lower) <= 1:
+            return utilities.list_to_array(lower, 'int32')
+        return utilities.list_to_array(lower[:-1]+upper[:0:-1], 'int32')
+
+    def hull(self):
+        """Ids of the vertices of the convex hull in ccw order, starting at
+        the leftmost one (the lowest of them). Points in the interior of
+        hull edges are left out."""
+        return self._vertices('hull')
+
+    def upper(self):
+        """Ids of the vertices of the upper hull from left to right."""
+        return self._vertices('upper')
+
+    def lower(self):
+        """Ids of the vertices of the lower hull from left to right."""
+        return self._vertices('lower')
+
+    def toList(self):
+        return [self.point(i) for i in self.hull()]
+
+
 def compute_height(node):
     if node is None:
         return 0
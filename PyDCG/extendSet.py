@@ -33,51 +33,210 @@ Created on Mon Jul 21 21:43:38 2014
 """
 
 import holes, datastructures, pointExplorer
-import random, time, pickle, sys, argparse
+import random, time, pickle, sys, argparse, os, json
 #import holes, pointExplorer, datastructures, random, time, pickle
 
-def extend(pts, speedup='try'):
-    if holes.count_convex_rholes(pts, 6) != 0:
+def _batches(iterable, size):
+    """Groups the elements of iterable in lists of the given size."""
+    batch = []
+    for x in iterable:
+        batch.append(x)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def extend(pts, speedup='try', batch_size=64, verbose=False, telemetry=None):
+    """Looks for a point that can be added to pts without creating empty
+    hexagons, walking randomly over the cells of the arrangement of lines
+    of pts. The progress is printed if verbose is True and recorded in
+    telemetry, a heuristics.Telemetry, if given."""
+    if verbose and holes.has_convex_rhole(pts, 6):
         print "Initial set has empty hexagons"
     p = datastructures.randPoint(10000000000)
     bestp = p[:]
     pts.append(p)
     emptyRegions = []
     minH = holes.count_convex_rholes(pts, 6, speedup=speedup)
-    print "starting with", minH
+    if verbose:
+        print "starting with", minH
+    if telemetry is not None:
+        telemetry.start(minH)
     pts.pop()
-    Ap, Bp = holes.count_convex_rholes_p(p, pts, 6, speedup=speedup)
+    context = holes.HoleContext(pts, 6, speedup=speedup)
+    Ap, Bp = context.count_p(p)
     regionsChecked = 0
-    for pol in pointExplorer.getRandomWalkDFS(p, pts, float('inf')):
-        regionsChecked += 1
-        print "checking region", regionsChecked
-        q = pointExplorer.getCenter(pol)
-        if q is None:
-            emptyRegions.append(pol)
-        else:
-            print "trying with", q
-            Aq, Bq = holes.count_convex_rholes_p(q, pts, 6, speedup=speedup)
-            newH = minH + Aq - Ap + Bp - Bq
-            
-            if newH <= minH:
-                if newH < minH:
-                    print "%d points, %d 6 holes"%(len(pts)+1, newH)
-                minH = newH
-                Ap, Bp = Aq, Bq
-                bestp = q[:]
+    t0 = time.time()
+    for pols in _batches(pointExplorer.getRandomWalkDFS(p, pts, float('inf')), batch_size):
+        centers = [pointExplorer.getCenter(pol) for pol in pols]
+        Q = [q for q in centers if q is not None]
+        t1 = time.time()
+        counts = iter(context.count_p_many(Q))
+        t2 = time.time()
+        accepted = 0
+        for pol, q in zip(pols, centers):
+            regionsChecked += 1
+            if verbose:
+                print "checking region", regionsChecked
+            if q is None:
+                emptyRegions.append(pol)
+            else:
+                if verbose:
+                    print "trying with", q
+                Aq, Bq = next(counts)
+                newH = minH + Aq - Ap + Bp - Bq
                 
-                if minH == 0:
-                    print "yay!"
-                    name = "%d_pts%d_holes%d.pts"%(len(pts)+1, minH, int(time.time()) )
-                    pts.append(bestp)
-                    f = open(name, "wb")
-                    pickle.dump(pts, f)
-                    f.close()
-                    return pts
-    print "Checked", regionsChecked, "best result:", minH, "with", bestp
+                if newH <= minH:
+                    if newH < minH and verbose:
+                        print "%d points, %d 6 holes"%(len(pts)+1, newH)
+                    minH = newH
+                    Ap, Bp = Aq, Bq
+                    bestp = q[:]
+                    accepted += 1
+                    
+                    if minH == 0:
+                        if verbose:
+                            print "yay!"
+                        if telemetry is not None:
+                            telemetry.record(minH, len(Q), accepted, t1-t0, t2-t1)
+                            telemetry.sample()
+                        name = "%d_pts%d_holes%d.pts"%(len(pts)+1, minH, int(time.time()) )
+                        pts.append(bestp)
+                        f = open(name, "wb")
+                        pickle.dump(pts, f)
+                        f.close()
+                        return pts
+        if telemetry is not None:
+            telemetry.record(minH, len(Q), accepted, t1-t0, t2-t1)
+        t0 = time.time()
+    if verbose:
+        print "Checked", regionsChecked, "best result:", minH, "with", bestp
+    if telemetry is not None:
+        telemetry.sample()
     return emptyRegions
 
-def hill_climbing(pts = None, tries = 1000, start=10, t=1000000000, run_time=300, days=0, save_interval = 300, speedup='try'):
+class Checkpoint(object):
+
+    """Crash safe record of a point set that changes one point at a time.
+    It is kept in two files: path+'.snapshot', a pickle with the whole set
+    that is replaced atomically every snapshot_interval seconds, and path,
+    an append-only log with one JSON list per line for each change made
+    after the snapshot:
+
+    ["g", generation]: first line, the generation of its snapshot.
+    ["m", i, p]: pts[i] was moved to p.
+    ["a", p]: p was appended to pts.
+    ["h", n, holes]: an improvement, the set of n points has that many holes.
+
+    The log is flushed to disk every sync_interval seconds, so at most that
+    much work is lost in a crash. load_checkpoint recovers the set."""
+
+    def __init__(self, path, sync_interval=5, snapshot_interval=3600):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.snapshot_interval = snapshot_interval
+        self.generation = 0
+        self._log = None
+        if os.path.exists(path+'.snapshot'):
+            f = open(path+'.snapshot', 'rb')
+            self.generation = pickle.load(f)['generation']
+            f.close()
+
+    def snapshot(self, pts):
+        """Writes the whole set and starts a new log."""
+        self.generation += 1
+        tmp = self.path+'.snapshot.tmp'
+        f = open(tmp, 'wb')
+        pickle.dump({'generation': self.generation, 'pts': pts}, f)
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        os.rename(tmp, self.path+'.snapshot')
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.path, 'w')
+        self._write(["g", self.generation])
+        self.sync()
+        self._last_snapshot = time.time()
+
+    def _write(self, record):
+        self._log.write(json.dumps(record, separators=(',', ':'))+'\n')
+
+    def move(self, i, p):
+        self._write(["m", i, p])
+
+    def add(self, p):
+        self._write(["a", p])
+
+    def improvement(self, n, holes):
+        self._write(["h", n, holes])
+
+    def sync(self):
+        """Flushes the log to disk."""
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._last_sync = time.time()
+
+    def tick(self, pts):
+        """Syncs the log or writes a snapshot if it is time to."""
+        now = time.time()
+        if now-self._last_snapshot >= self.snapshot_interval:
+            self.snapshot(pts)
+        elif now-self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def close(self, pts):
+        """Writes a last snapshot and closes the log."""
+        self.snapshot(pts)
+        self._log.close()
+        self._log = None
+
+def load_checkpoint(path):
+    """Returns the point set saved by a Checkpoint at path: its snapshot
+    with the changes in the log applied. An incomplete last line, left by a
+    crash, is ignored."""
+    f = open(path+'.snapshot', 'rb')
+    state = pickle.load(f)
+    f.close()
+    pts = state['pts']
+    if not os.path.exists(path):
+        return pts
+    f = open(path, 'r')
+    try:
+        for k, line in enumerate(f):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if k == 0:
+                #The log was not restarted after the last snapshot
+                if record != ["g", state['generation']]:
+                    break
+            elif record[0] == "m":
+                pts[record[1]] = record[2]
+            elif record[0] == "a":
+                pts.append(record[1])
+    finally:
+        f.close()
+    return pts
+
+def resume(path, **kwargs):
+    """Continues the hill_climbing run with checkpoint path; kwargs are
+    passed to hill_climbing."""
+    return hill_climbing(pts=load_checkpoint(path), checkpoint=path, **kwargs)
+
+def hill_climbing(pts = None, tries = 1000, start=10, t=1000000000, run_time=300, days=0, save_interval = 300, speedup='try',
+                  batch_size=64, verbose=False, telemetry=None, checkpoint=None, sync_interval=5,
+                  snapshot_interval=3600):
+    """Adds points to a set while it can be moved, one point at a time, to a
+    set without empty hexagons. The progress is printed if verbose is True
+    and recorded in telemetry, a heuristics.Telemetry, if given.
+
+    If checkpoint is None, the set is pickled every save_interval seconds
+    to a new file named after the time. Otherwise it is kept in a
+    Checkpoint at that path, with the given sync_interval and
+    snapshot_interval, and the run can be continued with resume."""
     
     if days>0:
         run_time=24*3600*days
@@ -98,17 +257,25 @@ def hill_climbing(pts = None, tries = 1000, start=10, t=1000000000, run_time=300
 #               pts.append([random.randint(-k,k),random.randint(-k,k),random.randint(0,1)])
 #            else:
 #               pts.append([random.randint(-k,k),random.randint(-k,k)]) 
-    minH = holes.count_convex_rholes(pts, 6, speedup=speedup)
-    
-    while minH == 0:
+    while not holes.has_convex_rhole(pts, 6, speedup=speedup):
         pts.append(datastructures.randPoint(t))
-        minH = holes.count_convex_rholes(pts, 6, speedup=speedup)    
+    counter = holes.HoleCounter(pts, 6, speedup=speedup)
+    if telemetry is not None:
+        telemetry.start(counter.count())
+    log = None
+    if checkpoint is not None:
+        log = Checkpoint(checkpoint, sync_interval, snapshot_interval)
+        log.snapshot(pts)
     
     while time.time()-start_time<run_time:
-        minH = holes.count_convex_rholes(pts, 6)
-        print "Starting with %d points, %d holes"%(len(pts), minH)
+        minH = counter.count()
+        startH = minH
+        if verbose:
+            print "Starting with %d points, %d holes"%(len(pts), minH)
         
-        if time.time()-last_save > save_interval:
+        if log is not None:
+            log.tick(pts)
+        elif time.time()-last_save > save_interval:
             Id = str(int(time.time()))+"_%d_pts_%d_h"%(len(pts), minH)
             f = open(Id, "w")
             pickle.dump(pts, f)
@@ -116,40 +283,68 @@ def hill_climbing(pts = None, tries = 1000, start=10, t=1000000000, run_time=300
             last_save = time.time()
        
         idx = random.randint(0,len(pts)-1)
-        p = pts.pop(idx)
-        Ap, Bp = holes.count_convex_rholes_p(p, pts, 6, speedup=speedup)
+        p = pts[idx]
+        context = holes.HoleContext(pts[:idx]+pts[idx+1:], 6, speedup=speedup)
+        Ap, Bp = context.count_p(p)
         
-        for pol in pointExplorer.getRandomWalkDFS(p, pts, tries):
-            q = pointExplorer.getCenter(pol)
-            if q is None:
-                continue
-            q = [int(q[0]), int(q[1])]
+        t0 = time.time()
+        for pols in _batches(pointExplorer.getRandomWalkDFS(p, pts, tries), batch_size):
+            centers = [pointExplorer.getCenter(pol) for pol in pols]
+            Q = [[int(q[0]), int(q[1])] for q in centers if q is not None]
+            t1 = time.time()
+            counts = context.count_p_many(Q)
+            t2 = time.time()
+            accepted = 0
 #            pts[idxp] = q
-            Aq, Bq = holes.count_convex_rholes_p(q, pts, 6, speedup=speedup)
-            newH = minH + Aq - Ap + Bp - Bq
-            
-            if newH <= minH:
-                if newH < minH:
-                    print "%d points, %d 6 holes"%(len(pts)+1, newH)
-                minH = newH
-                Ap, Bp = Aq, Bq
-                p = q[:]
+            for q, (Aq, Bq) in zip(Q, counts):
+                newH = minH + Aq - Ap + Bp - Bq
                 
-                if minH == 0:
-                    print "yay!"
-                    break
-        pts.append(p)
+                if newH <= minH:
+                    if newH < minH and verbose:
+                        print "%d points, %d 6 holes"%(len(pts), newH)
+                    minH = newH
+                    Ap, Bp = Aq, Bq
+                    p = q[:]
+                    accepted += 1
+                    
+                    if minH == 0:
+                        if verbose:
+                            print "yay!"
+                        break
+            if telemetry is not None:
+                telemetry.record(minH, len(Q), accepted, t1-t0, t2-t1)
+            if minH == 0:
+                break
+            t0 = time.time()
+        if p != pts[idx]:
+            counter.propose(idx, p)
+            counter.commit()
+            pts[idx] = p
+            if log is not None:
+                log.move(idx, p)
+                if minH < startH:
+                    log.improvement(len(pts), minH)
         if minH == 0:
            # return pts
             Id = str(int(time.time()))+"_%d_pts_%d_h"%(len(pts), minH)
             f = open(Id, "w")
             pickle.dump(pts, f)
             f.close()
-            print pts
+            if verbose:
+                print pts
             
             pts.append(datastructures.randPoint(t))
+            counter = holes.HoleCounter(pts, 6, speedup=speedup)
+            if log is not None:
+                log.add(pts[-1])
                 
-    print "Done!"
+    if verbose:
+        print "Done!"
+    if telemetry is not None:
+        telemetry.sample()
+    if log is not None:
+        log.close(pts)
+        return pts
     Id = str(int(time.time()))+"_%d_pts_%d_h"%(len(pts), minH)
     f = open(Id, "w")
     pickle.dump(pts, f)
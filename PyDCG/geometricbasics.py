@@ -190,4 +190,72 @@ def general_position(pts, report=False):
         for x in res:
             if not x:
                 return False
-        return True
\ No newline at end of file
+        return True
+
+
+def _signed_directions(p, points):
+    """Returns the ccw order, starting at the positive x axis, of the
+       directions from p to each points[j] (coded as 2j) and their
+       opposites (2j+1), or None if p is one of the points or is collinear
+       with two of them."""
+    dirs = []
+    for j, q in enumerate(points):
+        dx, dy = q[0] - p[0], q[1] - p[1]
+        if dx == 0 and dy == 0:
+            return None
+        dirs.append((dx, dy, 2*j))
+        dirs.append((-dx, -dy, 2*j + 1))
+
+    def upper(d):
+        return d[1] > 0 or (d[1] == 0 and d[0] > 0)
+
+    def cmp_dirs(d, e):
+        ud, ue = upper(d), upper(e)
+        if ud != ue:
+            return -1 if ud else 1
+        return cmp(d[1]*e[0], d[0]*e[1])
+
+    dirs.sort(cmp_dirs)
+    for d, e in zip(dirs, dirs[1:]):
+        if upper(d) == upper(e) and d[0]*e[1] == d[1]*e[0]:
+            return None
+    return [d[2] for d in dirs]
+
+def general_position_p_py(p, points):
+    """Python version of general_position_p"""
+    return _signed_directions(p, points) is not None
+
+def general_position_p(p, points, speedup=True):
+    """Returns True if p is not one of `points` and is not collinear with
+       two of them, in O(n log n) time."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return general_position_p_py(p, points)
+    try:
+        return gbCpp.general_position_p(p, points)
+    except OverflowError:
+        return general_position_p_py(p, points)
+
+def preserves_order_type_py(p, q, points):
+    """Python version of preserves_order_type"""
+    sp = _signed_directions(p, points)
+    sq = _signed_directions(q, points)
+    if sp is None or sq is None:
+        return False
+    if not sp:
+        return True
+    r = sq.index(sp[0])
+    return sp == sq[r:] + sq[:r]
+
+def preserves_order_type(p, q, points, speedup=True):
+    """Returns True if moving a point from p to q, with `points` the rest of
+       the set, keeps the order type; that is, if no line spanned by two of
+       `points` crosses or touches the segment pq. The orientations of the
+       triples with p are given by the cyclic order of the directions from p
+       to `points` and their opposites, so it compares those orders around p
+       and q in O(n log n) time."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return preserves_order_type_py(p, q, points)
+    try:
+        return gbCpp.preserves_order_type(p, q, points)
+    except OverflowError:
+        return preserves_order_type_py(p, q, points)
\ No newline at end of file
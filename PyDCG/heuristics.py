@@ -20,8 +20,13 @@
 import random
 import math
 import time
+import json
+import collections
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import crossing
-#import holes
+import holes
+import geometricbasics
 
 def kirkpatrick_cooling(start_temp,alpha):
     T=start_temp
@@ -67,6 +72,209 @@ def P(vcurrent,vnew,T,minimize=True):
     return False
     
     
+class Objective(object):
+
+    """Objective function of a point set that is evaluated one move at a time.
+       The heuristics use it through:
+
+       init(pts): starts following pts and returns its value.
+       delta(i, p): returns the change in the value if pts[i] is moved to p.
+       peek(i, p): same as delta, but the move is not remembered and pts is
+           not modified, so several calls can run at the same time.
+       accept(): moves pts[i] (in place) to the p of the last call to delta.
+       reject(): discards the last call to delta.
+
+       pts must only be modified through accept while it is followed.
+       This class recounts the whole moved set with f, so any function of
+       a point set can be used; the subclasses only pay the cost of the
+       moved point. Objectives are pickled to be sent to other processes, so
+       f should be a module level function.
+
+       If order_type is True, f only depends on the order type of the set:
+       moves that keep it are not evaluated and their change is 0. delta
+       counts them in neutral; peek does not, so that it stays safe to call
+       from several threads."""
+
+    def __init__(self, f=None, order_type=False, speedup=True):
+        self.f = f
+        self.order_type = order_type
+        self.speedup = speedup
+        self.neutral = 0
+        self.pts = None
+        self.value = None
+        self._move = None
+
+    def count(self, pts):
+        return self.f(pts)
+
+    def init(self, pts):
+        self.pts = pts
+        self.value = self.count(pts)
+        self.neutral = 0
+        self._move = None
+        return self.value
+
+    def skips(self, i, p):
+        """Returns True if moving pts[i] to p is not evaluated because it
+        keeps the order type."""
+        return self.order_type and geometricbasics.preserves_order_type(
+            self.pts[i], p, self.pts[:i] + self.pts[i+1:], self.speedup)
+
+    def peek(self, i, p):
+        if self.skips(i, p):
+            return 0
+        return self._peek(i, p)
+
+    def _peek(self, i, p):
+        moved = self.pts[:]
+        moved[i] = p
+        return self.count(moved) - self.value
+
+    def delta(self, i, p):
+        if self.skips(i, p):
+            self.neutral += 1
+            d = 0
+        else:
+            d = self._peek(i, p)
+        self._move = (i, p, self.value + d)
+        return d
+
+    def accept(self):
+        i, p, value = self._move
+        self.pts[i][:] = p
+        self.value = value
+        self._move = None
+
+    def reject(self):
+        self._move = None
+
+def _objective(f):
+    """Returns f as an Objective, wrapping plain functions."""
+    if isinstance(f, Objective):
+        return f
+    return Objective(f)
+
+class _PointObjective(Objective):
+
+    """Objectives for which the (A, B) counts of a point p not in S, given
+       by count_p(p, S), satisfy f(S + [p]) = f(S) + A - B. Moving pts[i]
+       from a to b changes the value by (A_b - B_b) - (A_a - B_a), computed
+       on pts without pts[i].
+
+       count_p only works for points in general position, so the moved set
+       is recounted while pts is not in general position or if b is
+       collinear with two other points. Subclasses with another way of
+       computing the change of a move in general position override
+       _point_delta instead of count_p."""
+
+    def init(self, pts):
+        self._general = _general_position(pts, self.speedup)
+        return Objective.init(self, pts)
+
+    def _peek(self, i, p):
+        others = self.pts[:i] + self.pts[i+1:]
+        if not (self._general and
+                geometricbasics.general_position_p(p, others, self.speedup)):
+            return Objective._peek(self, i, p)
+        return self._point_delta(i, p, others)
+
+    def _point_delta(self, i, p, others):
+        Aa, Ba = self.count_p(self.pts[i], others)
+        Ab, Bb = self.count_p(p, others)
+        return (Ab - Bb) - (Aa - Ba)
+
+    def accept(self):
+        i, p = self._move[:2]
+        if self._general:
+            others = self.pts[:i] + self.pts[i+1:]
+            self._general = geometricbasics.general_position_p(p, others,
+                                                               self.speedup)
+            Objective.accept(self)
+        else:
+            Objective.accept(self)
+            self._general = _general_position(self.pts, self.speedup)
+
+def _general_position(pts, speedup=True):
+    """Returns True if no point of pts is repeated or collinear with two
+    others."""
+    for i in xrange(len(pts)):
+        if not geometricbasics.general_position_p(pts[i], pts[:i] + pts[i+1:],
+                                                  speedup):
+            return False
+    return True
+
+class CrossingsObjective(_PointObjective):
+
+    """Rectilinear crossing number. Only the crossings of the edges at the
+       moved point change, so while pts is in general position the change
+       of a move is taken from a crossing.CrossingCounter, which counts them
+       in O(n log n) time instead of recounting the moved set."""
+
+    def __init__(self, speedup=True):
+        _PointObjective.__init__(self, order_type=True, speedup=speedup)
+        self._counter = None
+
+    def count(self, pts):
+        return crossing.count_crossings(pts, self.speedup)
+
+    def init(self, pts):
+        value = _PointObjective.init(self, pts)
+        self._counter = None
+        if self._general:
+            self._counter = crossing.CrossingCounter(pts, self.speedup)
+        return value
+
+    def _point_delta(self, i, p, others):
+        return self._counter.change(i, p)
+
+    def accept(self):
+        i, p = self._move[:2]
+        _PointObjective.accept(self)
+        if not self._general:
+            self._counter = None
+        elif self._counter is None:
+            self._counter = crossing.CrossingCounter(self.pts, self.speedup)
+        else:
+            self._counter.move(i, p)
+
+class EmptyTrianglesObjective(_PointObjective):
+
+    """Number of empty triangles."""
+
+    def __init__(self, speedup=True):
+        _PointObjective.__init__(self, order_type=True, speedup=speedup)
+
+    def count(self, pts):
+        return holes.countEmptyTriangs(pts, self.speedup)
+
+    def count_p(self, p, pts):
+        return holes.count_empty_triangles_p(p, pts, self.speedup)
+
+class ConvexHolesObjective(_PointObjective):
+
+    """Number of convex r-holes (monochromatic ones if mono is True).
+       For r=3 the (monochromatic) empty triangles are counted."""
+
+    def __init__(self, r, mono=False, speedup=True):
+        _PointObjective.__init__(self, order_type=True, speedup=speedup)
+        self.r = r
+        self.mono = mono
+
+    def count(self, pts):
+        if self.r == 3 and self.mono:
+            return sum(holes.count_mono_rholes_by_color(pts, 3, self.speedup).values())
+        if self.r == 3:
+            return holes.countEmptyTriangs(pts, self.speedup)
+        return holes.count_convex_rholes(pts, self.r, self.mono, self.speedup)
+
+    def count_p(self, p, pts):
+        if self.r == 3 and self.mono:
+            return holes.count_emptymon_triangles_p(p, pts, self.speedup)
+        if self.r == 3:
+            return holes.count_empty_triangles_p(p, pts, self.speedup)
+        return holes.count_convex_rholes_p(p, pts, self.r, self.mono,
+                                           self.speedup)
+
 #Hay un error con holes puse f=[] pero queria poner countEmptyTriangs
 #usr/lib/python2.7/site-packages/PyDCG/holes.py in <module>()
 #    396     return (A,B)
@@ -77,86 +285,391 @@ def P(vcurrent,vnew,T,minimize=True):
 #
 #AttributeError: 'module' object has no attribute 'report_empty_triangles_p'
 
+class Telemetry(object):
+
+    """Collects the progress of a search. The heuristics call record after
+       evaluating moves, which only updates a few counters, and every
+       interval seconds a sample is taken. A sample is a dict with:
+
+       time: seconds since the start of the search.
+       evaluations: number of moves evaluated so far.
+       evaluations_per_sec, acceptance_rate: since the previous sample.
+       move_time, objective_time: seconds spent so far generating the moves
+           and evaluating them.
+       value, best: the current value and the best one so far.
+       temperature: the last temperature, for simulated annealing.
+
+       The last size samples are kept in samples; each one is also passed to
+       callback and appended as a line of JSON to the file path, if given."""
+
+    def __init__(self, interval=1.0, size=1000, callback=None, path=None):
+        self.interval = interval
+        self.samples = collections.deque(maxlen=size)
+        self.callback = callback
+        self.path = path
+        self.start(None)
+
+    def start(self, value, minimize=True):
+        """Restarts the counters for a search that starts with value."""
+        self.minimize = minimize
+        self.value = self.best = value
+        self.temperature = None
+        self.evaluations = self.accepted = 0
+        self.move_time = self.objective_time = 0.0
+        self._start = self._last = time.time()
+        self._last_evaluations = self._last_accepted = 0
+
+    def record(self, value, evaluations=1, accepted=0, move_time=0.0,
+               objective_time=0.0, temperature=None):
+        """Adds evaluations moves, of which accepted were accepted, after
+        which the value of the search is value."""
+        self.value = value
+        if self.best is None or _better(value, self.best, self.minimize):
+            self.best = value
+        self.evaluations += evaluations
+        self.accepted += accepted
+        self.move_time += move_time
+        self.objective_time += objective_time
+        if temperature is not None:
+            self.temperature = temperature
+        now = time.time()
+        if now-self._last >= self.interval:
+            self.sample(now)
+
+    def sample(self, now=None):
+        """Takes a sample and returns it."""
+        if now is None:
+            now = time.time()
+        evaluations = self.evaluations-self._last_evaluations
+        elapsed = now-self._last
+        s = {'time': now-self._start,
+             'evaluations': self.evaluations,
+             'evaluations_per_sec': evaluations/elapsed if elapsed > 0 else 0.0,
+             'acceptance_rate': (self.accepted-self._last_accepted)/float(evaluations)
+                                if evaluations > 0 else 0.0,
+             'move_time': self.move_time,
+             'objective_time': self.objective_time,
+             'value': self.value,
+             'best': self.best,
+             'temperature': self.temperature}
+        self._last = now
+        self._last_evaluations = self.evaluations
+        self._last_accepted = self.accepted
+        self.samples.append(s)
+        if self.callback is not None:
+            self.callback(s)
+        if self.path is not None:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(s)+'\n')
+        return s
+
+    def export(self, path):
+        """Writes the kept samples to path, one JSON object per line."""
+        with open(path, 'w') as f:
+            for s in self.samples:
+                f.write(json.dumps(s)+'\n')
+
 def simmulated_annealing(n=10,pts=[],run_time=10,k=10000000,k_f=kirkpatrick_cooling(10000000,0.999),
                          f=[],T=kirkpatrick_cooling(100,0.999),rand_move=rand_move,minimize=True,
-                         print_function=None):
-    """Implementation of a simulated annealing algorithm to search for good point sets."""
+                         print_function=None,verbose=False,telemetry=None):
+    """Implementation of a simulated annealing algorithm to search for good point sets.
+    f is either a function of the point set or an Objective; with the latter
+    only the change caused by each move is computed. Every new value is
+    passed to print_function, or printed if verbose is True. The progress
+    is recorded in telemetry, a Telemetry, if given."""
 
     for i in range(len(pts),n):
         pts.append([random.randint(-k,k),random.randint(-k,k)])
         
     n=len(pts)
     start_time=time.time()
-    vcurrent=f(pts)
+    obj=_objective(f)
+    vcurrent=obj.init(pts)
+    if telemetry is not None:
+        telemetry.start(vcurrent,minimize)
     while time.time()-start_time<run_time:
+        t0=time.time()
         idxp=random.randint(0,n-1)
-        p=pts[idxp]
-        q=p[:]
-        rand_move(p,int(k_f.next()))
-        vnew=f(pts)
-        if P(vcurrent,vnew,T.next(),minimize=minimize):
+        q=pts[idxp][:]
+        rand_move(q,int(k_f.next()))
+        t1=time.time()
+        vnew=vcurrent+obj.delta(idxp,q)
+        t2=time.time()
+        temp=T.next()
+        accepted=P(vcurrent,vnew,temp,minimize=minimize)
+        if accepted:
+            obj.accept()
             if vnew!=vcurrent:
-                if print_function==None:
-                    print (vnew)
-                else:
+                if print_function!=None:
                     print_function(vnew)
+                elif verbose:
+                    print (vnew)
             vcurrent=vnew
         else:
-            p[0]=q[0]
-            p[1]=q[1]
-        
+            obj.reject()
+        if telemetry is not None:
+            telemetry.record(vcurrent,1,accepted,t1-t0,t2-t1,temp)
+    
+    if telemetry is not None:
+        telemetry.sample()
     return pts
 
 
 
 
-def greedy(n,pts=[],k=1000000,run_time=10,f=crossing.count_crossings,t=1000000,minimize=True,cmp_f=None):
+def greedy(n,pts=[],k=1000000,run_time=10,f=crossing.count_crossings,t=1000000,minimize=True,cmp_f=None,
+           workers=1,use_processes=False,batch_time=0.05,verbose=False,telemetry=None):
     """A greedy strategy. It moves one point at a time if the set improves or states
     the same it keeps the point at its new locaction.
     It starts with a random point on an kxk grid. The t controls the median
-    of the movement of the point. """
+    of the movement of the point. f is either a function of the point set or
+    an Objective; with the latter only the change caused by each move is
+    computed. On ties, cmp_f(new_pts,pts) decides whether the move is kept.
+    
+    If workers>1, each step evaluates a batch of random moves in a pool of
+    workers threads (or processes if use_processes is True) and applies the
+    best one. Threads only run at the same time while f is in native code
+    that releases the GIL, as the C++ counts do; with processes f must be
+    picklable. The size of the batches is adjusted so that evaluating one
+    takes about batch_time seconds.
+    
+    The improvements are printed if verbose is True, and the progress is
+    recorded in telemetry, a Telemetry, if given."""
     
     for i in range(n-len(pts)):
         pts.append([random.randint(-k,k),random.randint(-k,k)])
         
     start_time=time.time()
-    current_val=f(pts)
-    print current_val
-    while time.time()-start_time<run_time:
-        idxp=random.randint(0,n-1)
-        p=pts[idxp]
-        q=p[:]
-        rand_move(p,t)
-        temp_val=f(pts)
+    obj=_objective(f)
+    current_val=obj.init(pts)
+    if verbose:
+        print current_val
+    if telemetry is not None:
+        telemetry.start(current_val,minimize)
+    if workers>1:
+        _greedy_batches(n,pts,obj,start_time,run_time,t,minimize,cmp_f,
+                        workers,use_processes,batch_time,verbose,telemetry)
+    else:
+        while time.time()-start_time<run_time:
+            t0=time.time()
+            idxp=random.randint(0,n-1)
+            q=pts[idxp][:]
+            rand_move(q,t)
+            t1=time.time()
+            d=obj.delta(idxp,q)
+            t2=time.time()
+            if not minimize:
+                d=-d
         
-        if minimize:
-            if temp_val<=current_val:
-                if temp_val<current_val:
-                    current_val=temp_val
-                    print current_val
-                elif cmp_f!=None:
-                    prev_pts=[x[:] for x in pts]
-                    prev_pts[idxp]=q
-                    D=cmp_f(pts,prev_pts)
-                    if D>-1:
-                        pts[idxp]=q
-            else:
-                pts[idxp]=q
-        else:
-            if temp_val>=current_val:
-                if temp_val>current_val:
-                    current_val=temp_val
+            accepted=True
+            if d<0:
+                obj.accept()
+                current_val=obj.value
+                if verbose:
                     print current_val
-                elif cmp_f!=None:
-                    prev_pts=[x[:] for x in pts]
-                    prev_pts[idxp]=q
-                    D=cmp_f(pts,prev_pts)
-                    if D<1:
-                        pts[idxp]=q
+            elif d==0 and _keep_tie(pts,idxp,q,minimize,cmp_f):
+                obj.accept()
             else:
-                pts[idxp]=q
-                
+                obj.reject()
+                accepted=False
+            if telemetry is not None:
+                telemetry.record(obj.value,1,accepted,t1-t0,t2-t1)
+    
+    if telemetry is not None:
+        telemetry.sample()
     return pts
+
+def _keep_tie(pts,idxp,q,minimize,cmp_f):
+    """Decides with cmp_f whether greedy keeps a move that does not change
+    the value."""
+    if cmp_f==None:
+        return True
+    new_pts=pts[:]
+    new_pts[idxp]=q
+    D=cmp_f(new_pts,pts)
+    if minimize:
+        return D<=-1
+    return D>=1
+
+def _peek_moves(args):
+    """Returns obj.peek for each move (i, p) of a list, and the number of
+    them that obj skips."""
+    obj,moves=args
+    ds=[]
+    neutral=0
+    for i,p in moves:
+        if obj.skips(i,p):
+            ds.append(0)
+            neutral+=1
+        else:
+            ds.append(obj._peek(i,p))
+    return ds,neutral
+
+def _greedy_batches(n,pts,obj,start_time,run_time,t,minimize,cmp_f,
+                    workers,use_processes,batch_time,verbose,telemetry):
+    """The batched version of greedy."""
+    if use_processes:
+        pool=multiprocessing.Pool(workers)
+    else:
+        pool=ThreadPool(workers)
+    B=workers
+    try:
+        while time.time()-start_time<run_time:
+            batch_start=time.time()
+            moves=[]
+            for j in range(B):
+                idxp=random.randint(0,n-1)
+                q=pts[idxp][:]
+                rand_move(q,t)
+                moves.append((idxp,q))
+            moves_time=time.time()-batch_start
+            batch_start=time.time()
+            results=pool.map(_peek_moves,[(obj,moves[j::workers]) for j in range(workers)],
+                             chunksize=1)
+            elapsed=time.time()-batch_start
+            #The workers may be other processes, so the skipped moves are counted here
+            neutral=obj.neutral+sum(r[1] for r in results)
+            candidates=[]
+            for j in range(workers):
+                candidates.extend(zip(results[j][0],moves[j::workers]))
+            if not minimize:
+                candidates=[(-e,move) for e,move in candidates]
+            
+            d,(idxp,q)=min(candidates)
+            if d==0:
+                idxp,q=random.choice([move for e,move in candidates if e==0])
+            accepted=d<0 or (d==0 and _keep_tie(pts,idxp,q,minimize,cmp_f))
+            if accepted:
+                obj.delta(idxp,q)
+                obj.accept()
+                if d<0 and verbose:
+                    print obj.value
+            obj.neutral=neutral
+            if telemetry is not None:
+                telemetry.record(obj.value,len(moves),accepted,moves_time,elapsed)
+            
+            if elapsed>0:
+                B=max(workers,min(4*B,int(B*batch_time/elapsed)))
+    finally:
+        pool.terminate()
+        pool.join()
+
+def _better(v, w, minimize=True):
+    if minimize:
+        return v < w
+    return v > w
+
+def _schedule(T):
+    """Returns T as the (start_temp, alpha) pair of a kirkpatrick_cooling
+    schedule; a single number is a fixed temperature."""
+    if isinstance(T, (tuple, list)):
+        return tuple(T)
+    return (T, 1)
+
+def _tempering_chain(args):
+    """Runs one chain of parallel_tempering for run_time seconds. Returns
+    the last set and its value, the best set and value of the round and the
+    number of steps done, which is the position of the chain in its
+    schedules."""
+    pts, f, T, k_f, steps, rand_move, minimize, run_time, seed = args
+    random.seed(seed)
+    obj = _objective(f)
+    vcurrent = obj.init(pts)
+    best_pts, best_val = [x[:] for x in pts], vcurrent
+    T = kirkpatrick_cooling(T[0]*T[1]**steps, T[1])
+    k_f = kirkpatrick_cooling(k_f[0]*k_f[1]**steps, k_f[1])
+    start_time = time.time()
+    while time.time()-start_time < run_time:
+        idxp = random.randint(0, len(pts)-1)
+        q = pts[idxp][:]
+        rand_move(q, int(k_f.next()))
+        vnew = vcurrent+obj.delta(idxp, q)
+        steps += 1
+        if P(vcurrent, vnew, T.next(), minimize=minimize):
+            obj.accept()
+            vcurrent = vnew
+            if _better(vcurrent, best_val, minimize):
+                best_pts, best_val = [x[:] for x in pts], vcurrent
+        else:
+            obj.reject()
+    return pts, vcurrent, best_pts, best_val, steps
+
+def parallel_tempering(n=10, pts=[], run_time=10, k=10000000, f=crossing.count_crossings,
+                       temperatures=(1, 3, 10, 30, 100), k_f=(10000000, 0.999),
+                       rand_move=rand_move, minimize=True, exchange_interval=1,
+                       processes=None, print_function=None, verbose=False):
+    """Simulated annealing with one chain per entry of temperatures, run in
+    a pool of processes (one per core if processes is None). An entry is a
+    fixed temperature or the (start_temp, alpha) pair of a kirkpatrick_cooling
+    schedule; k_f is the pair of the schedule of the size of the moves.
+
+    Every exchange_interval seconds the chains stop, the sets of neighbouring
+    chains in temperatures are swapped with the replica exchange probability
+    min(1, exp((1/T_i - 1/T_j)(v_i - v_j))), and the coldest chain continues
+    from the best set found so far if its own is worse. If there are more
+    chains than processes each round is shortened so that run_time is kept.
+    f and rand_move are sent to the processes, so they must be picklable
+    (module level functions or Objectives).
+
+    Every new best value is passed to print_function, or printed if verbose
+    is True. Returns (best_pts, best_val, chains), where chains has the best
+    set and value found by each chain."""
+
+    for i in range(len(pts),n):
+        pts.append([random.randint(-k,k),random.randint(-k,k)])
+
+    schedules = [_schedule(T) for T in temperatures]
+    K = len(schedules)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    rounds = int(math.ceil(K/float(processes)))
+    cur = [[x[:] for x in pts] for i in range(K)]
+    vals = [None]*K
+    steps = [0]*K
+    chains = [(None, None)]*K
+    best_pts, best_val = None, None
+    parity = 0
+
+    start_time = time.time()
+    pool = multiprocessing.Pool(processes)
+    try:
+        while True:
+            remaining = run_time-(time.time()-start_time)
+            if remaining <= 0:
+                break
+            round_time = min(exchange_interval, remaining)/rounds
+            args = [(cur[i], f, schedules[i], k_f, steps[i], rand_move, minimize,
+                     round_time, random.getrandbits(64)) for i in range(K)]
+            results = pool.map(_tempering_chain, args, chunksize=1)
+            for i, (c, v, bp, bv, s) in enumerate(results):
+                cur[i], vals[i], steps[i] = c, v, s
+                if chains[i][0] is None or _better(bv, chains[i][1], minimize):
+                    chains[i] = (bp, bv)
+                if best_pts is None or _better(bv, best_val, minimize):
+                    best_pts, best_val = bp, bv
+                    if print_function != None:
+                        print_function(best_val)
+                    elif verbose:
+                        print (best_val)
+
+            temps = [T0*alpha**s for (T0, alpha), s in zip(schedules, steps)]
+            for i in range(parity, K-1, 2):
+                d = (1.0/temps[i]-1.0/temps[i+1])*(vals[i]-vals[i+1])
+                if not minimize:
+                    d = -d
+                if d >= 0 or random.random() < math.exp(d):
+                    cur[i], cur[i+1] = cur[i+1], cur[i]
+                    vals[i], vals[i+1] = vals[i+1], vals[i]
+            parity = 1-parity
+
+            coldest = min(range(K), key=lambda i: temps[i])
+            if _better(best_val, vals[coldest], minimize):
+                cur[coldest], vals[coldest] = [x[:] for x in best_pts], best_val
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return best_pts, best_val, chains
     
 #def simmulated_annealing_onepoint(n=10,pts=[],run_time=10,k=10000000,k_f=kirkpatrick_cooling(10000000,0.99),
 #                         t=1000000,f=geometricbasicspy.count_convex_rholes,g=geometricbasicspy.count_convex_rholes_difference,
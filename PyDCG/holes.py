@@ -20,23 +20,31 @@
 from math import sqrt
 from geometricbasics import sort_around_point, turn
 from collections import deque
+from array import array
 import utilities
 from utilities import cppWrapper
 
 if utilities.__load_extensions:
     import holesCpp
 
-def count_four_islands(pts,colored=False):
+def count_four_islands(pts,colored=False,speedup=True,threads=0):
     """Counts the number of four-islands in a point set."""
-    islands=(count_non_convex_four_islands(pts,colored=colored)+
-                count_convex_rholes(pts,4,mono=colored))
-    return islands
+    return HoleIndex(pts,speedup).count_four_islands(colored=colored,threads=threads)
 
 def count_mono_four_islands(pts):
     return count_four_islands(pts,colored=True)
 
-def count_non_convex_four_islands(pts,colored=False):
-    """Counts the number of non convex four islands."""
+def count_non_convex_four_islands(pts,colored=False,speedup=True,threads=0):
+    """Counts the number of non convex four islands. On the C++ side
+    the points are split among threads (one per core if threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return count_non_convex_four_islands_py(pts,colored)
+    try:
+        return holesCpp.count_non_convex_four_islands(pts,colored,threads)
+    except OverflowError:
+        return count_non_convex_four_islands_py(pts,colored)
+
+def count_non_convex_four_islands_py(pts,colored=False):
     tpts=[[0,0] for i in range(len(pts)-1)]
     non_convex=0
     for p in pts:
@@ -48,7 +56,15 @@ def count_non_convex_four_islands(pts,colored=False):
         non_convex=non_convex+count_non_convex_four_islands_p(p,tpts,colored=colored)
     return non_convex
 
-def count_emptymon_triangles_p(p,points):
+def count_emptymon_triangles_p(p,points,speedup=True):
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return count_emptymon_triangles_p_py(p,points)
+    try:
+        return holesCpp.count_emptymon_triangles_p(p,points)
+    except OverflowError:
+        return count_emptymon_triangles_p_py(p,points)
+
+def count_emptymon_triangles_p_py(p,points):
     """Returns (A,B). Where A is the number of monochromatic empty triangles.
         that contain p as a vertex and B the number of triangles
         that contain only contain p in their interior."""
@@ -116,20 +132,27 @@ def count_non_convex_four_islands_p(p,points,colored=False):
     return B
 
 
-def count_four_holes(pts,colored=False):
+def count_four_holes(pts,colored=False,speedup=True,threads=0):
     """counts the number of 4-holes in a point set"""
-    convex=count_convex_rholes(pts,4,mono=colored)
-    non_convex=count_non_convex_four_holes(pts,colored=colored)
-    return convex+non_convex
+    return HoleIndex(pts,speedup).count_four_holes(colored=colored,threads=threads)
 
 def count_mono_four_holes(pts):
     """Counts the number of monochromatic four holes
         in a point set"""
     return count_four_holes(pts,colored=True)
 
-def count_non_convex_four_holes(pts,colored=False):
+def count_non_convex_four_holes(pts,colored=False,speedup=True,threads=0):
     """Counts the number of non-convex four holes
-        in a point set"""
+        in a point set. On the C++ side the points are split
+        among threads (one per core if threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return count_non_convex_four_holes_py(pts,colored)
+    try:
+        return holesCpp.count_non_convex_four_holes(pts,colored,threads)
+    except OverflowError:
+        return count_non_convex_four_holes_py(pts,colored)
+
+def count_non_convex_four_holes_py(pts,colored=False):
     temp_pts=[[0,0]for x in range(len(pts)-1)]
     non_convex=0
     for i in range(len(pts)):
@@ -375,7 +398,18 @@ def report_empty_triangles_p_py(p,points):
         B.append([sorted_points[a],sorted_points[b],sorted_points[c]])
     return (A,B)
                       
-def report_empty_triangles_p(p, points, speedup=True):
+def report_empty_triangles_p(p, points, speedup=True, as_indices=False):
+    """If as_indices is True, A and B are returned as (m, 3) int32 NumPy
+    arrays of indices into points, where the index len(points) stands for p."""
+    if as_indices:
+        if utilities.__config['PURE_PYTHON'] or not speedup:
+            return _report_empty_triangles_p_indices_py(p, points)
+        try:
+            A, B = holesCpp.report_empty_triangles_p_indices(p, points)
+            return (utilities.buffer_to_array(A, 'int32', 3),
+                    utilities.buffer_to_array(B, 'int32', 3))
+        except OverflowError:
+            return _report_empty_triangles_p_indices_py(p, points)
     if utilities.__config['PURE_PYTHON'] or not speedup:
         return report_empty_triangles_p_py(p, points)
     try:
@@ -383,6 +417,18 @@ def report_empty_triangles_p(p, points, speedup=True):
     except OverflowError:
         return report_empty_triangles_p_py(p, points)
 
+def _report_empty_triangles_p_indices_py(p, points):
+    A, B = report_empty_triangles_p_py(p, points)
+    return (_polygons_to_indices(A, points + [p], 3),
+            _polygons_to_indices(B, points, 3))
+
+def _polygons_to_indices(polygons, points, r):
+    """Replaces each vertex of the polygons by its index in points and
+    returns them as an (m, r) int32 array."""
+    D = utilities.points_index(points)
+    return utilities.list_to_array([D[q[0], q[1]] for pol in polygons for q in pol],
+                                   'int32', r)
+
     
 def count_empty_triangles_pb(p,points):
     """Returns (A,B). Where A is the number of empty triangles.
@@ -786,14 +832,73 @@ def count_convex_rholes_py(points,r,mono=False):
                             
     return total
     
-def count_convex_rholes(points, r, mono=False, speedup=True):
+def count_convex_rholes(points, r, mono=False, speedup=True, low_memory=False):
+    """If low_memory is True, the C++ side keeps the visibility graph of
+    only one point at a time (see estimate_memory)."""
     if not utilities.__load_extensions or not speedup:
         return count_convex_rholes_py(points, r, mono)
     try:
-        return holesCpp.count_convex_rholes(points, r, mono)
+        return holesCpp.count_convex_rholes(points, r, mono, low_memory)
     except OverflowError:
         return count_convex_rholes_py(points, r, mono)
 
+def find_convex_rhole(points, r, mono=False, speedup=True, threads=1):
+    """Returns the list of indices into points of the vertices of an r-hole
+    (r >= 3, monochromatic if mono is True), or None if points have none.
+    Unlike count_convex_rholes, the C++ version stops at the first r-hole
+    it finds, trying the leftmost points first. It can split the points
+    among threads (one per core if threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _find_convex_rhole_py(points, r, mono)
+    try:
+        return holesCpp.find_convex_rhole(points, r, mono, threads)
+    except OverflowError:
+        return _find_convex_rhole_py(points, r, mono)
+
+def _find_convex_rhole_py(points, r, mono=False):
+    D = utilities.points_index(points)
+    for pol in _rholes_py(points, r):
+        if not mono or len(set(_color(q) for q in pol)) == 1:
+            return [D[q[0], q[1]] for q in pol]
+    return None
+
+def has_convex_rhole(points, r, mono=False, speedup=True, threads=1):
+    """True if points have an r-hole (see find_convex_rhole)."""
+    return find_convex_rhole(points, r, mono, speedup, threads) is not None
+
+def largest_convex_hole(points, mono=False, speedup=True, threads=0):
+    """Returns a pair (k, idx) where k is the size of the largest empty
+    convex polygon of points (monochromatic if mono is True) and idx the
+    indices into points of its vertices; (0, []) if there is none. The
+    C++ version finds it in a single pass, as count_convex_rholes does
+    for a fixed r, splitting the points among threads (one per core if
+    threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _largest_convex_hole_py(points, mono)
+    try:
+        return holesCpp.largest_convex_hole(points, mono, threads)
+    except OverflowError:
+        return _largest_convex_hole_py(points, mono)
+
+def _largest_convex_hole_py(points, mono=False):
+    k, hole = 0, []
+    r = 3
+    while r <= len(points):
+        found = _find_convex_rhole_py(points, r, mono)
+        if found is None:
+            break
+        k, hole = r, found
+        r += 1
+    return k, hole
+
+def estimate_memory(points, r, low_memory=False):
+    """Estimates the peak memory, in bytes, that count_convex_rholes uses
+    on the C++ side for points and r. It takes about as long as counting
+    the empty triangles of points."""
+    if not utilities.__load_extensions:
+        raise ImportError("The C++ extensions are required to estimate their memory usage.")
+    return holesCpp.estimate_memory(points, r, low_memory)
+
 
 def report_empty_triangles_py(points):
     """Reports the number of empty triangles in the point set"""
@@ -808,7 +913,17 @@ def report_empty_triangles_py(points):
                 triangles.append([points[p],right_points[r],right_points[q]])
     return triangles
                       
-def report_empty_triangles(points, speedup=True):
+def report_empty_triangles(points, speedup=True, as_indices=False):
+    """If as_indices is True, the triangles are returned as an (m, 3)
+    int32 NumPy array of indices into points."""
+    if as_indices:
+        if utilities.__config['PURE_PYTHON'] or not speedup:
+            return _polygons_to_indices(report_empty_triangles_py(points), points, 3)
+        try:
+            return utilities.buffer_to_array(holesCpp.report_empty_triangles_indices(points),
+                                             'int32', 3)
+        except OverflowError:
+            return _polygons_to_indices(report_empty_triangles_py(points), points, 3)
     if utilities.__config['PURE_PYTHON'] or not speedup:
         return report_empty_triangles_py(points)
     try:
@@ -876,6 +991,7 @@ def report_convex_rholes_py(points,r,mono=False):
                         if (right_points[q][2]==color and
                              right_points[vo][2]==color):
                             tmplist = [right_points[vo], right_points[q], points[p]]
+                            C[(q,vo)]=[tmplist]
                         else:
                             C[(q,vo)]=[]
                     else:
@@ -926,15 +1042,176 @@ def report_convex_rholes_py(points,r,mono=False):
                         t=t+1
     return list(report)
                       
-def report_convex_rholes(points, r, mono=False, speedup=True):
+def report_convex_rholes(points, r, mono=False, speedup=True, as_indices=False,
+                         low_memory=False):
+    """If as_indices is True, the r-holes are returned as an (m, r) int32
+    NumPy array of indices into points, in the same order. low_memory is
+    as in count_convex_rholes."""
+    if as_indices:
+        if utilities.__config['PURE_PYTHON'] or not speedup:
+            return _polygons_to_indices(report_convex_rholes_py(points, r, mono), points, r)
+        try:
+            return utilities.buffer_to_array(holesCpp.report_convex_rholes_indices(points, r, mono,
+                                                                                   low_memory),
+                                             'int32', r)
+        except OverflowError:
+            return _polygons_to_indices(report_convex_rholes_py(points, r, mono), points, r)
     if utilities.__config['PURE_PYTHON'] or not speedup:
         return report_convex_rholes_py(points, r, mono)
     try:
-        return holesCpp.report_convex_rholes(points, r, mono)
+        return holesCpp.report_convex_rholes(points, r, mono, low_memory)
     except OverflowError:
         return report_convex_rholes_py(points, r, mono)
                 
                 
+def empty_triangles_incidence(points, speedup=True):
+    """Returns an int64 NumPy array with, for each point, the number of
+    empty triangles of points that have it as a vertex. On the C++ side
+    they are counted in the same pass as countEmptyTriangs."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _incidence_py(report_empty_triangles_py(points), points)
+    try:
+        return utilities.buffer_to_array(holesCpp.empty_triangles_incidence(points), 'int64')
+    except OverflowError:
+        return _incidence_py(report_empty_triangles_py(points), points)
+
+def convex_rholes_incidence(points, r, mono=False, speedup=True):
+    """Same as empty_triangles_incidence, for the r-holes of points
+    (monochromatic ones if mono is True). For r = 3 these are the empty
+    triangles."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _convex_rholes_incidence_py(points, r, mono)
+    try:
+        return utilities.buffer_to_array(holesCpp.convex_rholes_incidence(points, r, mono), 'int64')
+    except OverflowError:
+        return _convex_rholes_incidence_py(points, r, mono)
+
+def rholes_remove_point(pts, r, mono=False, speedup=True, threads=0):
+    """For every point pts[i] in the point set pts, returns an int64 NumPy
+    array whose i-th element is the number of r-holes (monochromatic ones
+    if mono is True, empty triangles for r = 3) of pts-pts[i]. These are
+    the r-holes of pts without pts[i] as a vertex (see
+    convex_rholes_incidence) plus the r-gons with only pts[i] inside (the
+    B of count_convex_rholes_p). The C++ version gets both terms for
+    every point from a single enumeration of the r-holes of pts, with
+    the pivots split among threads (one per core if threads is 0); the
+    pure Python one calls count_convex_rholes_p once per point."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _rholes_remove_point_py(pts, r, mono)
+    try:
+        return utilities.buffer_to_array(holesCpp.rholes_remove_point(pts, r, mono, threads), 'int64')
+    except OverflowError:
+        return _rholes_remove_point_py(pts, r, mono)
+
+def _rholes_remove_point_py(pts, r, mono=False):
+    res = _convex_rholes_incidence_py(pts, r, mono)
+    if r < 3:
+        return res
+    total = res.sum()/r
+    for i in range(len(pts)):
+        others = pts[:i] + pts[i+1:]
+        if r == 3 and mono:
+            A, B = count_emptymon_triangles_p_py(pts[i], others)
+        elif r == 3:
+            A, B = count_empty_triangles_p_py(pts[i], others)
+        else:
+            A, B = count_convex_rholes_p_py(pts[i], others, r, mono)
+        res[i] = total - res[i] + B
+    return res
+
+def _convex_rholes_incidence_py(points, r, mono=False):
+    polygons = _rholes_py(points, r)
+    if mono:
+        polygons = [pol for pol in polygons if len(set(_color(q) for q in pol)) == 1]
+    return _incidence_py(polygons, points)
+
+def _rholes_py(points, r):
+    """The r-holes of points (empty triangles for r = 3)."""
+    if r < 3:
+        return []
+    if r == 3:
+        return report_empty_triangles_py(points)
+    return report_convex_rholes_py(points, r)
+
+def _color(p):
+    return p[2] if len(p) > 2 else 0
+
+def _incidence_py(polygons, points):
+    """Number of the polygons that have each point as a vertex, as an
+    int64 NumPy array."""
+    D = utilities.points_index(points)
+    inc = [0]*len(points)
+    for pol in polygons:
+        for q in pol:
+            inc[D[q[0], q[1]]] += 1
+    return utilities.list_to_array(inc, 'int64')
+
+def count_mono_rholes_by_color(points, r, speedup=True, threads=0):
+    """Returns a dictionary with the number of monochromatic r-holes
+    (empty triangles for r = 3) of each color of points. On the C++ side
+    all the colors are counted in a single pass, with the points split
+    among threads (one per core if threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _count_mono_rholes_by_color_py(points, r)
+    try:
+        return dict(holesCpp.count_mono_rholes_by_color(points, r, threads))
+    except OverflowError:
+        return _count_mono_rholes_by_color_py(points, r)
+
+def _count_mono_rholes_by_color_py(points, r):
+    counts = dict((_color(p), 0) for p in points)
+    for pol in _rholes_py(points, r):
+        colors = set(_color(q) for q in pol)
+        if len(colors) == 1:
+            counts[colors.pop()] += 1
+    return counts
+
+def color_incidence(points, r, speedup=True, threads=0):
+    """Returns (colors, M), where colors is the sorted list of the colors
+    of points and M an (n, len(colors)) int64 NumPy array: M[i, c] is the
+    number of r-holes (empty triangles for r = 3) with points[i] as a
+    vertex whose other vertices all have color colors[c]. Recoloring
+    points[i] with colors[c] changes the number of monochromatic r-holes
+    by M[i, c] minus the entry of its current color."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _color_incidence_py(points, r)
+    try:
+        colors, M = holesCpp.color_incidence(points, r, threads)
+        return colors, utilities.buffer_to_array(M, 'int64', max(len(colors), 1))
+    except OverflowError:
+        return _color_incidence_py(points, r)
+
+def _color_incidence_py(points, r):
+    colors = sorted(set(_color(p) for p in points))
+    C = dict((c, i) for i, c in enumerate(colors))
+    D = utilities.points_index(points)
+    M = [[0]*len(colors) for p in points]
+    for pol in _rholes_py(points, r):
+        for j in range(len(pol)):
+            others = set(_color(q) for k, q in enumerate(pol) if k != j)
+            if len(others) == 1:
+                M[D[pol[j][0], pol[j][1]]][C[others.pop()]] += 1
+    return colors, utilities.list_to_array(M, 'int64', max(len(colors), 1))
+
+def best_recoloring(points, r, speedup=True, threads=0):
+    """For each point, finds the other color of points that most decreases
+    the number of monochromatic r-holes (empty triangles for r = 3) when
+    only that point is recolored, using color_incidence. Returns two int64
+    NumPy arrays: the best color of each point and the change it makes in
+    the number of monochromatic r-holes. If points have a single color,
+    each point keeps it with a change of 0."""
+    colors, M = color_incidence(points, r, speedup, threads)
+    best, delta = [], []
+    for p, row in zip(points, M.tolist()):
+        own = colors.index(_color(p))
+        c = own
+        for i in range(len(colors)):
+            if i != own and (c == own or row[i] < row[c]):
+                c = i
+        best.append(colors[c])
+        delta.append(row[c] - row[own])
+    return utilities.list_to_array(best, 'int64'), utilities.list_to_array(delta, 'int64')
+
 def count_rholes_maker(r,mono=False):      
     def f(pts):
         return count_convex_rholes(pts,r,mono=mono)        
@@ -1099,7 +1376,7 @@ def count_deg_triang_vertex(rpoints,degs,k,points):
         
     return triangs
         
-def count_deg_triang(points):
+def count_deg_triang_py(points):
     
     ordpoints=orderandsplit(points)
     triangs=0
@@ -1119,7 +1396,7 @@ def count_deg_triang(points):
     
     return max
   
-def count_deg_triang_degs(points):
+def count_deg_triang_degs_py(points):
     
     ordpoints=orderandsplit(points)
     triangs=0
@@ -1144,6 +1421,62 @@ def count_deg_triang_degs(points):
     return (I,J)
     
 
+def count_deg_triang(points, speedup=True, threads=0):
+    """Returns the largest number of empty triangles that share an edge."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return count_deg_triang_py(points)
+    try:
+        degs = _edge_degrees(points, threads)
+    except OverflowError:
+        return count_deg_triang_py(points)
+    return max(degs) if degs else 0
+
+def count_deg_triang_degs(points, speedup=True, threads=0):
+    """Returns (I, J), the indices of the endpoints of an edge in the
+    largest number of empty triangles."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return count_deg_triang_degs_py(points)
+    try:
+        degs = _edge_degrees(points, threads)
+    except OverflowError:
+        return count_deg_triang_degs_py(points)
+    if not degs or max(degs) == 0:
+        return (0, 0)
+    k = degs.index(max(degs))
+    return (k/len(points), k%len(points))
+
+def _edge_degrees(points, threads):
+    return array('i', str(holesCpp.empty_triangles_edge_degrees(points, False, threads)))
+
+def empty_triangle_degrees(points, sparse=False, speedup=True, threads=0):
+    """Returns the (n, n) int32 NumPy array whose entry (i, j) is the number
+    of empty triangles that have points[i]points[j] as an edge. If sparse
+    is True, returns instead three int32 arrays (rows, cols, vals) with the
+    nonzero entries with rows < cols (COO format). On the C++ side the
+    triangles are taken from the same sweep as countEmptyTriangs, with the
+    points split among threads (one per core if threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _empty_triangle_degrees_py(points, sparse)
+    try:
+        res = holesCpp.empty_triangles_edge_degrees(points, sparse, threads)
+    except OverflowError:
+        return _empty_triangle_degrees_py(points, sparse)
+    if sparse:
+        return tuple(utilities.buffer_to_array(buf, 'int32') for buf in res)
+    n = len(points)
+    return utilities.buffer_to_array(res, 'int32').reshape(n, n)
+
+def _empty_triangle_degrees_py(points, sparse=False):
+    ordpoints=orderandsplit(points)
+    n = len(points)
+    degs=[[0]*n for i in range(n)]
+    for i in range(n):
+        count_deg_triang_vertex(ordpoints[i][1],degs,i,points)
+    if sparse:
+        nz = [(i, j, degs[i][j]) for i in range(n) for j in range(i+1, n) if degs[i][j] > 0]
+        return tuple(utilities.list_to_array([e[k] for e in nz], 'int32') for k in range(3))
+    return utilities.list_to_array(degs, 'int32').reshape(n, n)
+
 def count_convex_rholes_maker(r, colored=False,speedup=True):
     def f(pts):
         return count_convex_rholes(pts,r,mono=colored,speedup=speedup)
@@ -1501,4 +1834,234 @@ def count_convex_rholes_p(p, points, r, mono=False, speedup=True):
     try:
         return holesCpp.count_convex_rholes_p(p, points, r, mono)
     except OverflowError:
-        return count_convex_rholes_p_py(p, points, r, mono)
\ No newline at end of file
+        return count_convex_rholes_p_py(p, points, r, mono)
+
+def _hole_index(points, speedup):
+    """Returns the C++ index of points used by HoleIndex, or None if the
+    pure Python versions have to be used."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return None
+    try:
+        return holesCpp.hole_index(points)
+    except OverflowError:
+        return None
+
+class HoleIndex(object):
+
+    """Answers several hole queries on a fixed point set. On the C++ side
+       it owns the sorted orders and visibility graphs of the points, which
+       are computed the first time a query needs them and reused by the
+       following ones. Queries with a point p not in the set (the *_p
+       methods) only reuse the converted point set.
+       points must not be modified while the index is in use."""
+
+    def __init__(self, points, speedup=True):
+        self.points = points
+        self._index = _hole_index(points, speedup)
+
+    def count_convex_rholes(self, r, mono=False):
+        if self._index is None:
+            return count_convex_rholes_py(self.points, r, mono)
+        return holesCpp.hole_index_count_convex_rholes(self._index, r, mono)
+
+    def report_convex_rholes(self, r, mono=False, as_indices=False):
+        if self._index is None:
+            return report_convex_rholes(self.points, r, mono, speedup=False, as_indices=as_indices)
+        res = holesCpp.hole_index_report_convex_rholes(self._index, r, mono)
+        if as_indices:
+            return utilities.buffer_to_array(res, 'int32', r)
+        return self._to_points(res, r)
+
+    def count_non_convex_four_holes(self, colored=False, threads=0):
+        if self._index is None:
+            return count_non_convex_four_holes_py(self.points, colored)
+        return holesCpp.hole_index_count_non_convex_four_holes(self._index, colored, threads)
+
+    def count_four_holes(self, colored=False, threads=0):
+        return (self.count_convex_rholes(4, mono=colored) +
+                self.count_non_convex_four_holes(colored=colored, threads=threads))
+
+    def count_non_convex_four_islands(self, colored=False, threads=0):
+        if self._index is None:
+            return count_non_convex_four_islands_py(self.points, colored)
+        return holesCpp.hole_index_count_non_convex_four_islands(self._index, colored, threads)
+
+    def count_four_islands(self, colored=False, threads=0):
+        return (self.count_convex_rholes(4, mono=colored) +
+                self.count_non_convex_four_islands(colored=colored, threads=threads))
+
+    def countEmptyTriangs(self):
+        if self._index is None:
+            return countEmptyTriangs_py(self.points)
+        return holesCpp.hole_index_countEmptyTriangs(self._index)
+
+    def report_empty_triangles(self, as_indices=False):
+        if self._index is None:
+            return report_empty_triangles(self.points, speedup=False, as_indices=as_indices)
+        res = holesCpp.hole_index_report_empty_triangles(self._index)
+        if as_indices:
+            return utilities.buffer_to_array(res, 'int32', 3)
+        return self._to_points(res, 3)
+
+    def empty_triangles_incidence(self):
+        if self._index is None:
+            return empty_triangles_incidence(self.points, speedup=False)
+        return utilities.buffer_to_array(holesCpp.hole_index_empty_triangles_incidence(self._index),
+                                         'int64')
+
+    def convex_rholes_incidence(self, r, mono=False):
+        if self._index is None:
+            return convex_rholes_incidence(self.points, r, mono, speedup=False)
+        return utilities.buffer_to_array(holesCpp.hole_index_convex_rholes_incidence(self._index, r, mono),
+                                         'int64')
+
+    def largest_convex_hole(self, mono=False):
+        if self._index is None or mono:
+            return largest_convex_hole(self.points, mono, speedup=self._index is not None)
+        return holesCpp.hole_index_largest_convex_hole(self._index)
+
+    def count_convex_rholes_p(self, p, r, mono=False):
+        if self._index is None:
+            return count_convex_rholes_p_py(p, self.points, r, mono)
+        return holesCpp.hole_index_count_convex_rholes_p(self._index, p, r, mono)
+
+    def count_convex_rholes_p_many(self, Q, r, mono=False, threads=0):
+        """Returns the list of count_convex_rholes_p(q, r, mono) for each q
+        in Q (a list of points or a NumPy array with one point per row).
+        On the C++ side the points of Q are split among threads (one per
+        core if threads is 0)."""
+        if hasattr(Q, 'tolist'):
+            Q = Q.tolist()
+        if self._index is None:
+            return [count_convex_rholes_p_py(q, self.points, r, mono) for q in Q]
+        try:
+            return holesCpp.count_convex_rholes_p_many(self._index, Q, r, mono, threads)
+        except OverflowError:
+            return [count_convex_rholes_p_py(q, self.points, r, mono) for q in Q]
+
+    def report_empty_triangles_p(self, p, as_indices=False):
+        if self._index is None:
+            return report_empty_triangles_p(p, self.points, speedup=False, as_indices=as_indices)
+        A, B = holesCpp.hole_index_report_empty_triangles_p(self._index, p)
+        if as_indices:
+            return (utilities.buffer_to_array(A, 'int32', 3),
+                    utilities.buffer_to_array(B, 'int32', 3))
+        return self._to_points(A, 3, p), self._to_points(B, 3, p)
+
+    def memory(self):
+        """Bytes used on the C++ side by the orders and graphs computed so
+        far (0 for the pure Python version)."""
+        if self._index is None:
+            return 0
+        return holesCpp.hole_index_memory(self._index)
+
+    def _to_points(self, buf, width, p=None):
+        """Converts a buffer of indices into lists of points. The index
+        len(self.points) stands for p."""
+        idx = array('i', str(buf))
+        pts = self.points if p is None else self.points + [p]
+        return [[pts[i] for i in idx[j:j+width]] for j in xrange(0, len(idx), width)]
+
+class HoleContext(object):
+
+    """Evaluates count_convex_rholes_p(q, points, r, mono) for many
+       candidate points q against the same point set, through a HoleIndex
+       of points. On the C++ side the candidates of each call to
+       count_p_many are split among threads (one per core if threads is 0).
+       points must not be modified while the context is in use."""
+
+    def __init__(self, points, r, mono=False, speedup=True, threads=0):
+        self.points = points
+        self.r = r
+        self.mono = mono
+        self.threads = threads
+        self.index = HoleIndex(points, speedup)
+
+    def count_p(self, q):
+        """Returns (A, B) as in count_convex_rholes_p."""
+        return self.index.count_convex_rholes_p(q, self.r, self.mono)
+
+    def count_p_many(self, Q):
+        """Returns the list of pairs (A, B), one for each candidate in Q.
+        Q may be a list of points or a NumPy array with one point per row."""
+        return self.index.count_convex_rholes_p_many(Q, self.r, self.mono, self.threads)
+
+def _hole_counter(points, r, mono, speedup):
+    """Returns the C++ counter used by HoleCounter, or None if the pure
+    Python versions have to be used."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return None
+    try:
+        return holesCpp.hole_counter(points, r, mono)
+    except OverflowError:
+        return None
+
+class HoleCounter(object):
+
+    """Keeps the number of r-holes of points (monochromatic ones if mono
+       is True) up to date while its points are moved one at a time.
+       propose(i, q) returns the change in the count if points[i] is moved
+       to q, paying only for count_convex_rholes_p on the old and new
+       positions (count_empty_triangles_p or count_emptymon_triangles_p if
+       r is 3); commit() applies the last proposal and rollback() discards
+       it. The moved point keeps its color. points is copied, self.points
+       holds the current positions."""
+
+    def __init__(self, points, r, mono=False, speedup=True):
+        self.points = [p[:] for p in points]
+        self.r = r
+        self.mono = mono
+        self._counter = _hole_counter(self.points, r, mono, speedup)
+        self._pending = None
+        if self._counter is None:
+            if r == 3 and mono:
+                self._count = countEmptyMonoTriangs(self.points)
+            elif r == 3:
+                self._count = countEmptyTriangs_py(self.points)
+            else:
+                self._count = count_convex_rholes_py(self.points, r, mono)
+
+    def count(self):
+        """Returns the current number of r-holes."""
+        if self._counter is not None:
+            return holesCpp.hole_counter_count(self._counter)
+        return self._count
+
+    def propose(self, i, q):
+        """Returns the change in the number of r-holes if points[i] is
+        moved to q."""
+        q = list(q[:2]) + self.points[i][2:]
+        if self._counter is not None:
+            delta = holesCpp.hole_counter_propose(self._counter, i, q)
+        else:
+            others = self.points[:i] + self.points[i+1:]
+            if self.r == 3 and self.mono:
+                Ap, Bp = count_emptymon_triangles_p_py(self.points[i], others)
+                Aq, Bq = count_emptymon_triangles_p_py(q, others)
+            elif self.r == 3:
+                Ap, Bp = count_empty_triangles_p_py(self.points[i], others)
+                Aq, Bq = count_empty_triangles_p_py(q, others)
+            else:
+                Ap, Bp = count_convex_rholes_p_py(self.points[i], others, self.r, self.mono)
+                Aq, Bq = count_convex_rholes_p_py(q, others, self.r, self.mono)
+            delta = -Ap + Aq + Bp - Bq
+        self._pending = (i, q, delta)
+        return delta
+
+    def commit(self):
+        """Applies the last proposal and returns the new number of r-holes."""
+        if self._pending is None:
+            raise ValueError("there is no proposal to commit")
+        i, q, delta = self._pending
+        self._pending = None
+        self.points[i] = q
+        if self._counter is not None:
+            return holesCpp.hole_counter_commit(self._counter)
+        self._count += delta
+        return self._count
+
+    def rollback(self):
+        """Discards the last proposal, if any."""
+        self._pending = None
+        if self._counter is not None:
+            holesCpp.hole_counter_rollback(self._counter)
@@ -19,8 +19,87 @@
 
 
 import geometricbasics, itertools, convexhull
+import utilities
 
-def max_cup(pts):
+if utilities.__load_extensions:
+    import kgonsCpp
+
+def max_cup(pts, speedup=True):
+    """Number of points of the longest cup in pts."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return max_cup_py(pts)
+    try:
+        return len(kgonsCpp.cup_cap_tables(pts)[2])
+    except OverflowError:
+        return max_cup_py(pts)
+
+def max_cap(pts, speedup=True):
+    """Number of points of the longest cap in pts."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return max_cap_py(pts)
+    try:
+        return len(kgonsCpp.cup_cap_tables(pts)[3])
+    except OverflowError:
+        return max_cap_py(pts)
+
+def cup_cap_tables(pts, speedup=True):
+    """Returns (cups, caps, (kcup, cup), (kcap, cap)). cups[i, j] is the
+    number of points of the longest cup whose last edge goes from pts[i]
+    to pts[j], where pts[i] comes before pts[j] from left to right (and
+    from bottom to top), and 0 for the other pairs; caps is the same for
+    caps. Both are (n, n) int16 NumPy arrays. kcup is the length of the
+    longest cup and cup the indices of its points from left to right,
+    and the same for caps. As in max_cup and max_cap, three collinear
+    points are both a cup and a cap. The C++ version takes O(n^2 log n)
+    time."""
+    n = len(pts)
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return _cup_cap_tables_py(pts)
+    try:
+        cups, caps, cup, cap = kgonsCpp.cup_cap_tables(pts)
+    except OverflowError:
+        return _cup_cap_tables_py(pts)
+    return (utilities.buffer_to_array(cups, 'int16').reshape(n, n),
+            utilities.buffer_to_array(caps, 'int16').reshape(n, n),
+            (len(cup), cup), (len(cap), cap))
+
+def _cup_cap_tables_py(pts):
+    n = len(pts)
+    order = sorted(xrange(n), key=lambda i: (pts[i][0], pts[i][1]))
+    res = []
+    for sign in (1, -1): #cups turn left, caps turn right
+        T = [[0]*n for i in xrange(n)]
+        pred = {}
+        for a in xrange(n):
+            for b in xrange(a+1, n):
+                T[order[a]][order[b]] = 2
+        for b in xrange(n):
+            j = order[b]
+            for a in xrange(b):
+                i = order[a]
+                for c in xrange(b+1, n):
+                    k = order[c]
+                    if sign*geometricbasics.turn(pts[i], pts[j], pts[k]) <= 0 and T[j][k] < T[i][j]+1:
+                        T[j][k] = T[i][j]+1
+                        pred[j, k] = i
+        best, edge = 0, None
+        for a in xrange(n):
+            for b in xrange(a+1, n):
+                if T[order[a]][order[b]] > best:
+                    best, edge = T[order[a]][order[b]], (order[a], order[b])
+        chain = []
+        if edge is not None:
+            chain = [edge[1], edge[0]]
+            while edge in pred:
+                edge = (pred[edge], edge[0])
+                chain.append(edge[0])
+            chain.reverse()
+        res.append((T, (best, chain)))
+    (cups, cup), (caps, cap) = res
+    return (utilities.list_to_array(cups, 'int16').reshape(n, n),
+            utilities.list_to_array(caps, 'int16').reshape(n, n), cup, cap)
+
+def max_cup_py(pts):
     pts=[x[:] for x in pts]
     n=len(pts)
     pts.sort()
@@ -40,7 +119,7 @@ def max_cup(pts):
             m=M[e]
     return m
     
-def max_cap(pts):
+def max_cap_py(pts):
     pts=[x[:] for x in pts]
     n=len(pts)
     pts.sort()
@@ -100,7 +179,124 @@ def sortAroundPoint(p, ptsIdx, pts):
     return r
     
 
-def maxKgon(pts): #Finds the largest rgon in pts in time O(n^3))
+def maxKgon(pts, speedup=True, witness=False, threads=0):
+    """Finds the size of the largest subset of pts in convex position.
+    If witness is True it returns a pair (k, idx), where idx are the
+    indices into pts of the vertices of one such polygon in ccw order,
+    starting at the lowest one. On the C++ side the points are split
+    among threads (one per core if threads is 0)."""
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        if witness:
+            return _max_kgon_py(pts)
+        return maxKgon_py(pts)
+    try:
+        k, idx = kgonsCpp.max_kgon(pts, threads)
+    except OverflowError:
+        k, idx = _max_kgon_py(pts)
+    if witness:
+        return k, idx
+    return k
+
+def _edge_cmp(pts, e1, e2): #Compares the directions of two edges by their angle in [0, 2pi)
+    dx1, dy1 = pts[e1[1]][0]-pts[e1[0]][0], pts[e1[1]][1]-pts[e1[0]][1]
+    dx2, dy2 = pts[e2[1]][0]-pts[e2[0]][0], pts[e2[1]][1]-pts[e2[0]][1]
+    h1 = 0 if dy1 > 0 or (dy1 == 0 and dx1 > 0) else 1
+    h2 = 0 if dy2 > 0 or (dy2 == 0 and dx2 > 0) else 1
+    if h1 != h2:
+        return h1-h2
+    return cmp(dx2*dy1, dx1*dy2)
+
+def _edge_groups(pts): #All the ordered pairs of indices sorted by angle, parallel ones in the same group
+    n = len(pts)
+    edges = [(u, v) for u in xrange(n) for v in xrange(n) if u != v]
+    edges.sort(lambda e1, e2: _edge_cmp(pts, e1, e2))
+    groups = [[edges[0]]]
+    for e in edges[1:]:
+        if _edge_cmp(pts, groups[-1][0], e) == 0:
+            groups[-1].append(e)
+        else:
+            groups.append([e])
+    return groups
+
+def _max_kgon_py(pts): #Same sweep as kgonsCpp.max_kgon, returns (k, idx)
+    n = len(pts)
+    if n < 3:
+        return 0, []
+    groups = _edge_groups(pts)
+
+    best, kgon = 0, []
+    for p in xrange(n):
+        P = (pts[p][1], pts[p][0])
+        ok = [v == p or (pts[v][1], pts[v][0]) > P for v in xrange(n)]
+        f = [-1]*n
+        f[p] = 0
+        chain = [None]*n #chain[v] is the chain from p to v, as nested pairs
+        chain[p] = (p, None)
+        for g in groups:
+            updates = []
+            for u, v in g:
+                if f[u] < 0 or not ok[v]:
+                    continue
+                if v == p:
+                    if f[u]+1 > best:
+                        best, kgon = f[u]+1, chain[u]
+                elif f[u]+1 > f[v]:
+                    updates.append((u, v, f[u]+1))
+            for u, v, k in updates:
+                if k > f[v]:
+                    f[v], chain[v] = k, (v, chain[u])
+    if best < 3:
+        return 0, []
+    idx = []
+    while kgon is not None:
+        idx.append(kgon[0])
+        kgon = kgon[1]
+    idx.reverse()
+    return best, idx
+
+def convex_kgon_counts(pts, max_k=None, speedup=True, threads=0):
+    """Returns a list whose k-th entry is the number of convex k-gons
+    with vertices in pts (no three of them collinear), for k up to
+    max_k (len(pts) if it is None). The entries for k < 3 are 0. On the
+    C++ side the points are split among threads (one per core if
+    threads is 0)."""
+    if max_k is None:
+        max_k = len(pts)
+    if utilities.__config['PURE_PYTHON'] or not speedup:
+        return convex_kgon_counts_py(pts, max_k)
+    try:
+        return kgonsCpp.convex_kgon_counts(pts, max_k, threads)
+    except OverflowError:
+        return convex_kgon_counts_py(pts, max_k)
+
+def convex_kgon_counts_py(pts, max_k):
+    n = len(pts)
+    counts = [0]*(max(max_k, -1)+1)
+    K = min(max_k, n)
+    if n < 3 or K < 3:
+        return counts
+    groups = _edge_groups(pts)
+
+    for p in xrange(n):
+        P = (pts[p][1], pts[p][0])
+        ok = [v == p or (pts[v][1], pts[v][0]) > P for v in xrange(n)]
+        f = [[0]*K for v in xrange(n)] #f[v][j] is the number of convex chains from p to v with j edges
+        f[p][0] = 1
+        for g in groups:
+            old = [f[u][:] for u, v in g] if len(g) > 1 else [f[g[0][0]]]
+            for (u, v), fu in itertools.izip(g, old):
+                if not ok[u] or not ok[v]:
+                    continue
+                if v == p:
+                    for k in xrange(2, K):
+                        counts[k+1] += fu[k]
+                else:
+                    fv = f[v]
+                    for k in xrange(K-1):
+                        fv[k+1] += fu[k]
+    return counts
+
+def maxKgon_py(pts): #Finds the largest rgon in pts in time O(n^3))
     allSorted = []
     tmp = range(1, len(pts))
         
@@ -47,11 +47,9 @@ def unique_signature(pts):
        but it is independent of the labelling of the point set.
        It runs in O(n^3 \logn) time"""
     pts=[x[:] for x in pts]
-    D=points_index(pts)
-    ch=convexhull.CH(pts)
     S=[]
-    for p in ch:
-        idx=D[tuple(p)]
+    for idx in convexhull.hull_indices(pts):
+        p=pts[idx]
         pts2=pts[:idx]
         pts2.extend(pts[idx+1:])
         pts2=geometricbasics.sort_around_point(p,pts2)
@@ -26,6 +26,11 @@ import pickle
 import os
 import warnings
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 warnings.filterwarnings('always', '.*PyDCG.*',)
 
 __config_file = open(os.path.join(os.path.dirname(__file__),
@@ -79,6 +84,31 @@ def cppWrapper(pyf, cppf, speedup, checkPoints=None, checkPointSets=None, **kwar
 
     raise ValueError("Invalid value for parameter 'speedup':" + str(speedup))
 
+def buffer_to_array(buf, dtype, width=None):
+    """Wraps a buffer returned by the C++ extensions in a NumPy array of the
+    given dtype without copying it. If width is given, the array is reshaped
+    to have that many columns."""
+    if numpy is None:
+        raise ImportError("NumPy is required for array output in PyDCG.")
+    res = numpy.frombuffer(buf, dtype=dtype)
+    if width is not None:
+        res = res.reshape(-1, width)
+    return res
+
+def list_to_array(rows, dtype, width=None):
+    """Same as buffer_to_array, for the results of the pure Python versions."""
+    if numpy is None:
+        raise ImportError("NumPy is required for array output in PyDCG.")
+    res = numpy.array(rows, dtype=dtype)
+    if width is not None:
+        res = res.reshape(-1, width)
+    return res
+
+def points_index(pts):
+    """Returns a dictionary mapping each point (as a tuple of its
+    coordinates) to its index in pts."""
+    return dict(((p[0], p[1]), i) for i, p in enumerate(pts))
+
 def loadData(filename):
     f = open(filename, "rb")
     data = pickle.load(f)
@@ -64,7 +64,17 @@ geometricbasicsCpp.extra_compile_args = ['-I/usr/include/python3.10','-lpython3.
 
 holesCpp = Extension('PyDCG.holesCpp',
                     sources = [sources_dir+"holesCPP_wrapper.cpp", sources_dir+"holesCPP.cpp", sources_dir+"geometricbasicsCpp.cpp"])
-holesCpp.extra_compile_args = ['-I/usr/include/python3.10','-lpython3.10','--std=c++0x', '-O3', arch];
+holesCpp.extra_compile_args = ['-I/usr/include/python3.10','-lpython3.10','--std=c++0x', '-O3', '-pthread', arch];
+holesCpp.extra_link_args = ['-pthread']
+
+kgonsCpp = Extension('PyDCG.kgonsCpp',
+                    sources = [sources_dir+"kgonsCPP_wrapper.cpp", sources_dir+"kgonsCPP.cpp", sources_dir+"geometricbasicsCpp.cpp"])
+kgonsCpp.extra_compile_args = ['-I/usr/include/python3.10','-lpython3.10','--std=c++0x', '-O3', '-pthread', arch];
+kgonsCpp.extra_link_args = ['-pthread']
+
+datastructuresCpp = Extension('PyDCG.datastructuresCpp',
+                    sources = [sources_dir+"datastructuresCPP_wrapper.cpp", sources_dir+"datastructuresCPP.cpp", sources_dir+"geometricbasicsCpp.cpp"])
+datastructuresCpp.extra_compile_args = ['-I/usr/include/python3.10','-lpython3.10','--std=c++0x', '-O3', arch];
 
 crossingCpp = Extension('PyDCG.crossingCpp',
                     sources = [sources_dir+"count_crossing_wrapper.cpp", sources_dir+"count_crossing.cpp", sources_dir+"geometricbasicsCpp.cpp"])
@@ -73,7 +83,7 @@ crossingCpp.extra_compile_args = ['-I/usr/include/python3.10','-lpython3.10','--
 modules = []
 
 if options['PURE_PYTHON'] == 0:
-    modules = [crossingCpp, holesCpp, geometricbasicsCpp]
+    modules = [crossingCpp, holesCpp, geometricbasicsCpp, kgonsCpp, datastructuresCpp]
     config['PURE_PYTHON'] = False
 else:
     config['PURE_PYTHON'] = True
@@ -0,0 +1,113 @@
+import itertools
+import random
+import unittest
+
+from PyDCG import convexhull
+
+
+def on_segment(p, a, b):
+    return (convexhull.orientation(a, b, p) == 0 and
+            min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and
+            min(a[1], b[1]) <= p[1] <= max(a[1], b[1]))
+
+
+def brute_hull_vertices(pts):
+    """The points of pts not in a closed segment or triangle of others."""
+    pts = sorted(set(tuple(p) for p in pts))
+    res = set()
+    for p in pts:
+        others = [q for q in pts if q != p]
+        if any(on_segment(p, a, b)
+               for a, b in itertools.combinations(others, 2)):
+            continue
+        if any(convexhull.orientation(a, b, c) != 0 and
+               len(set(cmp(convexhull.orientation(*t), 0)
+                       for t in ((a, b, p), (b, c, p), (c, a, p)))) == 1
+               for a, b, c in itertools.combinations(others, 3)):
+            continue
+        res.add(p)
+    return res
+
+
+class CHTest(unittest.TestCase):
+
+    def check(self, pts):
+        ch = convexhull.CH(pts)
+        self.assertEqual(len(ch), len(set(tuple(p) for p in ch)))
+        self.assertEqual(set(tuple(p) for p in ch), brute_hull_vertices(pts))
+        for k in xrange(len(ch)):
+            # every hull vertex is a clockwise turn
+            if len(ch) >= 3:
+                self.assertTrue(convexhull.orientation(ch[k-2], ch[k-1], ch[k]) > 0)
+
+    def test_small_degenerate_sets(self):
+        self.check([])
+        self.check([[1, 1]])
+        self.check([[1, 1], [1, 1]])
+        self.check([[1, 1], [1, 1], [1, 1]])
+        self.check([[0, 0], [1, 1], [2, 2]])
+        self.check([[2, 2], [0, 0], [1, 1]])
+        self.check([[0, 0], [2, 2], [0, 0]])
+        self.assertEqual(convexhull.CH([[0, 0], [0, 1], [1, 0]]),
+                         [[0, 0], [0, 1], [1, 0]])
+
+    def test_random_sets_against_brute_force(self):
+        random.seed(11)
+        for n in xrange(1, 10):
+            for _ in xrange(40):
+                pts = [[random.randint(0, 4), random.randint(0, 4)]
+                       for _ in xrange(n)]
+                copy = [p[:] for p in pts]
+                self.check(pts)
+                self.assertEqual(pts, copy)
+
+
+class HullIndicesTest(unittest.TestCase):
+
+    def check(self, pts, idx):
+        self.assertEqual(set(tuple(pts[i]) for i in idx),
+                         brute_hull_vertices(pts))
+        if idx:
+            self.assertEqual(idx[0], min(idx, key=lambda i: pts[i]))
+        for k in xrange(len(idx)):
+            # ccw order
+            if len(idx) >= 3:
+                self.assertTrue(convexhull.orientation(
+                    pts[idx[k-2]], pts[idx[k-1]], pts[idx[k]]) < 0)
+
+    def test_random_sets_against_brute_force(self):
+        random.seed(13)
+        sets = [[[random.randint(0, 4), random.randint(0, 4)]
+                 for _ in xrange(n)] for n in xrange(10) for _ in xrange(20)]
+        for speedup in (True, False):
+            for pts in sets:
+                self.check(pts, convexhull.hull_indices(pts, speedup))
+            many = convexhull.hulls_many(sets, speedup)
+            self.assertEqual(many, [convexhull.hull_indices(pts, speedup)
+                                    for pts in sets])
+
+
+class ConvexLayersTest(unittest.TestCase):
+
+    def test_repeated_points(self):
+        pts = [[0, 0], [10, 0], [0, 10], [10, 10], [5, 5], [5, 5], [4, 6]]
+        for speedup in (True, False):
+            self.assertEqual(list(convexhull.convex_layers(pts, speedup)),
+                             [0, 0, 0, 0, 1, 1, 1])
+            self.assertEqual(list(convexhull.convex_layers(pts[:5] + pts[6:], speedup)),
+                             [0, 0, 0, 0, 1, 1])
+
+    def test_repeated_random_points(self):
+        random.seed(7)
+        for _ in xrange(20):
+            pts = [[random.randint(0, 20), random.randint(0, 20)] for _ in xrange(100)]
+            pts += [p[:] for p in random.sample(pts, 30)]
+            random.shuffle(pts)
+            fast = list(convexhull.convex_layers(pts))
+            self.assertEqual(fast, list(convexhull.convex_layers(pts, False)))
+            for i, p in enumerate(pts):
+                self.assertEqual(fast[i], fast[pts.index(p)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import pickle
+import random
+import unittest
+
+from PyDCG import crossing
+
+
+class CrossingCounterTest(unittest.TestCase):
+
+    def random_points(self, n, k=10**6):
+        return [[random.randint(-k, k), random.randint(-k, k)]
+                for _ in xrange(n)]
+
+    def test_changes_and_moves_match_recount(self):
+        random.seed(6)
+        for speedup in (True, False):
+            pts = self.random_points(15)
+            counter = crossing.CrossingCounter(pts, speedup)
+            self.assertEqual(counter.count(), crossing.count_crossings_py(pts))
+            for _ in xrange(100):
+                i = random.randrange(len(pts))
+                if random.randint(0, 1):
+                    p = [pts[i][0] + random.randint(-10, 10),
+                         pts[i][1] + random.randint(-10, 10)]
+                else:
+                    p = self.random_points(1)[0]
+                moved = pts[:]
+                moved[i] = p
+                expected = crossing.count_crossings_py(moved)
+                self.assertEqual(counter.change(i, p),
+                                 expected - counter.count())
+                self.assertEqual(counter.move(i, p), expected)
+                pts = moved
+                self.assertEqual(counter.points, pts)
+
+    def test_pickle_rebuilds_counter(self):
+        random.seed(7)
+        pts = self.random_points(12)
+        counter = crossing.CrossingCounter(pts)
+        counter.move(3, [0, 0])
+        copy = pickle.loads(pickle.dumps(counter))
+        self.assertEqual(copy.points, counter.points)
+        self.assertEqual(copy.count(), counter.count())
+        self.assertEqual(copy.change(5, [1, 2]), counter.change(5, [1, 2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import pickle
+import random
+import unittest
+
+from PyDCG import heuristics, holes
+
+
+def recount(obj, pts, i, p):
+    moved = [q[:] for q in pts]
+    moved[i] = p
+    return obj.count(moved) - obj.count(pts)
+
+
+class DegenerateMovesTest(unittest.TestCase):
+
+    def test_move_collinear_with_two_points(self):
+        # [900, -2939] is collinear with the first two points
+        pts = [[2646, -311], [-1719, -6881], [5000, 4000], [-3000, 2500],
+               [100, 7000], [-6000, -1000], [3000, -5000], [0, 0]]
+        for speedup in (True, False):
+            for obj in (heuristics.CrossingsObjective(speedup),
+                        heuristics.EmptyTrianglesObjective(speedup),
+                        heuristics.ConvexHolesObjective(4, speedup=speedup)):
+                obj.init(pts)
+                d = obj.delta(7, [900, -2939])
+                self.assertEqual(d, recount(obj, pts, 7, [900, -2939]))
+                obj.accept()
+                d = obj.delta(7, [10, 20])
+                self.assertEqual(d, recount(obj, pts, 7, [10, 20]))
+                obj.reject()
+
+    def test_random_moves_on_small_grid(self):
+        random.seed(2)
+        for obj in (heuristics.CrossingsObjective(),
+                    heuristics.EmptyTrianglesObjective(),
+                    heuristics.ConvexHolesObjective(4)):
+            pts = [[random.randint(0, 15), random.randint(0, 15)]
+                   for _ in xrange(12)]
+            value = obj.init(pts)
+            for _ in xrange(300):
+                i = random.randrange(len(pts))
+                p = [random.randint(0, 15), random.randint(0, 15)]
+                value += obj.delta(i, p)
+                obj.accept()
+                self.assertEqual(value, obj.count(pts))
+
+    def test_annealing_with_collinear_moves(self):
+        random.seed(2)
+        pts = heuristics.simmulated_annealing(
+            n=14, pts=[], run_time=2, k=1000,
+            k_f=heuristics.kirkpatrick_cooling(300, 0.999),
+            T=heuristics.kirkpatrick_cooling(100, 0.999),
+            f=heuristics.EmptyTrianglesObjective())
+        self.assertEqual(len(pts), 14)
+
+
+class ObjectiveDeltasTest(unittest.TestCase):
+
+    def objectives(self, speedup):
+        return (heuristics.CrossingsObjective(speedup),
+                heuristics.EmptyTrianglesObjective(speedup),
+                heuristics.ConvexHolesObjective(4, speedup=speedup),
+                heuristics.ConvexHolesObjective(5, speedup=speedup))
+
+    def test_peek_and_delta_match_recount(self):
+        random.seed(8)
+        for speedup in (True, False):
+            for obj in self.objectives(speedup):
+                pts = [[random.randint(0, 10**6), random.randint(0, 10**6)]
+                       for _ in xrange(12)]
+                value = obj.init(pts)
+                for _ in xrange(40):
+                    i = random.randrange(len(pts))
+                    p = [random.randint(0, 10**6), random.randint(0, 10**6)]
+                    expected = recount(obj, pts, i, p)
+                    self.assertEqual(obj.peek(i, p), expected)
+                    self.assertEqual(obj.delta(i, p), expected)
+                    if random.randint(0, 1):
+                        obj.accept()
+                        value += expected
+                    else:
+                        obj.reject()
+                    self.assertEqual(value, obj.count(pts))
+
+    def test_pickled_objective_peeks(self):
+        random.seed(9)
+        for obj in self.objectives(True):
+            pts = [[random.randint(0, 10**6), random.randint(0, 10**6)]
+                   for _ in xrange(10)]
+            obj.init(pts)
+            obj.delta(2, [5, 5])
+            obj.accept()
+            copy = pickle.loads(pickle.dumps(obj))
+            for _ in xrange(10):
+                i = random.randrange(len(pts))
+                p = [random.randint(0, 10**6), random.randint(0, 10**6)]
+                self.assertEqual(copy.peek(i, p), recount(obj, pts, i, p))
+
+
+class MonochromaticTrianglesTest(unittest.TestCase):
+
+    def test_mono_empty_triangles_deltas(self):
+        random.seed(5)
+        for speedup in (True, False):
+            obj = heuristics.ConvexHolesObjective(3, mono=True, speedup=speedup)
+            pts = [[random.randint(0, 10**6), random.randint(0, 10**6),
+                    random.randint(0, 1)] for _ in xrange(14)]
+            value = obj.init(pts)
+            self.assertEqual(value, holes.countEmptyMonoTriangs(pts))
+            for _ in xrange(100):
+                i = random.randrange(len(pts))
+                p = [random.randint(0, 10**6), random.randint(0, 10**6), pts[i][2]]
+                value += obj.delta(i, p)
+                obj.accept()
+                self.assertEqual(value, holes.countEmptyMonoTriangs(pts))
+
+
+class NeutralMovesTest(unittest.TestCase):
+
+    def batch_neutral(self, use_processes):
+        # Small moves on a spread out set almost always keep the order type
+        random.seed(3)
+        obj = heuristics.CrossingsObjective()
+        heuristics.greedy(10, [], run_time=0.5, f=obj, t=10, workers=2,
+                          use_processes=use_processes)
+        return obj.neutral
+
+    def test_neutral_counted_with_threads(self):
+        self.assertTrue(self.batch_neutral(False) > 0)
+
+    def test_neutral_counted_with_processes(self):
+        self.assertTrue(self.batch_neutral(True) > 0)
+
+    def test_peek_does_not_count(self):
+        random.seed(4)
+        obj = heuristics.CrossingsObjective()
+        pts = [[random.randint(0, 10**6), random.randint(0, 10**6)]
+               for _ in xrange(10)]
+        obj.init(pts)
+        p = [pts[0][0] + 1, pts[0][1]]
+        self.assertTrue(obj.skips(0, p))
+        self.assertEqual(obj.peek(0, p), 0)
+        self.assertEqual(obj.neutral, 0)
+        self.assertEqual(obj.delta(0, p), 0)
+        self.assertEqual(obj.neutral, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import gc
+import random
+import sys
+import unittest
+
+from PyDCG import holes
+
+
+def brute_mono_triangles(pts):
+    return sum(holes.count_mono_rholes_by_color(pts, 3, speedup=False).values())
+
+
+class HoleCounterMonoTest(unittest.TestCase):
+
+    def test_mono_empty_triangles(self):
+        random.seed(5)
+        for speedup in (True, False):
+            pts = [[random.randint(-10**4, 10**4), random.randint(-10**4, 10**4),
+                    random.randint(0, 1)] for _ in xrange(12)]
+            counter = holes.HoleCounter(pts, 3, mono=True, speedup=speedup)
+            self.assertEqual(counter.count(), brute_mono_triangles(pts))
+            for _ in xrange(30):
+                i = random.randrange(len(pts))
+                q = [random.randint(-10**4, 10**4), random.randint(-10**4, 10**4)]
+                moved = [p[:] for p in counter.points]
+                moved[i] = q + moved[i][2:]
+                expected = brute_mono_triangles(moved)
+                counter.propose(i, q)
+                self.assertEqual(counter.commit(), expected)
+
+
+
+class ReportMonoHolesTest(unittest.TestCase):
+
+    def test_report_mono_rholes_py(self):
+        # report_convex_rholes_py did not store the monochromatic starting
+        # chains, and failed with a KeyError when mono was True
+        random.seed(6)
+        pts = [[random.randint(-10**4, 10**4), random.randint(-10**4, 10**4),
+                random.randint(0, 1)] for _ in xrange(25)]
+        for r in (4, 5):
+            reported = holes.report_convex_rholes_py(pts, r, mono=True)
+            expected = sum(holes.count_mono_rholes_by_color(pts, r, speedup=False).values())
+            self.assertTrue(expected > 0)
+            self.assertEqual(len(reported), expected)
+            for pol in reported:
+                self.assertEqual(len(set(q[2] for q in pol)), 1)
+
+    def test_reported_colours_keep_their_references(self):
+        # CPoint_PyPoint released the colour of each reported point once
+        # more than it owned it
+        random.seed(12)
+        pts = [[random.randint(-10**4, 10**4), random.randint(-10**4, 10**4), 7]
+               for _ in xrange(25)]
+        gc.collect()
+        before = sys.getrefcount(7)
+        reported = holes.report_convex_rholes(pts, 4)
+        self.assertTrue(len(reported) > 0)
+        del reported
+        self.assertTrue(sys.getrefcount(7) >= before)
+
+
+
+def brute_rholes(pts, r, mono):
+    if mono:
+        return sum(holes.count_mono_rholes_by_color(pts, r, speedup=False).values())
+    if r == 3:
+        return holes.countEmptyTriangs_py(pts)
+    return holes.count_convex_rholes(pts, r, speedup=False)
+
+
+class RholesRemovePointTest(unittest.TestCase):
+
+    def test_against_removing_each_point(self):
+        random.seed(8)
+        for _ in xrange(4):
+            pts = [[random.randint(-10**4, 10**4), random.randint(-10**4, 10**4),
+                    random.randint(0, 1)] for _ in xrange(14)]
+            for r in (3, 4, 5):
+                for mono in (False, True):
+                    expected = [brute_rholes(pts[:i] + pts[i+1:], r, mono)
+                                for i in xrange(len(pts))]
+                    for speedup in (True, False):
+                        self.assertEqual(list(holes.rholes_remove_point(pts, r, mono, speedup)),
+                                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()